@@ -0,0 +1,202 @@
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+from categorical import vacancy_encoding
+from task1_5_2 import csv_reader, csv_filer, formatter, parallel_filer
+from task2_1_3 import DataSet, InputConnect, Report, input_sentences
+from vacancies_generator import VacanciesGenerator
+
+benchmark_columns = ['Размер', 'Этап', 'Строк', 'Время, с', 'Строк/с', 'Пик RSS, МБ', 'Удерживается, МБ']
+
+
+def reset_peak_rss() -> None:
+    """
+    Сбрасывает пиковый размер резидентной памяти процесса (только Linux), чтобы измерять пик каждого этапа
+
+    :return:
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as file:
+            file.write('5')
+    except OSError:
+        pass
+
+
+def get_peak_rss() -> float:
+    """
+    Возвращает пиковый размер резидентной памяти процесса в мегабайтах
+
+    :return: Пиковый RSS в мегабайтах или 0, если платформа его не сообщает
+    """
+    try:
+        with open('/proc/self/status') as file:
+            for line in file:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except ImportError:
+        return 0
+
+
+def get_retained_size(root) -> float:
+    """
+    Возвращает размер в мегабайтах всех объектов, достижимых из root; общие объекты (например, одинаковые
+    строки или коды категорий) учитываются один раз
+
+    :param root: Корневой объект, например список вакансий
+    :type root: object
+
+    :return: Размер удерживаемой памяти в мегабайтах
+    """
+    seen = set()
+    size = 0
+    objects = [root]
+    while len(objects) != 0:
+        new_objects = []
+        for item in objects:
+            if id(item) in seen or isinstance(item, type):
+                continue
+            seen.add(id(item))
+            size += sys.getsizeof(item)
+            new_objects.append(item)
+        objects = gc.get_referents(*new_objects)
+    return size / 2 ** 20
+
+
+def measure(function, *args):
+    """
+    Выполняет функцию, измеряя время работы и пиковую память
+
+    :param function: Измеряемая функция
+    :type function: function
+
+    :param args: Аргументы функции
+
+    :return: Кортеж из результата функции, времени в секундах и пикового RSS в мегабайтах
+    """
+    gc.collect()
+    reset_peak_rss()
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start, get_peak_rss()
+
+
+def run_benchmark(file_name: str, job_name: str, image_name: str, max_table_rows: int,
+                  workers_counts: tuple = (1, 2, 4)) -> list:
+    """
+    Измеряет все этапы построения статистики и таблицы вакансий на одном csv-файле
+
+    :param file_name: Название входного csv-файла
+    :type file_name: str
+
+    :param job_name: Название профессии для статистики
+    :type job_name: str
+
+    :param image_name: Название файла для графиков отчёта
+    :type image_name: str
+
+    :param max_table_rows: Количество строк, на которых измеряются этапы таблицы вакансий
+    :type max_table_rows: int
+
+    :param workers_counts: Количества процессов, для которых измеряются параллельные очистка и форматирование
+    :type workers_counts: tuple
+
+    :return: Список словарей с результатами этапов
+    """
+    results = []
+    vacancy_encoding.clear()
+
+    def add_result(stage, rows_count, seconds, peak_rss, retained=None):
+        results.append({'stage': stage, 'rows': rows_count, 'seconds': round(seconds, 3),
+                        'rows_per_second': round(rows_count / seconds) if seconds > 0 else 0,
+                        'peak_rss_mb': round(peak_rss, 1),
+                        'retained_mb': None if retained is None else round(retained, 1)})
+
+    data = DataSet(file_name, [])
+    info, seconds, peak_rss = measure(data.read_file)
+    add_result('DataSet.read_file', len(info[1]), seconds, peak_rss)
+    rows = [list(row) for row in info[1]]
+    vacancies, seconds, peak_rss = measure(data.get_reformed_file, rows, info[0])
+    del rows
+    add_result('DataSet.get_reformed_file', len(vacancies), seconds, peak_rss, get_retained_size(vacancies))
+    connect = InputConnect(input_sentences, answers={'name': file_name, 'job_name': job_name})
+    _, seconds, peak_rss = measure(lambda rows: connect.fill_vacancies_info(connect.get_state(rows)), vacancies)
+    add_result('InputConnect.fill_vacancies_info', len(vacancies), seconds, peak_rss)
+    report = Report(os.path.splitext(image_name)[0] + '.pdf', connect.vacancies_info, job_name)
+    _, seconds, peak_rss = measure(report.generate_image, image_name)
+    add_result('Report.generate_image', len(vacancies), seconds, peak_rss)
+    _, seconds, peak_rss = measure(report.get_html, image_name)
+    add_result('Report.get_html', len(vacancies), seconds, peak_rss)
+    del vacancies, info
+    vacancy_encoding.clear()
+
+    table_info, seconds, peak_rss = measure(csv_reader, file_name)
+    add_result('task1_5_2.csv_reader', len(table_info[1]), seconds, peak_rss)
+    table_rows = table_info[1][:max_table_rows]
+    # csv_filer очищает строки на месте, поэтому параллельные замеры получают свои копии
+    raw_rows = [list(row) for row in table_rows]
+    descriptions, seconds, peak_rss = measure(csv_filer, table_rows, table_info[0], '', [''])
+    add_result('task1_5_2.csv_filer', len(table_rows), seconds, peak_rss)
+    formatted, seconds, peak_rss = measure(lambda rows: [formatter(row) for row in rows], descriptions)
+    add_result('task1_5_2.formatter', len(formatted), seconds, peak_rss)
+    for workers in workers_counts:
+        formatted, seconds, peak_rss = measure(
+            lambda rows: list(parallel_filer(rows, table_info[0], '', [''], workers, True)),
+            [list(row) for row in raw_rows])
+        add_result(f"task1_5_2.parallel_filer + formatter, процессов: {workers}", len(formatted), seconds, peak_rss)
+    return results
+
+
+def print_results(results: list) -> None:
+    """
+    Выводит результаты измерений в виде выровненной таблицы
+
+    :param results: Список словарей с результатами этапов, дополненных размером файла
+    :type results: list
+
+    :return:
+    """
+    table = [benchmark_columns] + [[str(result['size']), result['stage'], str(result['rows']), str(result['seconds']),
+                                    str(result['rows_per_second']), str(result['peak_rss_mb']),
+                                    '-' if result['retained_mb'] is None else str(result['retained_mb'])]
+                                   for result in results]
+    widths = [max(len(row[i]) for row in table) for i in range(len(benchmark_columns))]
+    for row in table:
+        print('  '.join(value.ljust(width) for value, width in zip(row, widths)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Замер производительности этапов построения отчётов о вакансиях')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000],
+                        help='размеры синтетических файлов, например 10000 100000 1000000')
+    parser.add_argument('--file', default=None, help='готовый csv-файл вместо синтетических')
+    parser.add_argument('--seed', type=int, default=0, help='начальное значение генератора вакансий')
+    parser.add_argument('--job-name', default='Программист', help='профессия для статистики')
+    parser.add_argument('--max-table-rows', type=int, default=20000,
+                        help='количество строк для этапов таблицы вакансий')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4],
+                        help='количества процессов для замера параллельных очистки и форматирования таблицы')
+    parser.add_argument('--json', default=None, help='файл для сохранения результатов в формате JSON')
+    args = parser.parse_args()
+    all_results = []
+    with tempfile.TemporaryDirectory() as directory:
+        inputs = [(args.file, os.path.basename(args.file))] if args.file is not None else \
+            [(os.path.join(directory, f"vacancies_{size}.csv"), size) for size in args.rows]
+        for file_name, size in inputs:
+            if args.file is None:
+                VacanciesGenerator(args.seed).write_file(file_name, size)
+            for result in run_benchmark(file_name, args.job_name, os.path.join(directory, 'graph.png'),
+                                        args.max_table_rows, args.workers):
+                all_results.append(dict(size=size, **result))
+    print_results(all_results)
+    if args.json is not None:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(all_results, file, ensure_ascii=False, indent=4)
@@ -0,0 +1,115 @@
+# работодатель и навыки не кодируются: их словари растут с выгрузкой, а таблицы общие для всего процесса;
+# статистики по ним (HyperLogLog, Space-Saving, группировка с бюджетом памяти) считаются по строкам
+categorical_columns = ['area_name', 'salary_currency', 'experience_id', 'premium', 'salary_gross']
+
+
+class CategoryTable:
+    """
+    Класс таблицы словарного кодирования одной колонки: значение -> небольшой целый код и обратно
+
+    :param codes: Словарь: значение -> код
+    :type codes: dict
+
+    :param values: Список значений; позиция - код
+    :type values: list
+    """
+    def __init__(self):
+        """
+        Инициализирует объект класса CategoryTable
+        """
+        self.codes = {}
+        self.values = []
+
+    def encode(self, value: str) -> int:
+        """
+        Возвращает код значения, добавляя значение в таблицу при первом появлении
+
+        :param value: Значение колонки
+        :type value: str
+
+        :return: Код значения
+        """
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def decode(self, code: int) -> str:
+        """
+        Возвращает значение по коду
+
+        :param code: Код значения
+        :type code: int
+
+        :return: Значение колонки
+        """
+        return self.values[code]
+
+    def clear(self) -> None:
+        """
+        Удаляет все значения таблицы
+
+        :return:
+        """
+        self.codes.clear()
+        self.values.clear()
+
+
+class CategoricalEncoding:
+    """
+    Класс набора таблиц словарного кодирования для колонок categorical_columns
+
+    :param tables: Словарь: колонка -> таблица кодирования
+    :type tables: dict
+    """
+    def __init__(self, columns: list = None):
+        """
+        Инициализирует объект класса CategoricalEncoding
+
+        :param columns: Кодируемые колонки; по умолчанию categorical_columns
+        :type columns: list
+        """
+        self.tables = {column: CategoryTable() for column in (categorical_columns if columns is None else columns)}
+
+    def encode(self, column: str, value: str) -> int:
+        """
+        Возвращает код значения колонки
+
+        :param column: Название колонки
+        :type column: str
+
+        :param value: Значение колонки
+        :type value: str
+
+        :return: Код значения
+        """
+        return self.tables[column].encode(value)
+
+    def decode(self, column: str, code: int) -> str:
+        """
+        Возвращает значение колонки по коду
+
+        :param column: Название колонки
+        :type column: str
+
+        :param code: Код значения
+        :type code: int
+
+        :return: Значение колонки
+        """
+        return self.tables[column].decode(code)
+
+    def clear(self) -> None:
+        """
+        Очищает все таблицы, чтобы они не росли от запуска к запуску в одном процессе; коды уже созданных
+        объектов после этого недействительны, поэтому таблицы очищаются только между построениями,
+        когда таких объектов не осталось
+
+        :return:
+        """
+        for table in self.tables.values():
+            table.clear()
+
+
+vacancy_encoding = CategoricalEncoding()
@@ -0,0 +1,246 @@
+import os
+import pickle
+import re
+import struct
+import zlib
+from categorical import categorical_columns
+
+store_magic = b'VACCOLS1'
+footer_format = '<Q'
+set_columns = categorical_columns + ['employer_name', 'name']
+max_set_size = 256
+iso_date = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+get_store_name = lambda file_name: os.path.splitext(file_name)[0] + '.columns'
+get_salary = lambda value: int(value.split('.')[0]) if re.fullmatch(r'-?\d+(\.\d*)?', value) else None
+
+
+def get_zones(column_names: list, columns: list) -> dict:
+    """
+    Строит зональные карты блока: диапазоны окладов и дат публикации и множества значений
+    малокардинальных колонок (None, если значений больше max_set_size, оклады не числа или даты не в формате ISO)
+
+    :param column_names: Список с названиями колонок
+    :type column_names: list
+
+    :param columns: Списки значений колонок блока в порядке column_names
+    :type columns: list
+
+    :return: Словарь: колонка -> (минимум, максимум), множество значений или None
+    """
+    zones = {}
+    for column, values in zip(column_names, columns):
+        if column in ('salary_from', 'salary_to'):
+            salaries = [get_salary(value) for value in values]
+            zones[column] = None if None in salaries else (min(salaries), max(salaries))
+        elif column == 'published_at':
+            zones[column] = (min(value[:10] for value in values), max(value[:10] for value in values)) \
+                if all(iso_date.match(value) for value in values) else None
+        elif column in set_columns:
+            distinct = frozenset(values)
+            zones[column] = distinct if len(distinct) <= max_set_size else None
+    return zones
+
+
+class ColumnarStore:
+    """
+    Класс блочного колоночного файла с очищенными вакансиями: строки хранятся блоками по chunk_size,
+    каждая колонка блока сжата отдельно, а оглавление в конце файла хранит смещения колонок и зональные
+    карты блоков. Фильтр пропускает блоки, которые по зональной карте не могут содержать подходящих строк,
+    и распаковывает остальные колонки только у блоков с подходящими строками
+
+    :param file_name: Название файла хранилища
+    :type file_name: str
+
+    :param column_names: Список с названиями колонок
+    :type column_names: list
+
+    :param chunks: Оглавление: список словарей блоков с ключами rows, offsets и zones
+    :type chunks: list
+
+    :param source_name: Название (без каталога) csv-файла, из которого построено хранилище
+    :type source_name: str
+    """
+    def __init__(self, file_name: str):
+        """
+        Открывает хранилище и читает его оглавление
+
+        :param file_name: Название файла хранилища
+        :type file_name: str
+        """
+        self.file_name = file_name
+        self.file = open(file_name, 'rb')
+        footer_size = struct.calcsize(footer_format)
+        self.file.seek(-footer_size, os.SEEK_END)
+        index_length, = struct.unpack(footer_format, self.file.read(footer_size))
+        self.file.seek(-footer_size - index_length, os.SEEK_END)
+        index = pickle.loads(self.file.read(index_length))
+        self.column_names = index['column_names']
+        self.chunks = index['chunks']
+        self.source_name = index['source_name']
+
+    @staticmethod
+    def write(file_name: str, source_name: str, column_names: list, rows, chunk_size: int = 4096) -> int:
+        """
+        Записывает очищенные строки в хранилище, накапливая в памяти не больше одного блока
+
+        :param file_name: Название файла хранилища
+        :type file_name: str
+
+        :param source_name: Название исходного csv-файла
+        :type source_name: str
+
+        :param column_names: Список с названиями колонок
+        :type column_names: list
+
+        :param rows: Итерируемый объект со словарями очищенных вакансий
+        :type rows: iterable
+
+        :param chunk_size: Количество строк в блоке
+        :type chunk_size: int
+
+        :return: Количество записанных строк
+        """
+        chunks = []
+        rows_count = 0
+        with open(file_name, 'wb') as file:
+            file.write(store_magic)
+            columns = [[] for _ in column_names]
+            for row in rows:
+                for values, column in zip(columns, column_names):
+                    values.append(row[column])
+                if len(columns[0]) == chunk_size:
+                    rows_count += ColumnarStore.write_chunk(file, column_names, columns, chunks)
+                    columns = [[] for _ in column_names]
+            if len(columns[0]) != 0:
+                rows_count += ColumnarStore.write_chunk(file, column_names, columns, chunks)
+            index = pickle.dumps({'column_names': column_names, 'chunks': chunks,
+                                  'source_name': os.path.basename(source_name)},
+                                 pickle.HIGHEST_PROTOCOL)
+            file.write(index)
+            file.write(struct.pack(footer_format, len(index)))
+        return rows_count
+
+    @staticmethod
+    def write_chunk(file, column_names: list, columns: list, chunks: list) -> int:
+        """
+        Записывает сжатые колонки блока и добавляет блок в оглавление
+
+        :param file: Открытый на запись файл хранилища
+        :type file: file
+
+        :param column_names: Список с названиями колонок
+        :type column_names: list
+
+        :param columns: Списки значений колонок блока
+        :type columns: list
+
+        :param chunks: Оглавление, в которое добавляется блок
+        :type chunks: list
+
+        :return: Количество строк в блоке
+        """
+        offsets = {}
+        for column, values in zip(column_names, columns):
+            data = zlib.compress(pickle.dumps(values, pickle.HIGHEST_PROTOCOL), 1)
+            offsets[column] = (file.tell(), len(data))
+            file.write(data)
+        chunks.append({'rows': len(columns[0]), 'offsets': offsets, 'zones': get_zones(column_names, columns)})
+        return len(columns[0])
+
+    @property
+    def rows_count(self) -> int:
+        """
+        Возвращает количество строк в хранилище
+
+        :return: Количество строк
+        """
+        return sum(chunk['rows'] for chunk in self.chunks)
+
+    def read_column(self, chunk: dict, column: str) -> list:
+        """
+        Читает и распаковывает одну колонку блока
+
+        :param chunk: Словарь блока из оглавления
+        :type chunk: dict
+
+        :param column: Название колонки
+        :type column: str
+
+        :return: Список значений колонки
+        """
+        offset, length = chunk['offsets'][column]
+        self.file.seek(offset)
+        return pickle.loads(zlib.decompress(self.file.read(length)))
+
+    def iter_rows(self, filter_columns: list = (), row_filter=None, chunk_filter=None, stats: dict = None):
+        """
+        Генератор подходящих строк в порядке исходного файла
+
+        :param filter_columns: Колонки, значения которых передаются в row_filter
+        :type filter_columns: list
+
+        :param row_filter: Предикат от списка значений filter_columns строки; None - все строки
+        :type row_filter: function
+
+        :param chunk_filter: Предикат от зональной карты блока: False, если блок заведомо без подходящих строк
+        :type chunk_filter: function
+
+        :param stats: Словарь, в котором накапливаются количества пропущенных (skipped) и прочитанных (read) блоков
+        :type stats: dict
+
+        :return: Генератор словарей вакансий с колонками column_names
+        """
+        stats = {} if stats is None else stats
+        stats.setdefault('skipped', 0)
+        stats.setdefault('read', 0)
+        for chunk in self.chunks:
+            if chunk_filter is not None and not chunk_filter(chunk['zones']):
+                stats['skipped'] += 1
+                continue
+            stats['read'] += 1
+            if row_filter is None:
+                matches = range(chunk['rows'])
+            else:
+                filter_values = list(zip(*(self.read_column(chunk, column) for column in filter_columns)))
+                matches = [i for i, values in enumerate(filter_values) if row_filter(list(values))]
+                if len(matches) == 0:
+                    continue
+            columns = [self.read_column(chunk, column) for column in self.column_names]
+            for i in matches:
+                yield {column: values[i] for column, values in zip(self.column_names, columns)}
+
+    def close(self) -> None:
+        """
+        Закрывает файл хранилища
+
+        :return:
+        """
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def is_store_fresh(store_name: str, file_name: str) -> bool:
+    """
+    Проверяет, что хранилище существует, построено по этому csv-файлу и не старше его
+
+    :param store_name: Название файла хранилища
+    :type store_name: str
+
+    :param file_name: Название csv-файла
+    :type file_name: str
+
+    :return: True, если хранилищем можно пользоваться вместо csv-файла
+    """
+    if not os.path.exists(store_name) or os.path.getmtime(store_name) < os.path.getmtime(file_name):
+        return False
+    with open(store_name, 'rb') as file:
+        if file.read(len(store_magic)) != store_magic:
+            return False
+    with ColumnarStore(store_name) as store:
+        return store.source_name == os.path.basename(file_name)
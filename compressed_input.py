@@ -0,0 +1,176 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import queue
+import threading
+
+compression_magics = {b'\x1f\x8b': gzip.open, b'BZh': bz2.open, b'\xfd7zXZ\x00': lzma.open}
+
+
+def get_decompressor(file_name: str):
+    """
+    Определяет сжатие файла по первым байтам, а не по расширению
+
+    :param file_name: Название файла
+    :type file_name: str
+
+    :return: Функция открытия сжатого файла (gzip.open, bz2.open, lzma.open) или None для несжатого файла
+    """
+    with open(file_name, 'rb') as file:
+        header = file.read(max(len(magic) for magic in compression_magics))
+    for magic, opener in compression_magics.items():
+        if header.startswith(magic):
+            return opener
+    return None
+
+
+class DecompressingReader(io.RawIOBase):
+    """
+    Класс потока байтов, который распаковывает файл в фоновом потоке в ограниченную очередь блоков,
+    так что распаковка (zlib, bz2 и lzma отпускают GIL) идёт одновременно с разбором csv
+
+    :param source: Открытый сжатый файл
+    :type source: GzipFile
+
+    :param chunks: Очередь распакованных блоков; пустой блок обозначает конец файла
+    :type chunks: Queue
+
+    :param stopped: Событие остановки фонового потока при досрочном закрытии
+    :type stopped: Event
+
+    :param error: Исключение, возникшее при распаковке; пробрасывается читателю
+    :type error: Exception
+    """
+    def __init__(self, file_name: str, opener, chunk_size: int = 1 << 20, buffer_chunks: int = 8):
+        """
+        Инициализирует объект класса DecompressingReader и запускает фоновую распаковку
+
+        :param file_name: Название сжатого файла
+        :type file_name: str
+
+        :param opener: Функция открытия сжатого файла
+        :type opener: function
+
+        :param chunk_size: Размер распаковываемого блока в байтах
+        :type chunk_size: int
+
+        :param buffer_chunks: Максимальное количество блоков в очереди
+        :type buffer_chunks: int
+        """
+        super().__init__()
+        self.source = opener(file_name, 'rb')
+        self.chunks = queue.Queue(buffer_chunks)
+        self.stopped = threading.Event()
+        self.error = None
+        self.current = memoryview(b'')
+        self.finished = False
+        self.thread = threading.Thread(target=self.decompress, args=(chunk_size,), daemon=True)
+        self.thread.start()
+
+    def decompress(self, chunk_size: int) -> None:
+        """
+        Распаковывает файл блоками в очередь до конца файла или до остановки
+
+        :param chunk_size: Размер блока в байтах
+        :type chunk_size: int
+
+        :return:
+        """
+        try:
+            while not self.stopped.is_set():
+                chunk = self.source.read(chunk_size)
+                self.put_chunk(chunk)
+                if len(chunk) == 0:
+                    break
+        except Exception as error:
+            self.error = error
+            self.put_chunk(b'')
+
+    def put_chunk(self, chunk: bytes) -> None:
+        """
+        Кладёт блок в очередь, ожидая свободного места, пока читатель не закрыл поток
+
+        :param chunk: Распакованный блок
+        :type chunk: bytes
+
+        :return:
+        """
+        while not self.stopped.is_set():
+            try:
+                self.chunks.put(chunk, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        """
+        Копирует в буфер следующую часть распакованных данных
+
+        :param buffer: Записываемый буфер
+        :type buffer: memoryview
+
+        :return: Количество записанных байтов; 0 в конце файла
+        """
+        if len(self.current) == 0:
+            if self.finished:
+                return 0
+            self.current = memoryview(self.chunks.get())
+            if len(self.current) == 0:
+                self.finished = True
+                if self.error is not None:
+                    raise self.error
+                return 0
+        size = min(len(buffer), len(self.current))
+        buffer[:size] = self.current[:size]
+        self.current = self.current[size:]
+        return size
+
+    def close(self) -> None:
+        """
+        Останавливает фоновый поток и закрывает сжатый файл
+
+        :return:
+        """
+        if not self.closed:
+            self.stopped.set()
+            self.thread.join()
+            self.source.close()
+        super().close()
+
+
+def open_vacancies_file(file_name: str):
+    """
+    Открывает csv-файл вакансий в кодировке utf_8_sig; сжатые gzip, bz2 и xz файлы распаковываются потоково
+
+    :param file_name: Название файла
+    :type file_name: str
+
+    :return: Текстовый файловый объект
+    """
+    opener = get_decompressor(file_name)
+    if opener is None:
+        return open(file_name, encoding='utf_8_sig')
+    return io.TextIOWrapper(io.BufferedReader(DecompressingReader(file_name, opener)), encoding='utf_8_sig')
+
+
+def is_empty_file(file_name: str) -> bool:
+    """
+    Проверяет, пуст ли файл; у сжатого файла проверяется распакованное содержимое
+
+    :param file_name: Название файла
+    :type file_name: str
+
+    :return: True, если в файле нет данных
+    """
+    if os.path.getsize(file_name) == 0:
+        return True
+    opener = get_decompressor(file_name)
+    if opener is None:
+        return False
+    with opener(file_name, 'rb') as file:
+        return len(file.read(1)) == 0
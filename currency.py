@@ -0,0 +1,4 @@
+# курсы валют к рублю; отдельный модуль, чтобы сортировка таблицы и генератор вакансий
+# не импортировали вместе с task2_1_3 matplotlib, jinja2, openpyxl и pdfkit
+currency_to_rub = {"AZN": 35.68, "BYR": 23.91, "EUR": 59.90, "GEL": 21.74, "KGS": 0.76, "KZT": 0.13, "RUR": 1,
+                   "UAH": 1.64, "USD": 60.66, "UZS": 0.0055}
@@ -0,0 +1,201 @@
+from array import array
+from math import ceil, log
+from vacancies_state import get_fingerprint, fingerprint_columns
+
+dedup_columns = list(fingerprint_columns)
+
+
+class FingerprintSet:
+    """
+    Класс компактного множества 64-битных отпечатков с открытой адресацией (8 байт на ячейку)
+
+    :param slots: Массив ячеек; 0 обозначает пустую ячейку
+    :type slots: array
+
+    :param count: Количество отпечатков в множестве
+    :type count: int
+    """
+    def __init__(self, capacity: int = 1024):
+        """
+        Инициализирует объект класса FingerprintSet
+
+        :param capacity: Начальное количество ячеек (округляется до степени двойки)
+        :type capacity: int
+        """
+        self.slots = array('Q', bytes(8 * (1 << max(capacity - 1, 1).bit_length())))
+        self.count = 0
+
+    def add(self, fingerprint: int) -> bool:
+        """
+        Добавляет отпечаток в множество
+
+        :param fingerprint: 64-битный отпечаток
+        :type fingerprint: int
+
+        :return: True, если отпечатка ещё не было в множестве
+        """
+        if (self.count + 1) * 2 > len(self.slots):
+            self.grow()
+        fingerprint = fingerprint or 1
+        mask = len(self.slots) - 1
+        index = fingerprint & mask
+        while self.slots[index] != 0:
+            if self.slots[index] == fingerprint:
+                return False
+            index = (index + 1) & mask
+        self.slots[index] = fingerprint
+        self.count += 1
+        return True
+
+    def grow(self) -> None:
+        """
+        Увеличивает количество ячеек вдвое и заново раскладывает отпечатки
+
+        :return:
+        """
+        old_slots = self.slots
+        self.slots = array('Q', bytes(16 * len(old_slots)))
+        self.count = 0
+        for fingerprint in old_slots:
+            if fingerprint != 0:
+                self.add(fingerprint)
+
+    def __len__(self):
+        return self.count
+
+
+class BloomFilter:
+    """
+    Класс фильтра Блума для отпечатков: фиксированный объём памяти ценой редких ложных совпадений
+
+    :param bits: Битовый массив фильтра
+    :type bits: bytearray
+
+    :param hashes_count: Количество хэш-функций
+    :type hashes_count: int
+    """
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Инициализирует объект класса BloomFilter
+
+        :param capacity: Ожидаемое количество различных отпечатков
+        :type capacity: int
+
+        :param error_rate: Допустимая доля ложных совпадений при заполнении до capacity
+        :type error_rate: float
+        """
+        if capacity < 1:
+            raise ValueError('Ёмкость фильтра Блума должна быть положительной')
+        bits_count = ceil(-capacity * log(error_rate) / log(2) ** 2)
+        self.bits = bytearray((bits_count + 7) // 8)
+        self.bits_count = len(self.bits) * 8
+        self.hashes_count = max(1, round(self.bits_count / capacity * log(2)))
+        self.count = 0
+
+    def add(self, fingerprint: int) -> bool:
+        """
+        Добавляет отпечаток в фильтр
+
+        :param fingerprint: 64-битный отпечаток
+        :type fingerprint: int
+
+        :return: True, если отпечатка (вероятно) ещё не было в фильтре
+        """
+        first_hash, second_hash = fingerprint & 0xffffffff, fingerprint >> 32 | 1
+        is_new = False
+        for i in range(self.hashes_count):
+            position = (first_hash + i * second_hash) % self.bits_count
+            if not self.bits[position >> 3] & (1 << (position & 7)):
+                self.bits[position >> 3] |= 1 << (position & 7)
+                is_new = True
+        self.count += is_new
+        return is_new
+
+    def __len__(self):
+        return self.count
+
+
+def get_fingerprint_set(bloom_capacity: int = None):
+    """
+    Создаёт точное множество отпечатков или, если задана ожидаемая ёмкость, фильтр Блума
+
+    :param bloom_capacity: Ожидаемое количество вакансий для фильтра Блума
+    :type bloom_capacity: int
+
+    :return: Объект класса FingerprintSet или BloomFilter
+    """
+    return FingerprintSet() if bloom_capacity is None else BloomFilter(bloom_capacity)
+
+
+class VacanciesDeduplicator:
+    """
+    Класс для потокового удаления повторяющихся вакансий по отпечаткам ключевых колонок
+
+    :param indexes: Индексы ключевых колонок в строке csv-файла
+    :type indexes: list
+
+    :param fingerprints: Множество отпечатков (FingerprintSet) или фильтр Блума (BloomFilter)
+    :type fingerprints: FingerprintSet
+
+    :param duplicates_count: Количество отброшенных повторов
+    :type duplicates_count: int
+    """
+    def __init__(self, column_names: list, key_columns: list = None, bloom_capacity: int = None):
+        """
+        Инициализирует объект класса VacanciesDeduplicator
+
+        :param column_names: Список с названиями колонок таблицы
+        :type column_names: list
+
+        :param key_columns: Колонки, по которым вакансии считаются одинаковыми; по умолчанию dedup_columns
+        :type key_columns: list
+
+        :param bloom_capacity: Ожидаемое количество вакансий; если задано, используется фильтр Блума
+        :type bloom_capacity: int
+        """
+        key_columns = dedup_columns if key_columns is None else key_columns
+        missing_columns = [column for column in key_columns if column not in column_names]
+        # без проверки неизвестная колонка выпала бы из ключа, и при пустом ключе все строки получили бы один отпечаток
+        if len(key_columns) == 0:
+            raise ValueError('Колонки удаления повторов не заданы')
+        if len(missing_columns) != 0:
+            raise ValueError(f"Колонки удаления повторов отсутствуют в файле: {', '.join(missing_columns)}")
+        self.indexes = [column_names.index(column) for column in key_columns]
+        self.fingerprints = get_fingerprint_set(bloom_capacity)
+        self.duplicates_count = 0
+
+    def is_duplicate(self, row: list) -> bool:
+        """
+        Проверяет, встречалась ли уже вакансия с такими же ключевыми колонками, и запоминает её
+
+        :param row: Список значений строки csv-файла
+        :type row: list
+
+        :return: True, если вакансия повторная
+        """
+        if self.fingerprints.add(self.get_key_fingerprint(row)):
+            return False
+        self.duplicates_count += 1
+        return True
+
+    def get_key_fingerprint(self, row: list) -> int:
+        """
+        Возвращает отпечаток ключевых колонок строки
+
+        :param row: Список значений строки csv-файла
+        :type row: list
+
+        :return: 64-битный отпечаток
+        """
+        return get_fingerprint([row[index] for index in self.indexes])
+
+    def filter(self, rows):
+        """
+        Лениво отбрасывает повторяющиеся строки
+
+        :param rows: Итерируемый объект со строками csv-файла
+        :type rows: iterable
+
+        :return: Генератор уникальных строк
+        """
+        return (row for row in rows if not self.is_duplicate(row))
@@ -0,0 +1,209 @@
+import heapq
+import pickle
+import sys
+import tempfile
+from operator import itemgetter
+from vacancies_cube import VacanciesCube, cube_dimensions
+
+group_dimensions = cube_dimensions + ['name', 'employer_name']
+group_getters = {
+    'year': lambda vacancy: vacancy.published_at,
+    'month': lambda vacancy: vacancy.published_month,
+    'area_name': lambda vacancy: vacancy.area_name,
+    'experience_id': lambda vacancy: vacancy.experience_id,
+    'salary_currency': lambda vacancy: vacancy.salary.salary_currency,
+    'premium': lambda vacancy: vacancy.premium,
+    'name': lambda vacancy: vacancy.name,
+    'employer_name': lambda vacancy: vacancy.employer_name
+}
+max_partition_level = 8
+
+
+def get_group_size(key: tuple, measures: list) -> int:
+    """
+    Оценивает память одной группы: ключ, его значения, агрегаты и запись словаря
+
+    :param key: Кортеж значений измерений
+    :type key: tuple
+
+    :param measures: Агрегаты [сумма, количество, минимум, максимум]
+    :type measures: list
+
+    :return: Приближённый размер группы в байтах
+    """
+    return sys.getsizeof(key) + sum(map(sys.getsizeof, key)) + sys.getsizeof(measures) + 4 * 24 + 100
+
+
+def read_spill(file):
+    """
+    Генератор пар (ключ, агрегаты) из файла сброшенных частичных агрегатов
+
+    :param file: Временный файл, перемотанный в начало
+    :type file: file
+
+    :return: Генератор пар (ключ, агрегаты)
+    """
+    while True:
+        try:
+            yield from pickle.load(file)
+        except EOFError:
+            return
+
+
+class GroupAggregator:
+    """
+    Класс группировки вакансий с ограничением памяти: агрегаты [сумма, количество, минимум, максимум]
+    копятся в кубе VacanciesCube, а при превышении memory_budget частичные агрегаты раскладываются
+    по хешу ключа в partitions_count временных файлов, и память освобождается. При выдаче результата
+    каждый раздел агрегируется отдельно; раздел, который сам не помещается в бюджет, делится
+    дальше с другим хешем
+
+    :param memory_budget: Бюджет памяти на группы в байтах
+    :type memory_budget: int
+
+    :param partitions_count: Количество разделов при сбросе на диск
+    :type partitions_count: int
+
+    :param level: Уровень деления: 0 у исходной группировки, на 1 больше у группировки раздела
+    :type level: int
+
+    :param cube: Куб с группами, накопленными в памяти
+    :type cube: VacanciesCube
+
+    :param memory_used: Оценка памяти групп в кубе в байтах
+    :type memory_used: int
+
+    :param partitions: Временные файлы разделов; пустой список, пока сбросов не было
+    :type partitions: list
+
+    :param spills_count: Количество сбросов на диск
+    :type spills_count: int
+    """
+    def __init__(self, memory_budget: int, partitions_count: int = 16, level: int = 0):
+        """
+        Инициализирует объект класса GroupAggregator
+
+        :param memory_budget: Бюджет памяти на группы в байтах
+        :type memory_budget: int
+
+        :param partitions_count: Количество разделов при сбросе на диск
+        :type partitions_count: int
+
+        :param level: Уровень деления
+        :type level: int
+        """
+        self.memory_budget = memory_budget
+        self.partitions_count = partitions_count
+        self.level = level
+        self.cube = VacanciesCube()
+        self.memory_used = 0
+        self.partitions = []
+        self.spills_count = 0
+
+    def add(self, key: tuple, measures: list) -> None:
+        """
+        Добавляет агрегаты в группу, сбрасывая группы на диск при превышении бюджета памяти
+
+        :param key: Кортеж значений измерений
+        :type key: tuple
+
+        :param measures: Агрегаты [сумма, количество, минимум, максимум]
+        :type measures: list
+
+        :return:
+        """
+        if key not in self.cube.cells:
+            self.memory_used += get_group_size(key, measures)
+        self.cube.add_cell(key, measures)
+        if self.memory_used > self.memory_budget and self.level < max_partition_level:
+            self.spill()
+
+    def get_partition(self, key: tuple) -> int:
+        """
+        Возвращает номер раздела ключа; на каждом уровне деления хеш свой
+
+        :param key: Кортеж значений измерений
+        :type key: tuple
+
+        :return: Номер раздела
+        """
+        return hash((self.level, key)) % self.partitions_count
+
+    def spill(self) -> None:
+        """
+        Раскладывает накопленные группы по файлам разделов и очищает куб
+
+        :return:
+        """
+        if len(self.partitions) == 0:
+            self.partitions = [tempfile.TemporaryFile() for _ in range(self.partitions_count)]
+        parts = [[] for _ in range(self.partitions_count)]
+        for key, measures in self.cube.cells.items():
+            parts[self.get_partition(key)].append((key, measures))
+        for file, part in zip(self.partitions, parts):
+            if len(part) != 0:
+                pickle.dump(part, file, pickle.HIGHEST_PROTOCOL)
+        self.cube.cells.clear()
+        self.memory_used = 0
+        self.spills_count += 1
+
+    def items(self, ordered: bool = False):
+        """
+        Генератор итоговых групп. Без сбросов на диск группы выдаются из памяти; иначе разделы
+        агрегируются по одному, а упорядоченный результат получается слиянием отсортированных разделов,
+        сохранённых во временные файлы
+
+        :param ordered: Выдавать группы в порядке возрастания ключей
+        :type ordered: bool
+
+        :return: Генератор пар (кортеж значений измерений, [сумма, количество, минимум, максимум])
+        """
+        if len(self.partitions) == 0:
+            yield from (sorted(self.cube.cells.items()) if ordered else self.cube.cells.items())
+            return
+        if len(self.cube.cells) != 0:
+            self.spill()
+        runs = []
+        try:
+            for file in self.partitions:
+                file.seek(0)
+                part = GroupAggregator(self.memory_budget, self.partitions_count, self.level + 1)
+                for key, measures in read_spill(file):
+                    part.add(key, measures)
+                file.close()
+                if ordered:
+                    run = tempfile.TemporaryFile()
+                    runs.append(run)
+                    for groups in self.get_batches(part.items(ordered=True)):
+                        pickle.dump(groups, run, pickle.HIGHEST_PROTOCOL)
+                    run.seek(0)
+                else:
+                    yield from part.items()
+                self.spills_count += part.spills_count
+            yield from heapq.merge(*map(read_spill, runs), key=itemgetter(0))
+        finally:
+            for file in self.partitions + runs:
+                file.close()
+            self.partitions = []
+
+    @staticmethod
+    def get_batches(groups, batch_size: int = 1000):
+        """
+        Нарезает поток групп на списки для записи в файл
+
+        :param groups: Итерируемый объект с группами
+        :type groups: iterable
+
+        :param batch_size: Количество групп в списке
+        :type batch_size: int
+
+        :return: Генератор списков групп
+        """
+        batch = []
+        for group in groups:
+            batch.append(group)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if len(batch) != 0:
+            yield batch
@@ -0,0 +1,117 @@
+import heapq
+
+
+class SpaceSaving:
+    """
+    Класс скетча Space-Saving для частых элементов потока: хранит не больше capacity счётчиков,
+    а новый элемент при заполненном скетче вытесняет элемент с наименьшим счётчиком и наследует его значение.
+    Оценка частоты не меньше истинной и превышает её не больше чем на error; любой элемент
+    с частотой больше total / capacity гарантированно присутствует в скетче. Скетчи объединяются методом merge
+
+    :param capacity: Максимальное количество счётчиков
+    :type capacity: int
+
+    :param counts: Словарь: элемент -> оценка частоты
+    :type counts: dict
+
+    :param errors: Словарь: элемент -> максимальная переоценка частоты
+    :type errors: dict
+
+    :param heap: Куча пар (счётчик, элемент) с устаревшими записями, удаляемыми при вытеснении
+    :type heap: list
+
+    :param total: Количество добавленных элементов с учётом кратности
+    :type total: int
+    """
+    def __init__(self, capacity: int = 1000):
+        """
+        Инициализирует объект класса SpaceSaving
+
+        :param capacity: Максимальное количество счётчиков
+        :type capacity: int
+        """
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.heap = []
+        self.total = 0
+
+    def add(self, item, count: int = 1) -> None:
+        """
+        Учитывает элемент потока
+
+        :param item: Элемент
+        :type item: str
+
+        :param count: Кратность элемента
+        :type count: int
+
+        :return:
+        """
+        self.total += count
+        if item in self.counts:
+            self.counts[item] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+        else:
+            minimum, evicted = heapq.heappop(self.heap)
+            while self.counts.get(evicted) != minimum:
+                minimum, evicted = heapq.heappop(self.heap)
+            del self.counts[evicted], self.errors[evicted]
+            self.counts[item] = minimum + count
+            self.errors[item] = minimum
+        heapq.heappush(self.heap, (self.counts[item], item))
+        if len(self.heap) > 4 * self.capacity:
+            self.rebuild_heap()
+
+    def rebuild_heap(self) -> None:
+        """
+        Перестраивает кучу по текущим счётчикам, удаляя устаревшие записи
+
+        :return:
+        """
+        self.heap = [(count, item) for item, count in self.counts.items()]
+        heapq.heapify(self.heap)
+
+    def get_minimum(self) -> int:
+        """
+        Возвращает наименьший счётчик заполненного скетча - верхнюю границу частоты отсутствующих элементов
+
+        :return: Наименьший счётчик или 0, если скетч не заполнен
+        """
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def merge(self, other):
+        """
+        Объединяет два скетча: оценки общих элементов складываются, а элементу, отсутствующему в заполненном
+        скетче, добавляется наименьший счётчик этого скетча; остаются capacity наибольших счётчиков
+
+        :param other: Объект класса SpaceSaving
+        :type other: SpaceSaving
+
+        :return: Новый объект класса SpaceSaving
+        """
+        merged = SpaceSaving(max(self.capacity, other.capacity))
+        minimums = (self.get_minimum(), other.get_minimum())
+        counts = {}
+        for item in self.counts.keys() | other.counts.keys():
+            counts[item] = (self.counts.get(item, minimums[0]) + other.counts.get(item, minimums[1]),
+                            self.errors.get(item, minimums[0]) + other.errors.get(item, minimums[1]))
+        for item, (count, error) in heapq.nlargest(merged.capacity, counts.items(), key=lambda entry: entry[1][0]):
+            merged.counts[item] = count
+            merged.errors[item] = error
+        merged.total = self.total + other.total
+        merged.rebuild_heap()
+        return merged
+
+    def get_top(self, count: int) -> dict:
+        """
+        Возвращает самые частые элементы
+
+        :param count: Количество элементов
+        :type count: int
+
+        :return: Словарь: элемент -> оценка частоты в порядке убывания частоты
+        """
+        return dict(sorted(self.counts.items(), key=lambda entry: (-entry[1], entry[0]))[:count])
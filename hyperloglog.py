@@ -0,0 +1,68 @@
+import hashlib
+from math import log
+
+
+class HyperLogLog:
+    """
+    Класс для приближённого подсчёта количества различных значений (HyperLogLog)
+
+    :param precision: Точность: количество бит хэша, выбирающих регистр (регистров 2 ** precision)
+    :type precision: int
+
+    :param registers: Регистры с максимальными рангами хэшей
+    :type registers: bytearray
+    """
+    def __init__(self, precision: int = 12):
+        """
+        Инициализирует объект класса HyperLogLog
+
+        :param precision: Точность от 4 до 16; относительная погрешность около 1.04 / sqrt(2 ** precision)
+        :type precision: int
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError('Точность HyperLogLog должна быть от 4 до 16')
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: str) -> None:
+        """
+        Добавляет значение в счётчик
+
+        :param value: Добавляемое значение
+        :type value: str
+
+        :return:
+        """
+        hashed = int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), 'big')
+        index = hashed >> (64 - self.precision)
+        rest = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = 64 - self.precision - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other) -> None:
+        """
+        Объединяет счётчик с другим счётчиком той же точности
+
+        :param other: Объединяемый счётчик
+        :type other: HyperLogLog
+
+        :return:
+        """
+        if other.precision != self.precision:
+            raise ValueError('Нельзя объединить счётчики HyperLogLog разной точности')
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> int:
+        """
+        Возвращает оценку количества различных значений
+
+        :return: Приближённое количество различных значений
+        """
+        registers_count = len(self.registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(registers_count, 0.7213 / (1 + 1.079 / registers_count))
+        estimate = alpha * registers_count ** 2 / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * registers_count and zeros != 0:
+            estimate = registers_count * log(registers_count / zeros)
+        return round(estimate)
@@ -0,0 +1,192 @@
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+profile_columns = {'seconds': 'Время, с', 'rows': 'Строк', 'rejected': 'Отброшено', 'duplicates': 'Повторов',
+                   'peak_memory_mb': 'Пик памяти, МБ'}
+
+
+class Profiler:
+    """
+    Класс для замера времени, количества строк и пиковой памяти этапов построения отчётов
+
+    :param enabled: Включены ли замеры; выключенный профайлер почти не тратит времени
+    :type enabled: bool
+
+    :param stages: Словарь записей этапов в порядке первого входа: название -> словарь счётчиков
+    :type stages: dict
+
+    :param open_stages: Стек открытых этапов: пары [запись этапа, пик памяти вложенных этапов]
+    :type open_stages: list
+    """
+    def __init__(self, enabled: bool = False):
+        """
+        Инициализирует объект класса Profiler
+
+        :param enabled: Включены ли замеры
+        :type enabled: bool
+        """
+        self.enabled = enabled
+        self.stages = {}
+        self.open_stages = []
+
+    def get_stage(self, name: str) -> dict:
+        """
+        Возвращает запись этапа, создавая её при первом обращении
+
+        :param name: Название этапа
+        :type name: str
+
+        :return: Словарь счётчиков этапа
+        """
+        if name not in self.stages:
+            self.stages[name] = {'stage': name, 'depth': len(self.open_stages), 'seconds': 0, 'rows': 0}
+        return self.stages[name]
+
+    @contextmanager
+    def span(self, name: str):
+        """
+        Замеряет время и пиковую память блока кода; вложенные этапы выводятся с отступом
+
+        :param name: Название этапа
+        :type name: str
+
+        :return: Словарь счётчиков этапа, в который блок может записать количество строк
+        """
+        if not self.enabled:
+            yield {}
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if len(self.open_stages) != 0:
+            self.open_stages[-1][1] = max(self.open_stages[-1][1], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        stage = self.get_stage(name)
+        self.open_stages.append([stage, 0])
+        start = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            stage['seconds'] += time.perf_counter() - start
+            peak_memory = max(self.open_stages.pop()[1], tracemalloc.get_traced_memory()[1])
+            stage['peak_memory_mb'] = max(stage.get('peak_memory_mb', 0), round(peak_memory / 2 ** 20, 1))
+            if len(self.open_stages) != 0:
+                self.open_stages[-1][1] = max(self.open_stages[-1][1], peak_memory)
+
+    def add(self, name: str, counter: str, value: int = 1) -> None:
+        """
+        Увеличивает счётчик этапа
+
+        :param name: Название этапа
+        :type name: str
+
+        :param counter: Название счётчика, например rows или rejected
+        :type counter: str
+
+        :param value: Величина увеличения
+        :type value: int
+
+        :return:
+        """
+        if self.enabled:
+            stage = self.get_stage(name)
+            stage[counter] = stage.get(counter, 0) + value
+
+    def count(self, name: str, counter: str, iterable):
+        """
+        Подсчитывает элементы, проходящие через итерируемый объект; без замеров возвращает его же
+
+        :param name: Название этапа
+        :type name: str
+
+        :param counter: Название счётчика
+        :type counter: str
+
+        :param iterable: Итерируемый объект
+
+        :return: Итерируемый объект с теми же элементами
+        """
+        if not self.enabled:
+            return iterable
+        return self.count_items(self.get_stage(name), counter, iterable)
+
+    def count_items(self, stage: dict, counter: str, iterable):
+        """
+        Генератор, подсчитывающий элементы в записи этапа
+
+        :param stage: Словарь счётчиков этапа
+        :type stage: dict
+
+        :param counter: Название счётчика
+        :type counter: str
+
+        :param iterable: Итерируемый объект
+
+        :return: Генератор тех же элементов
+        """
+        stage.setdefault(counter, 0)
+        for item in iterable:
+            stage[counter] += 1
+            yield item
+
+    def call(self, name: str, function, *args):
+        """
+        Вызывает функцию, добавляя время вызова к этапу; подходит для замеров внутри циклов по строкам
+
+        :param name: Название этапа
+        :type name: str
+
+        :param function: Вызываемая функция
+
+        :param args: Аргументы функции
+
+        :return: Результат функции
+        """
+        if not self.enabled:
+            return function(*args)
+        start = time.perf_counter()
+        result = function(*args)
+        stage = self.get_stage(name)
+        stage['seconds'] += time.perf_counter() - start
+        stage['rows'] += 1
+        return result
+
+    def get_rows(self) -> list:
+        """
+        Возвращает записи этапов с округлённым временем
+
+        :return: Список словарей счётчиков этапов
+        """
+        return [dict(stage, seconds=round(stage['seconds'], 3)) for stage in self.stages.values()]
+
+    def print_table(self) -> None:
+        """
+        Выводит таблицу этапов с отступами по вложенности
+
+        :return:
+        """
+        rows = self.get_rows()
+        columns = [column for column in profile_columns if any(column in row for row in rows)]
+        table = [['Этап'] + [profile_columns[column] for column in columns]] + \
+                [['  ' * row['depth'] + row['stage']] + [str(row.get(column, '')) for column in columns]
+                 for row in rows]
+        widths = [max(len(line[i]) for line in table) for i in range(len(columns) + 1)]
+        for line in table:
+            print('  '.join(value.ljust(width) for value, width in zip(line, widths)))
+
+    def export_json(self, file_name: str) -> None:
+        """
+        Сохраняет записи этапов в JSON-файл
+
+        :param file_name: Название JSON-файла
+        :type file_name: str
+
+        :return:
+        """
+        with open(file_name, 'w', encoding='utf-8') as file:
+            json.dump(self.get_rows(), file, ensure_ascii=False, indent=4)
+
+
+profiler = Profiler(os.environ.get('VACANCIES_PROFILE', '') not in ('', '0'))
@@ -0,0 +1,268 @@
+import codecs
+import mmap
+
+
+def unquote_field(field: bytes) -> bytes:
+    """
+    Убирает кавычки вокруг поля csv-файла и раскрывает удвоенные кавычки внутри него
+
+    :param field: Поле строки в байтах
+    :type field: bytes
+
+    :return: Значение поля в байтах
+    """
+    if len(field) >= 2 and field[:1] == b'"' and field[-1:] == b'"':
+        return field[1:-1].replace(b'""', b'"')
+    return field
+
+
+def split_fields(row: bytes) -> list:
+    """
+    Разбивает строку csv-файла на поля с учётом запятых и переводов строк внутри кавычек
+
+    :param row: Строка csv-файла в байтах без завершающего перевода строки
+    :type row: bytes
+
+    :return: Список полей в байтах
+    """
+    if b'"' not in row:
+        return row.split(b',')
+    fields = []
+    current = None
+    for piece in row.split(b','):
+        current = piece if current is None else current + b',' + piece
+        if current.count(b'"') % 2 == 0:
+            fields.append(unquote_field(current))
+            current = None
+    if current is not None:
+        fields.append(unquote_field(current))
+    return fields
+
+
+def decode_field(field: bytes) -> str:
+    """
+    Декодирует поле так же, как csv.reader при открытии файла в текстовом режиме
+
+    :param field: Поле в байтах
+    :type field: bytes
+
+    :return: Строковое значение поля
+    """
+    value = field.decode('utf-8')
+    return value.replace('\r\n', '\n') if '\r' in value else value
+
+
+class MappedCsvReader:
+    """
+    Класс для чтения csv-файла вакансий через отображение в память: границы строк ищутся по байтам,
+    а декодируются только выбранные колонки строк, прошедших проверку на пустые ячейки
+
+    :param column_names: Список названий всех колонок файла
+    :type column_names: list
+
+    :param indexes: Индексы выбранных колонок
+    :type indexes: list
+
+    :param data_start: Смещение первой строки с данными
+    :type data_start: int
+
+    :param rejected_count: Количество отброшенных строк с пустыми ячейками или неверным числом полей
+    :type rejected_count: int
+    """
+    def __init__(self, file_name: str, columns: list = None):
+        """
+        Инициализирует объект класса MappedCsvReader
+
+        :param file_name: Название непустого csv-файла в кодировке utf_8_sig
+        :type file_name: str
+
+        :param columns: Названия выбираемых колонок; None - все колонки
+        :type columns: list
+        """
+        self.file = open(file_name, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        start = len(codecs.BOM_UTF8) if self.map[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8 else 0
+        header_end, self.data_start = next(self.get_row_bounds(start, len(self.map)))
+        self.column_names = [decode_field(field) for field in split_fields(self.get_row(start, header_end))]
+        self.indexes = list(range(len(self.column_names))) if columns is None else \
+            [self.column_names.index(column) for column in columns if column in self.column_names]
+        self.rejected_count = 0
+
+    def get_row_bounds(self, start: int, end: int):
+        """
+        Находит границы строк, начинающихся в диапазоне; перевод строки внутри кавычек не завершает строку
+
+        :param start: Смещение начала первой строки
+        :type start: int
+
+        :param end: Смещение, после которого строки не начинаются
+        :type end: int
+
+        :return: Генератор пар (конец строки без перевода строки, начало следующей строки)
+        """
+        size = len(self.map)
+        position = start
+        while position < end:
+            row_end = self.map.find(b'\n', position)
+            row_end = size if row_end == -1 else row_end
+            quotes = self.map[position:row_end].count(b'"')
+            while quotes % 2 == 1 and row_end < size:
+                next_end = self.map.find(b'\n', row_end + 1)
+                next_end = size if next_end == -1 else next_end
+                quotes += self.map[row_end:next_end].count(b'"')
+                row_end = next_end
+            yield row_end, row_end + 1
+            position = row_end + 1
+
+    def get_row(self, start: int, end: int) -> bytes:
+        """
+        Возвращает байты строки без завершающего возврата каретки
+
+        :param start: Смещение начала строки
+        :type start: int
+
+        :param end: Смещение конца строки
+        :type end: int
+
+        :return: Строка в байтах
+        """
+        row = self.map[start:end]
+        return row[:-1] if row[-1:] == b'\r' else row
+
+    def get_selected_column_names(self) -> list:
+        """
+        Возвращает названия выбранных колонок в порядке их следования в строках результата
+
+        :return: Список названий колонок
+        """
+        return [self.column_names[index] for index in self.indexes]
+
+    def get_row_ranges(self, parts_count: int) -> list:
+        """
+        Делит данные файла на диапазоны байтов, выровненные по границам строк, для параллельной обработки.
+        Перевод строки завершает строку, только если до него от начала данных чётное число кавычек,
+        поэтому граница не попадает внутрь многострочного поля в кавычках; кавычки считаются по байтам,
+        без разбора каждой строки
+
+        :param parts_count: Желаемое количество диапазонов
+        :type parts_count: int
+
+        :return: Список пар (начало, конец) смещений
+        """
+        size = len(self.map)
+        ranges = []
+        range_start = position = self.data_start
+        quotes = 0
+        for i in range(1, parts_count):
+            target = self.data_start + (size - self.data_start) * i // parts_count
+            if target <= range_start:
+                continue
+            quotes += self.map[position:target].count(b'"')
+            position = target
+            while position < size:
+                row_end = self.map.find(b'\n', position)
+                row_end = size if row_end == -1 else row_end
+                quotes += self.map[position:row_end].count(b'"')
+                position = row_end + 1
+                if quotes % 2 == 0:
+                    break
+            if position >= size:
+                break
+            ranges.append((range_start, position))
+            range_start = position
+        if range_start < size:
+            ranges.append((range_start, size))
+        return ranges
+
+    def read_offset_rows(self, start: int = None, end: int = None):
+        """
+        Лениво читает строки диапазона вместе с их смещениями, отбрасывая строки с пустыми ячейками до декодирования
+
+        :param start: Смещение начала диапазона; по умолчанию первая строка с данными
+        :type start: int
+
+        :param end: Смещение конца диапазона; по умолчанию конец файла
+        :type end: int
+
+        :return: Генератор пар (смещение строки, список значений выбранных колонок)
+        """
+        start = self.data_start if start is None else start
+        end = len(self.map) if end is None else end
+        columns_count = len(self.column_names)
+        position = start
+        for row_end, next_start in self.get_row_bounds(start, end):
+            row_start, row = position, self.get_row(position, row_end)
+            position = next_start
+            if len(row) == 0:
+                continue
+            fields = split_fields(row)
+            if len(fields) != columns_count or b'' in fields:
+                self.rejected_count += 1
+                continue
+            yield row_start, [decode_field(fields[index]) for index in self.indexes]
+
+    def read_rows(self, start: int = None, end: int = None):
+        """
+        Лениво читает строки диапазона, отбрасывая строки с пустыми ячейками до декодирования
+
+        :param start: Смещение начала диапазона; по умолчанию первая строка с данными
+        :type start: int
+
+        :param end: Смещение конца диапазона; по умолчанию конец файла
+        :type end: int
+
+        :return: Генератор списков значений выбранных колонок
+        """
+        for _, values in self.read_offset_rows(start, end):
+            yield values
+
+    def read_rows_at(self, offsets):
+        """
+        Читает только строки, начинающиеся по заданным смещениям, не просматривая остальной файл
+
+        :param offsets: Смещения начал строк, полученные от read_offset_rows
+        :type offsets: Iterable
+
+        :return: Генератор списков значений выбранных колонок
+        """
+        for offset in offsets:
+            row_end, _ = next(self.get_row_bounds(offset, offset + 1))
+            fields = split_fields(self.get_row(offset, row_end))
+            yield [decode_field(fields[index]) for index in self.indexes]
+
+    def close(self) -> None:
+        """
+        Закрывает отображение и файл
+
+        :return:
+        """
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def read_rows_range(file_name: str, columns: list, start: int, end: int) -> tuple:
+    """
+    Читает строки диапазона байтов; функция для запуска в отдельном процессе
+
+    :param file_name: Название csv-файла
+    :type file_name: str
+
+    :param columns: Названия выбираемых колонок
+    :type columns: list
+
+    :param start: Смещение начала диапазона
+    :type start: int
+
+    :param end: Смещение конца диапазона
+    :type end: int
+
+    :return: Кортеж из списка строк выбранных колонок и количества отброшенных строк
+    """
+    with MappedCsvReader(file_name, columns) as reader:
+        return list(reader.read_rows(start, end)), reader.rejected_count
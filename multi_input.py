@@ -0,0 +1,176 @@
+import csv
+import glob
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from compressed_input import get_decompressor, is_empty_file, open_vacancies_file
+
+batch_bytes = 16 * 2 ** 20
+
+
+def is_vacancies_file(file_name: str) -> bool:
+    """
+    Проверяет, что файл из каталога или шаблона - выгрузка вакансий: csv-файл или сжатый gzip, bz2 или xz файл;
+    файлы состояния, индексов, хранилищ и баз данных рядом с выгрузками пропускаются
+
+    :param file_name: Название файла
+    :type file_name: str
+
+    :return: True, если файл нужно читать как выгрузку
+    """
+    return file_name.lower().endswith('.csv') or get_decompressor(file_name) is not None
+
+
+def expand_input(name: str) -> list:
+    """
+    Раскрывает введённое название в список файлов: каталог, шаблон glob или перечисление через ', ';
+    из каталога и шаблона берутся только выгрузки вакансий (is_vacancies_file)
+
+    :param name: Название файла, каталога, шаблон или список названий через ', '
+    :type name: str
+
+    :return: Отсортированный список названий файлов (для одного файла - он сам)
+    """
+    if os.path.isdir(name):
+        return sorted(entry.path for entry in os.scandir(name) if entry.is_file() and is_vacancies_file(entry.path))
+    if glob.has_magic(name):
+        return sorted(file_name for file_name in glob.glob(name)
+                      if os.path.isfile(file_name) and is_vacancies_file(file_name))
+    if ', ' in name and not os.path.exists(name):
+        return [file_name for part in name.split(', ') for file_name in expand_input(part)]
+    return [name]
+
+
+def get_input_files(name: str) -> list:
+    """
+    Возвращает непустые файлы из введённого названия
+
+    :param name: Название файла, каталога, шаблон или список названий через ', '
+    :type name: str
+
+    :return: Список названий непустых файлов
+    """
+    return [file_name for file_name in expand_input(name) if not is_empty_file(file_name)]
+
+
+def get_column_names(file_name: str) -> list:
+    """
+    Возвращает названия колонок из первой строки файла
+
+    :param file_name: Название csv-файла
+    :type file_name: str
+
+    :return: Список названий колонок
+    """
+    with open_vacancies_file(file_name) as file:
+        return next(csv.reader(file), [])
+
+
+def select_files(file_names: list, column_names: list) -> list:
+    """
+    Оставляет файлы, в которых есть все нужные колонки; о пропущенных файлах сообщает
+
+    :param file_names: Список названий csv-файлов
+    :type file_names: list
+
+    :param column_names: Колонки, без которых файл прочитать нельзя
+    :type column_names: list
+
+    :return: Список названий подходящих файлов в исходном порядке
+    """
+    selected = []
+    for file_name in file_names:
+        part_column_names = get_column_names(file_name)
+        missing_columns = [column for column in column_names if column not in part_column_names]
+        if len(missing_columns) == 0:
+            selected.append(file_name)
+        else:
+            # сообщение идёт в stderr, чтобы не смешиваться с таблицей, выгружаемой в стандартный вывод
+            print(f"Файл {file_name} пропущен: нет колонок {', '.join(missing_columns)}", file=sys.stderr)
+    return selected
+
+
+def get_file_batches(file_names: list, min_batch_bytes: int = batch_bytes) -> list:
+    """
+    Объединяет подряд идущие маленькие файлы в пакеты, чтобы накладные расходы на задачу процесса
+    не превышали время обработки; порядок файлов сохраняется
+
+    :param file_names: Список названий файлов
+    :type file_names: list
+
+    :param min_batch_bytes: Размер пакета в байтах, после которого пакет закрывается
+    :type min_batch_bytes: int
+
+    :return: Список пакетов (списков названий файлов)
+    """
+    batches = []
+    batch = []
+    size = 0
+    for file_name in file_names:
+        batch.append(file_name)
+        size += os.path.getsize(file_name)
+        if size >= min_batch_bytes:
+            batches.append(batch)
+            batch = []
+            size = 0
+    if len(batch) != 0:
+        batches.append(batch)
+    return batches
+
+
+def process_batch(function, batch: list, args: tuple) -> list:
+    """
+    Применяет функцию к каждому файлу пакета; функция для запуска в отдельном процессе
+
+    :param function: Функция от названия файла и дополнительных аргументов
+    :type function: function
+
+    :param batch: Пакет названий файлов
+    :type batch: list
+
+    :param args: Дополнительные аргументы функции
+    :type args: tuple
+
+    :return: Список результатов в порядке файлов
+    """
+    return [function(file_name, *args) for file_name in batch]
+
+
+def map_files(function, file_names: list, args: tuple = (), workers: int = 1):
+    """
+    Обрабатывает файлы в пуле процессов пакетами и выдаёт результаты в порядке файлов; в обработке
+    и в ожидании выдачи одновременно не больше 2 * workers пакетов, поэтому результаты всех файлов
+    не копятся в памяти
+
+    :param function: Функция уровня модуля от названия файла и дополнительных аргументов
+    :type function: function
+
+    :param file_names: Список названий файлов
+    :type file_names: list
+
+    :param args: Дополнительные аргументы функции
+    :type args: tuple
+
+    :param workers: Количество процессов; при 1 или одном пакете файлы обрабатываются в текущем процессе
+    :type workers: int
+
+    :return: Генератор результатов в порядке файлов
+    """
+    batches = [] if workers <= 1 else \
+        get_file_batches(file_names, min(batch_bytes, sum(map(os.path.getsize, file_names)) // workers + 1))
+    if len(batches) <= 1:
+        for file_name in file_names:
+            yield function(file_name, *args)
+        return
+    with ProcessPoolExecutor(min(workers, len(batches))) as executor:
+        batches = iter(batches)
+        futures = deque(executor.submit(process_batch, function, batch, args)
+                        for batch in islice(batches, 2 * workers))
+        while len(futures) != 0:
+            results = futures.popleft().result()
+            batch = next(batches, None)
+            if batch is not None:
+                futures.append(executor.submit(process_batch, function, batch, args))
+            yield from results
@@ -0,0 +1,185 @@
+import os
+import pickle
+from array import array
+from bisect import bisect_left
+from heapq import merge
+
+# версия формата файла индекса; увеличивается при любом изменении сохраняемых полей
+index_version = 2
+get_trigrams = lambda text: {text[i:i + 3] for i in range(len(text) - 2)}
+get_names_name = lambda file_name: os.path.splitext(file_name)[0] + '.names'
+
+
+def get_source_signature(file_name: str) -> tuple:
+    """
+    Возвращает подпись csv-файла, по которой проверяется, что индекс построен именно по нему
+
+    :param file_name: Название csv-файла
+    :type file_name: str
+
+    :return: Кортеж из имени файла, его размера и времени изменения в наносекундах
+    """
+    stat = os.stat(file_name)
+    return os.path.basename(file_name), stat.st_size, stat.st_mtime_ns
+
+
+class NameIndex:
+    """
+    Класс триграммного индекса названий вакансий: запрос сводится к пересечению списков названий
+    по его триграммам, а кандидаты проверяются точным вхождением подстроки
+
+    :param names: Список различных названий; позиция - идентификатор названия
+    :type names: list
+
+    :param name_ids: Словарь: название -> идентификатор
+    :type name_ids: dict
+
+    :param trigrams: Словарь: триграмма -> возрастающий массив идентификаторов названий
+    :type trigrams: dict
+
+    :param name_rows: Список массивов номеров строк (в порядке добавления) для каждого названия
+    :type name_rows: list
+
+    :param rows_count: Количество добавленных строк
+    :type rows_count: int
+
+    :param row_offsets: Смещения строк в csv-файле по номерам строк, если индекс построен по байтам файла
+    :type row_offsets: array
+    """
+    def __init__(self):
+        """
+        Инициализирует объект класса NameIndex
+        """
+        self.names = []
+        self.name_ids = {}
+        self.trigrams = {}
+        self.name_rows = []
+        self.rows_count = 0
+        self.row_offsets = array('Q')
+
+    def add(self, name: str, offset: int = None) -> int:
+        """
+        Добавляет в индекс очередную строку с названием вакансии
+
+        :param name: Название вакансии
+        :type name: str
+
+        :param offset: Смещение строки в csv-файле; None - смещения не хранятся
+        :type offset: int
+
+        :return: Номер добавленной строки
+        """
+        if offset is not None:
+            self.row_offsets.append(offset)
+        name_id = self.name_ids.get(name)
+        if name_id is None:
+            name_id = len(self.names)
+            self.names.append(name)
+            self.name_ids[name] = name_id
+            self.name_rows.append(array('I'))
+            for trigram in get_trigrams(name):
+                self.trigrams.setdefault(trigram, array('I')).append(name_id)
+        self.name_rows[name_id].append(self.rows_count)
+        self.rows_count += 1
+        return self.rows_count - 1
+
+    def get_candidates(self, query: str, first_id: int = 0):
+        """
+        Возвращает идентификаторы названий, содержащих все триграммы запроса
+
+        :param query: Подстрока запроса
+        :type query: str
+
+        :param first_id: Наименьший идентификатор результата; названия до него уже проверены вызывающим кодом
+        :type first_id: int
+
+        :return: Множество идентификаторов (для запроса короче трёх символов - все названия)
+        """
+        postings = [self.trigrams.get(trigram, ()) for trigram in get_trigrams(query)]
+        if first_id > 0:
+            # списки идентификаторов возрастают, поэтому уже проверенные названия отсекаются двоичным поиском
+            postings = [posting[bisect_left(posting, first_id):] for posting in postings]
+        postings.sort(key=len)
+        if len(postings) == 0:
+            return range(first_id, len(self.names))
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if len(candidates) == 0:
+                break
+            candidates.intersection_update(posting)
+        return candidates
+
+    def find_names(self, query: str, first_id: int = 0) -> list:
+        """
+        Находит названия, содержащие подстроку запроса
+
+        :param query: Подстрока запроса
+        :type query: str
+
+        :param first_id: Наименьший идентификатор названия; позволяет проверять только добавленные с тех пор названия
+        :type first_id: int
+
+        :return: Список подходящих названий
+        """
+        return [self.names[name_id] for name_id in sorted(self.get_candidates(query, first_id))
+                if query in self.names[name_id]]
+
+    def find_rows(self, query: str) -> list:
+        """
+        Находит номера строк, название которых содержит подстроку запроса
+
+        :param query: Подстрока запроса
+        :type query: str
+
+        :return: Возрастающий список номеров строк
+        """
+        return list(merge(*(self.name_rows[self.name_ids[name]] for name in self.find_names(query))))
+
+    def get_equal_rows(self, name: str) -> list:
+        """
+        Возвращает номера строк с точно совпадающим названием
+
+        :param name: Название вакансии
+        :type name: str
+
+        :return: Возрастающий список номеров строк
+        """
+        return list(self.name_rows[self.name_ids[name]]) if name in self.name_ids else []
+
+    def save(self, file_name: str, source_name: str) -> None:
+        """
+        Сохраняет индекс в файл вместе с подписью csv-файла, по строкам которого он построен
+
+        :param file_name: Название файла индекса
+        :type file_name: str
+
+        :param source_name: Название csv-файла
+        :type source_name: str
+
+        :return:
+        """
+        with open(file_name, 'wb') as file:
+            pickle.dump({'version': index_version, 'source': get_source_signature(source_name), 'index': self}, file,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(file_name: str, source_name: str):
+        """
+        Загружает индекс из файла, если он построен по текущей версии csv-файла
+
+        :param file_name: Название файла индекса
+        :type file_name: str
+
+        :param source_name: Название csv-файла
+        :type source_name: str
+
+        :return: Объект класса NameIndex или None, если файла нет, он сохранён в другой версии формата
+            или csv-файл с тех пор изменился
+        """
+        if not os.path.exists(file_name):
+            return None
+        with open(file_name, 'rb') as file:
+            index = pickle.load(file)
+        if index.get('version') != index_version or index['source'] != get_source_signature(source_name):
+            return None
+        return index['index']
@@ -0,0 +1,188 @@
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+
+
+@contextmanager
+def start_workers(workers: int):
+    """
+    Создаёт пул процессов и сразу запускает все его процессы, чтобы они создавались (fork) до потоков
+    чтения и распаковки источника; вызывающий код открывает источник уже внутри блока with
+
+    :param workers: Количество процессов; при 1 и меньше пул не создаётся
+    :type workers: int
+
+    :return: Контекстный менеджер, выдающий ProcessPoolExecutor или None
+    """
+    if workers <= 1:
+        yield None
+        return
+    with ProcessPoolExecutor(workers) as executor:
+        executor.submit(int).result()
+        yield executor
+
+
+class StagedPipeline:
+    """
+    Класс конвейера из трёх стадий: поток чтения нарезает строки источника на пакеты, пул процессов
+    обрабатывает пакеты, а вызывающий код получает результаты по порядку и строит из них итог.
+    Очереди между стадиями ограничены, поэтому чтение не убегает вперёд обработки, а в памяти
+    одновременно находится не больше queue_depth пакетов на стадию
+
+    :param source: Итерируемый объект со строками; читается в отдельном потоке (ввод-вывод, распаковка)
+    :type source: iterable
+
+    :param transform: Функция уровня модуля, обрабатывающая пакет строк в процессе пула
+    :type transform: function
+
+    :param args: Дополнительные аргументы transform
+    :type args: tuple
+
+    :param chunk_size: Количество строк в пакете
+    :type chunk_size: int
+
+    :param queue_depth: Максимальное количество пакетов в очереди чтения и в обработке
+    :type queue_depth: int
+
+    :param workers: Количество процессов; 0 - обработка в вызывающем потоке
+    :type workers: int
+
+    :param pack: Функция, которой пакет сериализуется в потоке чтения перед передачей в transform
+        (например, marshal.dumps), чтобы в процессы уходил один объект bytes вместо списка строк; None - без неё
+    :type pack: function
+
+    :param executor: Пул процессов из start_workers, созданный до открытия источника; None - пул создаётся
+        конвейером из workers процессов
+    :type executor: ProcessPoolExecutor
+    """
+    def __init__(self, source, transform, args: tuple = (), chunk_size: int = 5000, queue_depth: int = 4,
+                 workers: int = 1, pack=None, executor=None):
+        """
+        Инициализирует объект класса StagedPipeline
+
+        :param source: Итерируемый объект со строками
+        :type source: iterable
+
+        :param transform: Функция уровня модуля от пакета строк и дополнительных аргументов
+        :type transform: function
+
+        :param args: Дополнительные аргументы transform
+        :type args: tuple
+
+        :param chunk_size: Количество строк в пакете
+        :type chunk_size: int
+
+        :param queue_depth: Максимальное количество пакетов в очереди чтения и в обработке
+        :type queue_depth: int
+
+        :param workers: Количество процессов; 0 - обработка в вызывающем потоке
+        :type workers: int
+
+        :param pack: Функция сериализации пакета в потоке чтения или None
+        :type pack: function
+
+        :param executor: Пул процессов, созданный до открытия источника, или None
+        :type executor: ProcessPoolExecutor
+        """
+        self.source = source
+        self.transform = transform
+        self.args = args
+        self.chunk_size = chunk_size
+        self.queue_depth = queue_depth
+        self.workers = workers
+        self.pack = pack
+        self.executor = executor
+        self.chunks = queue.Queue(queue_depth)
+        self.stopped = threading.Event()
+        self.error = None
+
+    def read(self) -> None:
+        """
+        Стадия чтения: нарезает источник на пакеты и кладёт их в очередь; None обозначает конец
+
+        :return:
+        """
+        try:
+            iterator = iter(self.source)
+            chunk = list(islice(iterator, self.chunk_size))
+            while len(chunk) != 0 and not self.stopped.is_set():
+                self.put_chunk(chunk if self.pack is None else self.pack(chunk))
+                chunk = list(islice(iterator, self.chunk_size))
+        except Exception as error:
+            self.error = error
+        finally:
+            self.put_chunk(None)
+
+    def put_chunk(self, chunk) -> None:
+        """
+        Кладёт пакет в очередь, ожидая свободного места, пока конвейер не остановлен
+
+        :param chunk: Пакет строк или None
+        :type chunk: list
+
+        :return:
+        """
+        while not self.stopped.is_set():
+            try:
+                self.chunks.put(chunk, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def get_chunks(self):
+        """
+        Генератор пакетов из очереди чтения; пробрасывает исключение стадии чтения
+
+        :return: Генератор пакетов строк
+        """
+        while True:
+            chunk = self.chunks.get()
+            if chunk is None:
+                if self.error is not None:
+                    raise self.error
+                return
+            yield chunk
+
+    def __iter__(self):
+        """
+        Запускает стадии и возвращает результаты обработки пакетов в порядке чтения
+
+        :return: Генератор результатов transform
+        """
+        if self.executor is not None or self.workers <= 0:
+            yield from self.run_stages(self.executor)
+            return
+        with ProcessPoolExecutor(self.workers) as executor:
+            # процессы пула создаются (fork) до запуска потока чтения
+            executor.submit(int).result()
+            yield from self.run_stages(executor)
+
+    def run_stages(self, executor):
+        """
+        Запускает поток чтения и обрабатывает пакеты, держа в работе не больше queue_depth пакетов
+
+        :param executor: Пул процессов или None для обработки в вызывающем потоке
+        :type executor: ProcessPoolExecutor
+
+        :return: Генератор результатов transform
+        """
+        reader = threading.Thread(target=self.read, daemon=True)
+        reader.start()
+        try:
+            if executor is None:
+                for chunk in self.get_chunks():
+                    yield self.transform(chunk, *self.args)
+                return
+            futures = deque()
+            for chunk in self.get_chunks():
+                futures.append(executor.submit(self.transform, chunk, *self.args))
+                if len(futures) >= max(self.queue_depth, self.workers):
+                    yield futures.popleft().result()
+            while len(futures) != 0:
+                yield futures.popleft().result()
+        finally:
+            self.stopped.set()
+            reader.join()
@@ -0,0 +1,126 @@
+import random
+from math import ceil
+
+
+class QuantileSketch:
+    """
+    Класс для потоковой оценки квантилей (KLL-скетч) в ограниченном объёме памяти
+
+    :param k: Точность скетча: ёмкость верхнего уровня компакторов
+    :type k: int
+
+    :param compactors: Список уровней скетча; элемент уровня h имеет вес 2 ** h
+    :type compactors: list
+
+    :param count: Количество добавленных в скетч значений
+    :type count: int
+    """
+    def __init__(self, k: int = 200, seed=None):
+        """
+        Инициализирует объект класса QuantileSketch
+
+        :param k: Точность скетча: ёмкость верхнего уровня компакторов
+        :type k: int
+
+        :param seed: Начальное значение генератора случайных чисел для сжатия уровней
+        :type seed: int
+        """
+        self.k = k
+        self.compactors = [[]]
+        self.count = 0
+        self.random = random.Random(seed)
+
+    def add(self, value) -> None:
+        """
+        Добавляет значение в скетч
+
+        :param value: Добавляемое значение
+        :type value: float
+
+        :return:
+        """
+        self.compactors[0].append(value)
+        self.count += 1
+        if len(self.compactors[0]) >= self.get_capacity(0):
+            self.compress()
+
+    def merge(self, other) -> None:
+        """
+        Объединяет скетч с другим скетчем, построенным по другой части данных
+
+        :param other: Объединяемый скетч
+        :type other: QuantileSketch
+
+        :return:
+        """
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self.count += other.count
+        self.compress()
+
+    def get_capacity(self, level: int) -> int:
+        """
+        Возвращает ёмкость уровня скетча: чем ниже уровень, тем меньше ёмкость
+
+        :param level: Номер уровня
+        :type level: int
+
+        :return: Максимальное количество элементов на уровне
+        """
+        depth = len(self.compactors) - level - 1
+        return max(2, ceil(self.k * (2 / 3) ** depth))
+
+    def compress(self) -> None:
+        """
+        Сжимает переполненные уровни, перенося каждый второй элемент на уровень выше
+
+        :return:
+        """
+        level = 0
+        while level < len(self.compactors):
+            if len(self.compactors[level]) >= self.get_capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append([])
+                items = sorted(self.compactors[level])
+                last = items.pop() if len(items) % 2 else None
+                self.compactors[level + 1].extend(items[self.random.randint(0, 1)::2])
+                self.compactors[level] = [] if last is None else [last]
+            level += 1
+
+    def get_quantile(self, fraction: float):
+        """
+        Возвращает приближённое значение квантиля
+
+        :param fraction: Уровень квантиля от 0 до 1
+        :type fraction: float
+
+        :return: Значение квантиля или 0, если скетч пуст
+        """
+        return self.get_quantiles([fraction])[0]
+
+    def get_quantiles(self, fractions: list) -> list:
+        """
+        Возвращает приближённые значения нескольких квантилей за один проход по скетчу
+
+        :param fractions: Список уровней квантилей от 0 до 1
+        :type fractions: list
+
+        :return: Список значений квантилей в том же порядке
+        """
+        weighted_items = sorted((item, 2 ** level) for level, items in enumerate(self.compactors) for item in items)
+        if len(weighted_items) == 0:
+            return [0 for _ in fractions]
+        total_weight = sum(weight for _, weight in weighted_items)
+        result = []
+        for fraction in fractions:
+            cumulative_weight = 0
+            value = weighted_items[-1][0]
+            for item, weight in weighted_items:
+                cumulative_weight += weight
+                if cumulative_weight >= fraction * total_weight:
+                    value = item
+                    break
+            result.append(value)
+        return result
@@ -0,0 +1,136 @@
+import math
+import random
+from collections import deque
+from itertools import islice
+
+confidence_z = 1.96
+
+
+class ReservoirSampler:
+    """
+    Класс равномерной выборки фиксированного размера из потока неизвестной длины (алгоритм L):
+    после заполнения резервуара номер следующей попадающей в выборку строки разыгрывается заранее,
+    а строки между ними пропускаются без обработки
+
+    :param size: Размер выборки
+    :type size: int
+
+    :param random: Генератор случайных чисел
+    :type random: Random
+
+    :param items: Строки выборки
+    :type items: list
+
+    :param seen_count: Количество просмотренных строк потока
+    :type seen_count: int
+
+    :param weight: Текущий вес алгоритма L
+    :type weight: float
+
+    :param next_index: Номер следующей строки потока, попадающей в выборку
+    :type next_index: int
+    """
+    def __init__(self, size: int, seed: int = None):
+        """
+        Инициализирует объект класса ReservoirSampler
+
+        :param size: Размер выборки
+        :type size: int
+
+        :param seed: Начальное значение генератора случайных чисел
+        :type seed: int
+        """
+        self.size = size
+        self.random = random.Random(seed)
+        self.items = []
+        self.seen_count = 0
+        self.weight = 1.0
+        self.next_index = 0
+
+    def get_skip(self) -> int:
+        """
+        Разыгрывает количество строк, пропускаемых до следующей попадающей в выборку
+
+        :return: Количество пропускаемых строк
+        """
+        self.weight *= math.exp(math.log(1.0 - self.random.random()) / self.size)
+        return int(math.log(1.0 - self.random.random()) / math.log(1.0 - self.weight))
+
+    def sample(self, items) -> None:
+        """
+        Добавляет в выборку строки из потока; может вызываться для нескольких потоков подряд
+
+        :param items: Итерируемый объект со строками
+        :type items: iterable
+
+        :return:
+        """
+        numbered = enumerate(items, self.seen_count)
+        while len(self.items) < self.size:
+            entry = next(numbered, None)
+            if entry is None:
+                return
+            self.items.append(entry[1])
+            self.seen_count = entry[0] + 1
+            if len(self.items) == self.size:
+                self.next_index = self.seen_count + self.get_skip()
+        while True:
+            last = deque(islice(numbered, self.next_index - self.seen_count + 1), maxlen=1)
+            if len(last) == 0:
+                return
+            index, item = last[0]
+            self.seen_count = index + 1
+            if index != self.next_index:
+                return
+            self.items[self.random.randrange(self.size)] = item
+            self.next_index = self.seen_count + self.get_skip()
+
+
+def get_mean_interval(values: list, sampling_fraction: float = 0, z: float = confidence_z):
+    """
+    Возвращает доверительный интервал среднего по нормальному приближению с поправкой на конечность генеральной
+    совокупности
+
+    :param values: Значения выборки
+    :type values: list
+
+    :param sampling_fraction: Доля выборки в генеральной совокупности
+    :type sampling_fraction: float
+
+    :param z: Квантиль нормального распределения для уровня доверия
+    :type z: float
+
+    :return: Кортеж из нижней и верхней границ или None, если значений меньше двух
+    """
+    if len(values) < 2:
+        return None
+    mean = sum(values) / len(values)
+    variance = sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+    half_width = z * math.sqrt(variance / len(values) * (1 - sampling_fraction))
+    return mean - half_width, mean + half_width
+
+
+def get_fraction_interval(count: int, sample_count: int, sampling_fraction: float = 0, z: float = confidence_z):
+    """
+    Возвращает доверительный интервал доли по нормальному приближению с поправкой на конечность генеральной
+    совокупности
+
+    :param count: Количество строк выборки с признаком
+    :type count: int
+
+    :param sample_count: Размер выборки
+    :type sample_count: int
+
+    :param sampling_fraction: Доля выборки в генеральной совокупности
+    :type sampling_fraction: float
+
+    :param z: Квантиль нормального распределения для уровня доверия
+    :type z: float
+
+    :return: Кортеж из нижней и верхней границ в пределах [0, 1] или None для пустой выборки
+    """
+    if sample_count == 0:
+        return None
+    fraction = count / sample_count
+    half_width = z * math.sqrt(fraction * (1 - fraction) / sample_count * (1 - sampling_fraction))
+    return max(0.0, fraction - half_width), min(1.0, fraction + half_width)
@@ -0,0 +1,56 @@
+import csv
+import json
+import os
+import sys
+
+export_formats = {'.csv': 'csv', '.jsonl': 'jsonl', '.json': 'jsonl'}
+
+
+def get_export_format(file_name: str) -> str:
+    """
+    Определяет формат выгрузки по расширению файла; '-' (стандартный вывод) и неизвестные расширения - csv
+
+    :param file_name: Название файла выгрузки или '-'
+    :type file_name: str
+
+    :return: 'csv' или 'jsonl'
+    """
+    return export_formats.get(os.path.splitext(file_name)[1].lower(), 'csv')
+
+
+def write_table(rows, fields: list, file_name: str) -> int:
+    """
+    Построчно записывает строки таблицы в csv-файл с заголовком или в JSON Lines (объект на строку);
+    строки не накапливаются, поэтому память не зависит от их количества
+
+    :param rows: Итерируемый объект со словарями строк таблицы
+    :type rows: iterable
+
+    :param fields: Выводимые колонки в порядке вывода
+    :type fields: list
+
+    :param file_name: Название файла выгрузки или '-' для стандартного вывода
+    :type file_name: str
+
+    :return: Количество записанных строк
+    """
+    export_format = get_export_format(file_name)
+    file = sys.stdout if file_name == '-' else open(file_name, 'w', encoding='utf-8', newline='')
+    count = 0
+    try:
+        if export_format == 'csv':
+            writer = csv.writer(file)
+            writer.writerow(fields)
+            for row in rows:
+                writer.writerow([row[field] for field in fields])
+                count += 1
+        else:
+            for row in rows:
+                file.write(json.dumps({field: row[field] for field in fields}, ensure_ascii=False) + '\n')
+                count += 1
+    finally:
+        if file is sys.stdout:
+            file.flush()
+        else:
+            file.close()
+    return count
@@ -1,9 +1,23 @@
 import csv
+import marshal
 import re
 import os
+from itertools import islice
 from prettytable import PrettyTable, ALL
+from instrumentation import profiler
+from compressed_input import get_decompressor, is_empty_file, open_vacancies_file
+from multi_input import expand_input, get_input_files, get_column_names, map_files, select_files
+from name_index import NameIndex, get_names_name
+from mmap_reader import MappedCsvReader
+from vacancies_db import VacanciesDatabase, is_vacancies_database
+from categorical import vacancy_encoding
+from table_export import write_table
+from vacancies_sort import sort_keys, sort_rows
+from columnar_store import ColumnarStore, get_store_name, is_store_fresh, set_columns
+from pipeline import StagedPipeline
 
 columns_max_length = 20
+parallel_batch_size = 2000
 
 title_translations = ['№', 'Название', 'Описание', 'Навыки', 'Опыт работы', 'Премиум-вакансия', 'Компания',
                       'Оклад', 'Название региона', 'Дата публикации вакансии']
@@ -12,6 +26,8 @@ title_translations1 = {'№': '№', 'name': 'Название', 'description':
                        'salary_from': '', 'salary_to': 'Оклад', 'salary_gross': 'Оклад указан до вычета налогов',
                        'salary_currency': 'Идентификатор валюты оклада', 'area_name': 'Название региона',
                        'published_at': 'Дата публикации вакансии'}
+database_orders = {'Оклад': 'salary', 'Дата публикации вакансии': 'published_at', 'Название': 'name',
+                   'Навыки': 'skills_count'}
 experience_translations = {'noExperience': 'Нет опыта', 'between1And3': 'От 1 года до 3 лет',
                            'between3And6': 'От 3 до 6 лет', 'moreThan6': 'Более 6 лет'}
 currency_translations = {'AZN': 'Манаты', 'BYR': 'Белорусские рубли', 'EUR': 'Евро', 'GEL': 'Грузинский лари',
@@ -38,19 +54,74 @@ reform_table = lambda data, separator: [] if len(data) == 0 else data.split(sepa
 
 
 def csv_reader(file_name):
-    file = open(file_name, encoding='utf_8_sig')
+    file = open_vacancies_file(file_name)
     reader = csv.reader(file)
     vacancies = []
     for line in reader:
         vacancies.append(line)
+    file.close()
     column_names = vacancies.pop(0)
     full_vacancies = []
     for job in vacancies:
         if len(job) == len(column_names) and job.count('') == 0:
             full_vacancies.append(job)
+    profiler.add('Чтение csv-файла', 'rows', len(full_vacancies))
+    profiler.add('Чтение csv-файла', 'rejected', len(vacancies) - len(full_vacancies))
     return column_names, full_vacancies
 
 
+def read_vacancies_files(name, workers=1):
+    file_names = get_input_files(name)
+    if len(file_names) == 0:
+        return None
+    column_names = get_column_names(file_names[0])
+    full_vacancies = []
+    for part_column_names, part_vacancies in map_files(csv_reader, select_files(file_names, column_names),
+                                                       workers=workers):
+        if part_column_names == column_names:
+            full_vacancies.extend(part_vacancies)
+        else:
+            indexes = [part_column_names.index(column) for column in column_names]
+            full_vacancies.extend([job[i] for i in indexes] for job in part_vacancies)
+    return column_names, full_vacancies
+
+
+def get_vacancies_stream(file_names):
+    column_names = get_column_names(file_names[0])
+    yield column_names
+    for file_name in select_files(file_names, column_names):
+        with open_vacancies_file(file_name) as file:
+            reader = csv.reader(file)
+            part_column_names = next(reader, [])
+            indexes = None if part_column_names == column_names else \
+                [part_column_names.index(column) for column in column_names]
+            for job in reader:
+                if len(job) == len(part_column_names) and job.count('') == 0:
+                    yield job if indexes is None else [job[i] for i in indexes]
+
+
+def get_indexed_vacancies(name, reformed):
+    # индекс хранит смещения строк csv-файла, поэтому при фильтре по названию читаются и разбираются только они
+    if reformed[0] != 'Название' or len(reformed) < 2 or expand_input(name) != [name] or not os.path.isfile(name) or \
+            is_empty_file(name) or get_decompressor(name) is not None:
+        return None
+    names_name = get_names_name(name)
+    name_index = NameIndex.load(names_name, name)
+    if name_index is None:
+        with MappedCsvReader(name, ['name']) as reader:
+            if 'name' not in reader.column_names:
+                return None
+            name_index = NameIndex()
+            for offset, values in reader.read_offset_rows():
+                name_index.add(clean_value(values[0], 'name'), offset)
+        name_index.save(names_name, name)
+    if name_index.rows_count == 0:
+        return None
+    with MappedCsvReader(name) as reader:
+        offsets = [name_index.row_offsets[i] for i in name_index.get_equal_rows(reformed[1])]
+        return reader.column_names, list(reader.read_rows_at(offsets))
+
+
 def check_skills(filter_skills: list, original: list):
     return all(skill in original for skill in filter_skills)
 
@@ -60,37 +131,111 @@ def parse_filter_string(param: str):
     return new_data
 
 
+def check_filter(vac, i, reformed):
+    return (reformed[0] == 'Навыки' and check_skills(reformed[1].split(', '), vac[i].split('# ')) or
+            reformed[0] == 'Оклад' and f1(vac[i - 1]) <= int(reformed[1]) <= f1(vac[i]) or
+            reformed[0] == 'Идентификатор валюты оклада' and reformed[1] in currency_translations.values() or
+            reformed[0] == 'Дата публикации вакансии' and reformed[1] == reform_date(vac[i][:10]) or
+            reformed[0] == 'Опыт работы' and reformed[1] == experience_translations[vac[i]] or
+            reformed[1] == vac[i])
+
+
+def clean_value(value, column):
+    value = re.sub(r'\<[^>]*\>', '', value)
+    if value.count('\n') != 0:
+        if column == 'key_skills':
+            value = "# ".join(value.split("\n"))
+        else:
+            value = ", ".join(value.split("\n"))
+    return ' '.join(value.split())
+
+
+def filer_row(vac, list_naming, filter_parameter, reformed, code_matches):
+    description = {}
+    for i in range(len(list_naming)):
+        vac[i] = clean_value(vac[i], list_naming[i])
+        code = None
+        if list_naming[i] in vacancy_encoding.tables:
+            code = vacancy_encoding.encode(list_naming[i], vac[i])
+            vac[i] = vacancy_encoding.decode(list_naming[i], code)
+        if vac[i] == 'False' or vac[i] == 'True':
+            vac[i] = translate_bool_string(vac[i])
+        if filter_parameter != '' and reformed[0] == title_translations1[list_naming[i]]:
+            if code is None:
+                matched = check_filter(vac, i, reformed)
+            elif code in code_matches:
+                matched = code_matches[code]
+            else:
+                matched = code_matches[code] = check_filter(vac, i, reformed)
+            if not matched:
+                return None
+        description[list_naming[i]] = vac[i]
+    return description
+
+
 def csv_filer(reader, list_naming, filter_parameter, reformed):
     descriptions = []
     number = 1
+    # для категориальных колонок фильтр проверяется один раз на код значения
+    code_matches = {}
     for vac in reader:
-        vac_index = reader.index(vac)
         descriptions.append({'№': number})
-        for i in range(len(list_naming)):
-            vac[i] = re.sub(r'\<[^>]*\>', '', vac[i])
-            if vac[i].count('\n') != 0:
-                if list_naming[i] == 'key_skills':
-                    vac[i] = "# ".join(vac[i].split("\n"))
-                else:
-                    vac[i] = ", ".join(vac[i].split("\n"))
-            vac[i] = ' '.join(vac[i].split())
-            if vac[i] == 'False' or vac[i] == 'True':
-                vac[i] = translate_bool_string(vac[i])
-            if filter_parameter != '' and reformed[0] == title_translations1[list_naming[i]]:
-                if not (reformed[0] == 'Навыки' and check_skills(reformed[1].split(', '), vac[i].split('# ')) or
-                        reformed[0] == 'Оклад' and f1(vac[i - 1]) <= int(reformed[1]) <= f1(vac[i]) or
-                        reformed[0] == 'Идентификатор валюты оклада' and
-                        reformed[1] in currency_translations.values() or
-                        reformed[0] == 'Дата публикации вакансии' and reformed[1] == reform_date(vac[i]) or
-                        reformed[0] == 'Опыт работы' and reformed[1] == experience_translations[vac[i]] or
-                        reformed[1] == vac[i]):
-                    number -= 1
-                    break
-            descriptions[vac_index][list_naming[i]] = vac[i]
+        description = filer_row(vac, list_naming, filter_parameter, reformed, code_matches)
+        if description is None:
+            number -= 1
+        else:
+            descriptions[-1].update(description)
         number += 1
     return descriptions
 
 
+def iter_filer(reader, list_naming, filter_parameter, reformed):
+    number = 1
+    code_matches = {}
+    for vac in reader:
+        description = filer_row(vac, list_naming, filter_parameter, reformed, code_matches)
+        if description is not None:
+            yield dict({'№': number}, **description)
+            number += 1
+
+
+def filer_batch(batch, list_naming, filter_parameter, reformed, is_formatted):
+    # пакет приходит и уходит одним объектом marshal; номера строк проставляет вызывающий процесс
+    code_matches = {}
+    rows = []
+    for vac in marshal.loads(batch):
+        description = filer_row(vac, list_naming, filter_parameter, reformed, code_matches)
+        if description is not None:
+            description = dict({'№': 0}, **description)
+            rows.append(list((formatter(description) if is_formatted else description).values()))
+        else:
+            rows.append(None)
+    return marshal.dumps(rows)
+
+
+def format_batch(batch, names):
+    return marshal.dumps([list(formatter(dict(zip(names, values))).values()) for values in marshal.loads(batch)])
+
+
+def parallel_filer(reader, list_naming, filter_parameter, reformed, workers, is_formatted=False):
+    names = title_translations if is_formatted else ['№'] + list_naming
+    number = 1
+    for batch in StagedPipeline(reader, filer_batch, (list_naming, filter_parameter, reformed, is_formatted),
+                                parallel_batch_size, workers=workers if workers > 1 else 0, pack=marshal.dumps):
+        for values in marshal.loads(batch):
+            if values is not None:
+                values[0] = number
+                yield dict(zip(names, values))
+                number += 1
+
+
+def parallel_formatter(rows, names, workers):
+    for batch in StagedPipeline((list(vac.values()) for vac in rows), format_batch, (names,), parallel_batch_size,
+                                workers=workers if workers > 1 else 0, pack=marshal.dumps):
+        for values in marshal.loads(batch):
+            yield dict(zip(title_translations, values))
+
+
 def f1(line: str):
     return int(line.split('.')[0])
 
@@ -127,15 +272,15 @@ def reform_date(date: str):
     return '.'.join(dates)
 
 
-def print_vacancies(data_vacancies, dic_naming, row_numbers, columns):
+def print_vacancies(data_vacancies, dic_naming, row_numbers, columns, is_formatted=False):
     table = PrettyTable(dic_naming)
     table.align = "l"
     table.hrules = ALL
     table.max_width = columns_max_length
     flag = False
     for vac in data_vacancies:
-        if len(vac) == 13:
-            vac = formatter(vac)
+        if is_formatted or len(vac) == 13:
+            vac = vac if is_formatted else formatter(vac)
             table.add_row(vac.values())
             flag = True
     if flag:
@@ -159,21 +304,232 @@ def get_cut_table(table, row_numbers, columns):
     return table.get_string(fields=field)
 
 
-def get_vacancies_table():
+def sort_vacancies(data_vacancies, sort_parameter, is_descending, row_numbers):
+    rows_data = reform_table(row_numbers, ' ')
+    limit = max(int(rows_data[1]) - 1, 0) if len(rows_data) == 2 else None
+    rows = sort_rows((vac for vac in data_vacancies if len(vac) == 13), sort_parameter, is_descending, limit)
+    for number, vac in enumerate(rows, 1):
+        vac['№'] = number
+        yield vac
+
+
+def export_vacancies(data_vacancies, row_numbers, columns, output_name):
+    rows_data = reform_table(row_numbers, ' ')
+    columns_data = reform_table(columns, ', ')
+    if any(column not in title_translations for column in columns_data):
+        print('Названия столбцов некорректны')
+        return
+    start = max(int(rows_data[0]) - 1, 0) if len(rows_data) != 0 else 0
+    end = max(int(rows_data[1]) - 1, start) if len(rows_data) == 2 else None
+    fields = [title for title in title_translations if title == '№' or title in columns_data] \
+        if len(columns_data) > 0 else title_translations
+    rows = (formatter(vac) for vac in islice((vac for vac in data_vacancies if len(vac) == 13), start, end))
+    count = write_table(rows, fields, output_name)
+    if output_name != '-':
+        print(f"Выгружено вакансий: {count}")
+
+
+def get_database_condition(reformed):
+    column = [column for column, title in title_translations1.items() if title == reformed[0]][0]
+    value = reformed[1]
+    if reformed[0] == 'Навыки':
+        skills = list(dict.fromkeys(value.split(', ')))
+        return (f"id IN (SELECT vacancy_id FROM key_skills WHERE skill IN ({', '.join('?' * len(skills))}) "
+                f"GROUP BY vacancy_id HAVING COUNT(DISTINCT skill) = ?)", tuple(skills) + (len(skills),))
+    if reformed[0] == 'Оклад':
+        return 'salary_from < ? AND salary_to >= ?', (int(value) + 1, int(value))
+    if reformed[0] == 'Дата публикации вакансии':
+        return 'published_at = ?', ('-'.join(reversed(value.split('.'))),)
+    if reformed[0] == '№' or reformed[0] == 'Идентификатор валюты оклада' and value in currency_translations.values():
+        # как и для csv-файла: колонки № в данных нет, а любое известное название валюты пропускает все вакансии
+        return '', ()
+    if column == 'salary_from':
+        # csv-файл сравнивает значение с текстом ячейки, а не с числом
+        return 'CAST(salary_from AS TEXT) = ?', (value,)
+    codes = [code for code, translation in experience_translations.items() if translation == value]
+    if column in ('premium', 'salary_gross'):
+        return f"{column} = ?", ({'Да': 1, 'Нет': 0}.get(value, -1),)
+    return f"{column} = ?", (codes[0] if len(codes) != 0 else value,)
+
+
+def print_database_table(name, filter_parameter, reformed, row_numbers, columns, output_name=None,
+                         sort_parameter=None, is_descending=False):
+    with VacanciesDatabase(name) as database:
+        if not database.has_vacancies():
+            print('Нет данных')
+        elif filter_parameter.count(': ') == 0 and filter_parameter != '':
+            print('Формат ввода некорректен')
+        elif not reformed[0] in title_translations1.values():
+            print('Параметр поиска некорректен')
+        else:
+            rows_data = reform_table(row_numbers, ' ')
+            offset = int(rows_data[0]) - 1 if len(rows_data) != 0 else 0
+            limit = max(int(rows_data[1]) - 1 - offset, 0) if len(rows_data) == 2 else -1
+            condition, parameters = ('', ()) if filter_parameter == '' else get_database_condition(reformed)
+            order = database_orders.get(sort_parameter)
+            if output_name is not None:
+                vacancies = database.iter_vacancies(condition, parameters, limit, offset, order, is_descending)
+                descriptions = (dict({'№': offset + number}, **vac) for number, vac in enumerate(vacancies, 1))
+                with profiler.span('Выгрузка таблицы'):
+                    export_vacancies(descriptions, '', columns, output_name)
+                return
+            with profiler.span('Запрос к базе данных') as stage:
+                vacancies = database.select_vacancies(condition, parameters, limit, offset, order, is_descending)
+                stage['rows'] = len(vacancies)
+            descriptions = [dict({'№': offset + number}, **vac) for number, vac in enumerate(vacancies, 1)]
+            with profiler.span('Форматирование и вывод таблицы'):
+                print_vacancies(descriptions, title_translations, '', columns)
+
+
+def export_vacancies_table(name, filter_parameter, reformed, row_numbers, columns, output_name,
+                           sort_parameter=None, is_descending=False, workers=1):
+    file_names = get_input_files(name)
+    if len(file_names) == 0:
+        print('Пустой файл')
+    elif filter_parameter.count(': ') == 0 and filter_parameter != '':
+        print('Формат ввода некорректен')
+    elif not reformed[0] in title_translations1.values():
+        print('Параметр поиска некорректен')
+    else:
+        rows = get_vacancies_stream(file_names)
+        column_names = next(rows)
+        if workers > 1:
+            descriptions = parallel_filer(rows, column_names, filter_parameter, reformed, workers)
+        else:
+            descriptions = iter_filer(rows, column_names, filter_parameter, reformed)
+        if sort_parameter is not None:
+            descriptions = sort_vacancies(descriptions, sort_parameter, is_descending, row_numbers)
+        with profiler.span('Выгрузка таблицы'):
+            export_vacancies(descriptions, row_numbers, columns, output_name)
+
+
+def get_store_filter(column_names, filter_parameter, reformed):
+    columns = [column for column, title in title_translations1.items() if title == reformed[0]]
+    if filter_parameter == '' or len(columns) == 0 or columns[0] not in column_names:
+        return [], None, None
+    column = columns[0]
+    if column == 'salary_to':
+        value = int(reformed[1])
+        return ['salary_from', 'salary_to'], lambda values: check_filter(values, 1, reformed), \
+            lambda zones: zones['salary_from'] is None or zones['salary_to'] is None or \
+            zones['salary_from'][0] <= value <= zones['salary_to'][1]
+    row_filter = lambda values: check_filter(values, 0, reformed)
+    chunk_filter = None
+    if column == 'published_at' and re.fullmatch(r'\d{2}\.\d{2}\.\d{4}', reformed[1]):
+        date = '-'.join(reversed(reformed[1].split('.')))
+        chunk_filter = lambda zones: zones[column] is None or zones[column][0] <= date <= zones[column][1]
+    elif column in set_columns:
+        chunk_filter = lambda zones: zones[column] is None or any(row_filter([value]) for value in zones[column])
+    return [column], row_filter, chunk_filter
+
+
+def get_store_vacancies(store, filter_parameter, reformed):
+    filter_columns, row_filter, chunk_filter = get_store_filter(store.column_names, filter_parameter, reformed)
+    stats = {}
+    for number, row in enumerate(store.iter_rows(filter_columns, row_filter, chunk_filter, stats), 1):
+        yield dict({'№': number}, **row)
+    profiler.add('Зональный фильтр', 'skipped', stats['skipped'])
+    profiler.add('Зональный фильтр', 'read', stats['read'])
+
+
+def print_store_table(store_name, filter_parameter, reformed, row_numbers, columns, output_name=None,
+                      sort_parameter=None, is_descending=False):
+    with ColumnarStore(store_name) as store:
+        if store.rows_count == 0:
+            print('Нет данных')
+        elif filter_parameter.count(': ') == 0 and filter_parameter != '':
+            print('Формат ввода некорректен')
+        elif not reformed[0] in title_translations1.values():
+            print('Параметр поиска некорректен')
+        else:
+            descriptions = get_store_vacancies(store, filter_parameter, reformed)
+            if sort_parameter is not None:
+                descriptions = sort_vacancies(descriptions, sort_parameter, is_descending, row_numbers)
+            if output_name is not None:
+                with profiler.span('Выгрузка таблицы'):
+                    export_vacancies(descriptions, row_numbers, columns, output_name)
+                return
+            rows_data = reform_table(row_numbers, ' ')
+            if sort_parameter is None and len(rows_data) == 2:
+                descriptions = islice(descriptions, max(int(rows_data[1]) - 1, 0))
+            with profiler.span('Чтение хранилища и фильтрация') as stage:
+                descriptions = list(descriptions)
+                stage['rows'] = len(descriptions)
+            with profiler.span('Форматирование и вывод таблицы'):
+                print_vacancies(descriptions, title_translations, row_numbers, columns)
+
+
+def build_columnar_store():
+    name = input('Введите название файла: ')
+    file_names = get_input_files(name)
+    if len(file_names) == 0:
+        print('Пустой файл')
+    elif expand_input(name) != [name]:
+        print('Хранилище строится только для одного csv-файла')
+    else:
+        rows = get_vacancies_stream(file_names)
+        column_names = next(rows)
+        descriptions = (filer_row(vac, column_names, '', [''], {}) for vac in rows)
+        with profiler.span('Построение колоночного хранилища') as stage:
+            stage['rows'] = ColumnarStore.write(get_store_name(name), name, column_names, descriptions)
+        print(f"Сохранено вакансий: {stage['rows']}")
+
+
+def get_vacancies_table(workers=1, output_name=None, sort_parameter=None, is_descending=False):
     name = input('Введите название файла: ')
     filter_parameter = input('Введите параметр фильтрации: ')
     row_numbers = input('Введите количесвто строк: ')
     columns = input('Введите названия столбцов: ')
     reformed = parse_filter_string(filter_parameter)
-    if os.path.getsize(name) == 0:
+    if sort_parameter is not None and sort_parameter not in sort_keys:
+        print('Параметр сортировки некорректен')
+        return
+    if is_vacancies_database(name):
+        print_database_table(name, filter_parameter, reformed, row_numbers, columns, output_name, sort_parameter,
+                             is_descending)
+        return
+    if expand_input(name) == [name] and os.path.isfile(name) and is_store_fresh(get_store_name(name), name):
+        print_store_table(get_store_name(name), filter_parameter, reformed, row_numbers, columns, output_name,
+                          sort_parameter, is_descending)
+        return
+    if output_name is not None:
+        export_vacancies_table(name, filter_parameter, reformed, row_numbers, columns, output_name, sort_parameter,
+                               is_descending, workers)
+        return
+    info = None
+    if reformed[0] == 'Название':
+        with profiler.span('Поиск по индексу названий') as stage:
+            info = get_indexed_vacancies(name, reformed)
+            stage['rows'] = 0 if info is None else len(info[1])
+    # по индексу читаются только строки с искомым названием, и их может не быть в непустом файле
+    is_indexed = info is not None
+    if not is_indexed:
+        with profiler.span('Чтение csv-файла'):
+            info = read_vacancies_files(name, workers)
+    if info is None:
         print('Пустой файл')
-    elif len(csv_reader(name)[1]) == 0:
+    elif len(info[1]) == 0 and not is_indexed:
         print('Нет данных')
     elif filter_parameter.count(': ') == 0 and filter_parameter != '':
         print('Формат ввода некорректен')
     elif not reformed[0] in title_translations1.values():
         print('Параметр поиска некорректен')
     else:
-        info = csv_reader(name)
-        print_vacancies(csv_filer(info[1], info[0], filter_parameter, reformed),
-                        title_translations, row_numbers, columns)
+        vacancies = info[1]
+        # пакеты строк очищаются и форматируются в пуле процессов, а собираются в исходном порядке
+        is_parallel = workers > 1 and len(vacancies) > parallel_batch_size
+        with profiler.span('Очистка и фильтрация (csv_filer)') as stage:
+            if is_parallel:
+                descriptions = list(parallel_filer(vacancies, info[0], filter_parameter, reformed, workers,
+                                                   sort_parameter is None))
+            else:
+                descriptions = csv_filer(vacancies, info[0], filter_parameter, reformed)
+            stage['rows'] = len(vacancies)
+        if sort_parameter is not None:
+            with profiler.span('Сортировка'):
+                descriptions = list(sort_vacancies(descriptions, sort_parameter, is_descending, row_numbers))
+            if is_parallel:
+                with profiler.span('Форматирование (параллельно)'):
+                    descriptions = list(parallel_formatter(descriptions, ['№'] + info[0], workers))
+        with profiler.span('Форматирование и вывод таблицы'):
+            print_vacancies(descriptions, title_translations, row_numbers, columns, is_parallel)
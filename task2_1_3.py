@@ -2,15 +2,42 @@ import csv
 import math
 import re
 import os
+from array import array
 import matplotlib.pyplot as plt
 import numpy as np
 from operator import itemgetter
 from jinja2 import Environment, FileSystemLoader
+from openpyxl.workbook.workbook import Workbook
+from openpyxl.styles import Font, Border, NamedStyle, Side
 import pdfkit
+from vacancies_cube import VacanciesCube, cube_dimensions
+from vacancies_state import VacanciesState, get_row_fingerprints, get_state_name, get_delta_name, append_delta, \
+    read_delta
+from vacancies_sketches import VacanciesSketches
+from deduplication import VacanciesDeduplicator, get_fingerprint_set
+from instrumentation import profiler
+from mmap_reader import MappedCsvReader, read_rows_range
+from compressed_input import open_vacancies_file, get_decompressor
+from multi_input import get_input_files, get_column_names, map_files, select_files
+from pipeline import StagedPipeline, start_workers
+from vacancies_db import VacanciesDatabase, is_vacancies_database
+from categorical import vacancy_encoding
+from sampling import ReservoirSampler, get_mean_interval, get_fraction_interval
+from heavy_hitters import SpaceSaving
+from group_by import GroupAggregator, group_dimensions, group_getters
+from table_export import write_table
+from currency import currency_to_rub
 
 input_sentences = {'name': 'Введите название файла: ', 'job_name': 'Введите название профессии: '}
-currency_to_rub = {"AZN": 35.68, "BYR": 23.91, "EUR": 59.90, "GEL": 21.74, "KGS": 0.76, "KZT": 0.13, "RUR": 1,
-                   "UAH": 1.64, "USD": 60.66, "UZS": 0.0055}
+salary_quantiles = [0.25, 0.5, 0.75, 0.9]
+vacancy_columns = ['name', 'key_skills', 'experience_id', 'premium', 'employer_name', 'salary_from', 'salary_to',
+                   'salary_currency', 'area_name', 'published_at']
+# колонки, без которых вакансию не создать; остальные колонки vacancy_columns могут отсутствовать
+required_columns = ['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at']
+
+# размер диапазона байтов файла, который процесс читает и очищает за один раз при параллельном чтении через mmap
+range_bytes = 4 * 1024 * 1024
+reform_parameters = lambda data, separator: [] if len(data) == 0 else data.split(separator)
 
 
 class DataSet:
@@ -22,8 +49,25 @@ class DataSet:
 
     :param vacancies_objects: Обработанный список объектов вакансий класса Vacancy
     :type vacancies_objects: list
+
+    :param dedup_columns: Колонки для удаления повторяющихся вакансий; None отключает удаление повторов
+    :type dedup_columns: list
+
+    :param bloom_capacity: Ожидаемое количество вакансий для фильтра Блума вместо точного множества отпечатков
+    :type bloom_capacity: int
+
+    :param backend: Способ чтения файла: 'csv' - csv.reader, 'mmap' - MappedCsvReader только с колонками вакансий
+        (сжатые файлы всегда читаются через csv.reader с потоковой распаковкой)
+    :type backend: str
+
+    :param deduplicator: Объект, удаляющий повторы при последнем чтении файла
+    :type deduplicator: VacanciesDeduplicator
+
+    :param rejected_count: Количество строк с пустыми ячейками, отброшенных при последнем чтении файла
+    :type rejected_count: int
     """
-    def __init__(self, file_name: str, vacancies_objects: list):
+    def __init__(self, file_name: str, vacancies_objects: list, dedup_columns: list = None,
+                 bloom_capacity: int = None, backend: str = 'csv'):
         """
         Инициализирует объект класса DataSet
 
@@ -32,23 +76,148 @@ class DataSet:
 
         :param vacancies_objects: Обработанный список объектов вакансий класса Vacancy
         :type vacancies_objects: list
+
+        :param dedup_columns: Колонки для удаления повторяющихся вакансий; None отключает удаление повторов
+        :type dedup_columns: list
+
+        :param bloom_capacity: Ожидаемое количество вакансий для фильтра Блума вместо точного множества отпечатков
+        :type bloom_capacity: int
+
+        :param backend: Способ чтения файла: 'csv' или 'mmap'
+        :type backend: str
         """
         self.file_name = file_name
         self.vacancies_objects = vacancies_objects
+        self.dedup_columns = dedup_columns
+        self.bloom_capacity = bloom_capacity
+        self.backend = backend
+        self.deduplicator = None
+        self.rejected_count = 0
 
     def read_file(self):
         """
-        Считывает информацию с файла, очищая её от пустых данных
+        Считывает информацию с файла, очищая её от пустых данных и, если задано, от повторяющихся вакансий
 
         :return: Кортеж со списками с названиями колонок таблицы и с информацией о вакансиях
         """
-        file = open(self.file_name, encoding='utf_8_sig')
-        reader = csv.reader(file)
-        vacancies = [line for line in reader]
-        column_names = vacancies.pop(0)
-        return column_names, [job for job in vacancies if len(job) == len(column_names) and job.count('') == 0]
+        column_names, vacancies = self.get_rows()
+        return column_names, list(vacancies)
+
+    def get_rows(self):
+        """
+        Открывает файл и возвращает генератор очищенных от пустых данных и повторов строк;
+        файл закрывается, когда генератор исчерпан или закрыт
+
+        :return: Кортеж из списка с названиями колонок таблицы и генератора строк
+        """
+        self.rejected_count = 0
+        is_mapped = self.backend == 'mmap' and get_decompressor(self.file_name) is None
+        if is_mapped:
+            reader = MappedCsvReader(self.file_name, self.get_mapped_columns())
+            column_names = reader.get_selected_column_names()
+            vacancies = reader.read_rows()
+        else:
+            reader = open_vacancies_file(self.file_name)
+            rows = csv.reader(reader)
+            column_names = next(rows)
+            vacancies = self.get_full_rows(rows, column_names)
+        if self.dedup_columns is not None:
+            self.deduplicator = VacanciesDeduplicator(column_names, self.dedup_columns, self.bloom_capacity)
+            vacancies = self.deduplicator.filter(vacancies)
+        return column_names, self.close_after_rows(vacancies, reader)
+
+    def get_mapped_columns(self) -> list:
+        """
+        Возвращает колонки, которые читаются через отображение в память: колонки вакансий и колонки удаления повторов
+
+        :return: Список названий колонок
+        """
+        return vacancy_columns + [column for column in self.dedup_columns or [] if column not in vacancy_columns]
+
+    def get_vacancy_batches(self, workers: int = 1, executor=None):
+        """
+        Читает файл конвейером StagedPipeline и выдаёт пакеты вакансий с отпечатками строк (clean_vacancies_chunk).
+        Несжатый файл при чтении через отображение в память (backend 'mmap') и workers > 1 делится на диапазоны
+        байтов по границам строк, и каждый процесс сам читает и очищает свои диапазоны; иначе строки читает поток
+        конвейера, а очищают процессы. Повторы в диапазонах удаляются по отпечаткам ключей в порядке файла
+
+        :param workers: Количество процессов; при 1 и меньше пакеты обрабатываются в вызывающем потоке
+        :type workers: int
+
+        :param executor: Пул процессов из start_workers или None
+        :type executor: ProcessPoolExecutor
+
+        :return: Генератор кортежей из списка вакансий и отпечатков их строк
+        """
+        if workers <= 1 or self.backend != 'mmap' or get_decompressor(self.file_name) is not None:
+            column_names, rows = self.get_rows()
+            yield from StagedPipeline(rows, clean_vacancies_chunk, (column_names, self.dedup_columns),
+                                      workers=workers if workers > 1 else 0, executor=executor)
+            return
+        with MappedCsvReader(self.file_name, self.get_mapped_columns()) as reader:
+            column_names = reader.get_selected_column_names()
+            ranges = reader.get_row_ranges(max(workers, (len(reader.map) - reader.data_start) // range_bytes))
+        self.rejected_count = 0
+        if self.dedup_columns is not None:
+            self.deduplicator = VacanciesDeduplicator(column_names, self.dedup_columns, self.bloom_capacity)
+        pipeline = StagedPipeline(ranges, read_vacancies_range, (self.file_name, column_names, self.dedup_columns),
+                                  chunk_size=1, workers=workers, executor=executor)
+        for vacancies, fingerprints, rejected_count, duplicates_count in pipeline:
+            self.rejected_count += rejected_count
+            if self.deduplicator is None:
+                yield vacancies, fingerprints
+                continue
+            # при удалении повторов отпечаток строки и есть отпечаток её ключа
+            is_new = [self.deduplicator.fingerprints.add(fingerprint) for fingerprint in fingerprints]
+            self.deduplicator.duplicates_count += duplicates_count + is_new.count(False)
+            yield [vac for vac, flag in zip(vacancies, is_new) if flag], \
+                array('Q', (fingerprint for fingerprint, flag in zip(fingerprints, is_new) if flag))
+        profiler.add('Чтение csv-файла', 'rejected', self.rejected_count)
+        profiler.add('Чтение csv-файла', 'duplicates', 0 if self.deduplicator is None
+                     else self.deduplicator.duplicates_count)
+
+    def close_after_rows(self, vacancies, reader):
+        """
+        Выдаёт строки и по их окончании закрывает файл и записывает счётчики отброшенных строк
 
-    def get_reformed_file(self, reader: list, list_naming: list):
+        :param vacancies: Генератор строк
+        :type vacancies: iterable
+
+        :param reader: Открытый файл или объект класса MappedCsvReader
+        :type reader: MappedCsvReader
+
+        :return: Генератор тех же строк
+        """
+        try:
+            yield from vacancies
+        finally:
+            if isinstance(reader, MappedCsvReader):
+                self.rejected_count = reader.rejected_count
+            reader.close()
+            profiler.add('Чтение csv-файла', 'rejected', self.rejected_count)
+            profiler.add('Чтение csv-файла', 'duplicates', 0 if self.deduplicator is None
+                         else self.deduplicator.duplicates_count)
+
+    def get_full_rows(self, reader, column_names: list):
+        """
+        Лениво отбирает строки без пустых ячеек и с полным набором колонок, подсчитывая отброшенные
+
+        :param reader: Итерируемый объект со строками csv-файла
+        :type reader: iterable
+
+        :param column_names: Список с названиями колонок таблицы
+        :type column_names: list
+
+        :return: Генератор полных строк
+        """
+        for job in reader:
+            if len(job) == len(column_names) and job.count('') == 0:
+                yield job
+            else:
+                self.rejected_count += 1
+
+    @staticmethod
+    def get_reformed_file(reader: list, list_naming: list):
         """
         Возвращает отформатированную информацию о вакансиях в виде списка словарей
 
@@ -65,21 +234,30 @@ class DataSet:
             description = dict()
             for i in range(len(list_naming)):
                 vac[i] = re.sub(r'\<[^>]*\>', '', vac[i])
+                if list_naming[i] == 'key_skills':
+                    # навыки остаются разделёнными переводами строк, чтобы их можно было разобрать по одному
+                    vac[i] = '\n'.join(' '.join(skill.split()) for skill in vac[i].split('\n'))
+                    description[list_naming[i]] = vac[i]
+                    continue
                 if vac[i].count('\n') != 0:
                     vac[i] = ", ".join(vac[i].split("\n"))
                 vac[i] = ' '.join(vac[i].split())
                 description[list_naming[i]] = vac[i]
-            descriptions.append(Vacancy(description))
+            descriptions.append(profiler.call('Создание объектов Vacancy', Vacancy, description))
         return descriptions
 
 
 class Vacancy:
     """
-    Класс для представления вакансии в виде объекта
+    Класс для представления вакансии в виде объекта; малокардинальные строковые характеристики
+    хранятся целыми кодами общих таблиц vacancy_encoding
 
     :param descriptions: словарь с характеристиками вакансии
     :type descriptions: dict
     """
+    __slots__ = ('name', 'salary', 'area_code', 'employer_name', 'experience_code', 'premium_code', 'key_skills',
+                 'published_at', 'published_month')
+
     def __init__(self, descriptions: dict):
         """
         Инициализирует объект класса Vacancy
@@ -89,8 +267,53 @@ class Vacancy:
         """
         self.name = descriptions['name']
         self.salary = Salary(descriptions)
-        self.area_name = descriptions['area_name']
+        self.area_code = vacancy_encoding.encode('area_name', descriptions['area_name'])
+        self.employer_name = descriptions.get('employer_name', '')
+        self.experience_code = vacancy_encoding.encode('experience_id', descriptions.get('experience_id', ''))
+        self.premium_code = vacancy_encoding.encode('premium', descriptions.get('premium', ''))
+        # работодатели и навыки хранятся строками: их словари не ограничены, и таблицы кодов росли бы без конца
+        self.key_skills = tuple(skill for skill in descriptions.get('key_skills', '').split('\n') if skill != '')
         self.published_at = int(descriptions['published_at'][:4])
+        self.published_month = int(descriptions['published_at'][5:7])
+
+    @property
+    def area_name(self) -> str:
+        """
+        Возвращает название города вакансии
+
+        :return: Название города
+        """
+        return vacancy_encoding.decode('area_name', self.area_code)
+
+    @property
+    def experience_id(self) -> str:
+        """
+        Возвращает идентификатор опыта работы вакансии
+
+        :return: Идентификатор опыта работы
+        """
+        return vacancy_encoding.decode('experience_id', self.experience_code)
+
+    @property
+    def premium(self) -> str:
+        """
+        Возвращает признак премиум-вакансии
+
+        :return: 'True' или 'False'
+        """
+        return vacancy_encoding.decode('premium', self.premium_code)
+
+    def __getstate__(self):
+        # коды действительны только в таблицах текущего процесса, поэтому передаются значения
+        return (self.name, self.salary, self.area_name, self.employer_name, self.experience_id, self.premium,
+                self.key_skills, self.published_at, self.published_month)
+
+    def __setstate__(self, state):
+        self.name, self.salary, area_name, self.employer_name, experience_id, premium, self.key_skills, \
+            self.published_at, self.published_month = state
+        self.area_code = vacancy_encoding.encode('area_name', area_name)
+        self.experience_code = vacancy_encoding.encode('experience_id', experience_id)
+        self.premium_code = vacancy_encoding.encode('premium', premium)
 
 
 class Salary:
@@ -100,6 +323,8 @@ class Salary:
     :param descriptions: словарь с характеристиками вакансии
     :type descriptions: dict
     """
+    __slots__ = ('salary_from', 'salary_to', 'currency_code', 'salary_in_rub')
+
     def __init__(self, descriptions: dict):
         """
         Инициализирует объект класса Salary
@@ -109,9 +334,25 @@ class Salary:
         """
         self.salary_from = self.convert_string_to_int(descriptions['salary_from'])
         self.salary_to = self.convert_string_to_int(descriptions['salary_to'])
-        self.salary_currency = descriptions['salary_currency']
+        self.currency_code = vacancy_encoding.encode('salary_currency', descriptions['salary_currency'])
         self.salary_in_rub = self.convert_to_rubles((self.salary_to + self.salary_from) / 2, self.salary_currency)
 
+    @property
+    def salary_currency(self) -> str:
+        """
+        Возвращает код валюты оклада
+
+        :return: Код валюты
+        """
+        return vacancy_encoding.decode('salary_currency', self.currency_code)
+
+    def __getstate__(self):
+        return self.salary_from, self.salary_to, self.salary_currency, self.salary_in_rub
+
+    def __setstate__(self, state):
+        self.salary_from, self.salary_to, salary_currency, self.salary_in_rub = state
+        self.currency_code = vacancy_encoding.encode('salary_currency', salary_currency)
+
     def convert_to_rubles(self, average_salary, currency):
         """
         Переводит сумму денег из указанной валюты в рубли
@@ -141,7 +382,7 @@ class InputConnect:
     """
     Класс для ввода и вывода данных, а также подготовки их статистик к отчёту
 
-    :param name: Название входного csv-файла
+    :param name: Название входного csv-файла, каталога, шаблона glob или списка файлов через ', '
     :type name: str
 
     :param job_name: Название выбранной профессии
@@ -152,114 +393,323 @@ class InputConnect:
 
     :param vacancies_info_names: Список названий статистик
     :type vacancies_info_names: list
+
+    :param hll_precision: Точность счётчиков HyperLogLog для количества работодателей
+    :type hll_precision: int
+
+    :param top_count: Количество самых частых навыков и работодателей в статистиках
+    :type top_count: int
+
+    :param top_capacity: Количество счётчиков скетча Space-Saving для частых навыков и работодателей
+    :type top_capacity: int
+
+    :param confidence_intervals: Доверительные интервалы средних и долей для статистик, посчитанных по выборке
+    :type confidence_intervals: dict
     """
-    def __init__(self, sentences: dict):
+    def __init__(self, sentences: dict, hll_precision: int = 12, answers: dict = None, top_count: int = 10,
+                 top_capacity: int = 1000):
         """
         Инициализирует объект класса InputConnect
 
         :param sentences: Список с входными данными о названиях файла и профессии
         :type sentences: list
+
+        :param hll_precision: Точность счётчиков HyperLogLog для количества работодателей
+        :type hll_precision: int
+
+        :param answers: Готовые ответы с теми же ключами, что и sentences, вместо ввода с клавиатуры
+        :type answers: dict
+
+        :param top_count: Количество самых частых навыков и работодателей в статистиках
+        :type top_count: int
+
+        :param top_capacity: Количество счётчиков скетча Space-Saving для частых навыков и работодателей
+        :type top_capacity: int
         """
-        self.name = input(sentences['name'])
-        self.job_name = input(sentences['job_name'])
+        self.name = input(sentences['name']) if answers is None else answers['name']
+        self.job_name = input(sentences['job_name']) if answers is None else answers['job_name']
+        self.hll_precision = hll_precision
+        self.top_count = top_count
+        self.top_capacity = top_capacity
         self.vacancies_info = {}
+        self.confidence_intervals = {}
         self.vacancies_info_names = ['Динамика уровня зарплат по годам',
                                      'Динамика количества вакансий по годам',
                                      'Динамика уровня зарплат по годам для выбранной профессии',
                                      'Динамика количества вакансий по годам для выбранной профессии',
                                      'Уровень зарплат по городам (в порядке убывания)',
-                                     'Доля вакансий по городам (в порядке убывания)']
+                                     'Доля вакансий по городам (в порядке убывания)',
+                                     'Квантили уровня зарплат по годам',
+                                     'Квантили уровня зарплат по годам для выбранной профессии',
+                                     'Квантили уровня зарплат по городам',
+                                     'Количество работодателей по годам',
+                                     'Количество работодателей по городам',
+                                     'Самые востребованные навыки',
+                                     'Самые востребованные навыки по годам',
+                                     'Самые востребованные навыки для выбранной профессии',
+                                     'Крупнейшие работодатели по городам']
+
+    def get_job_filter(self):
+        """
+        Возвращает предикат выбранной профессии для названий вакансий: вхождение подстроки
 
-    def fill_vacancies_info(self, vacancies: list) -> None:
+        :return: Функция от названия вакансии
         """
-        Заполняет словарь статистик о вакансиях для отчёта
+        return lambda name: self.job_name in name
+
+    def get_sketch_options(self) -> dict:
+        """
+        Возвращает параметры скетчей статистик для состояния
+
+        :return: Словарь параметров VacanciesSketches
+        """
+        return {'hll_precision': self.hll_precision, 'top_capacity': self.top_capacity}
+
+    def get_state(self, vacancies: list) -> VacanciesState:
+        """
+        Строит состояние статистик со скетчами выбранной профессии по списку вакансий
 
         :param vacancies: Список объетов вакансий класса Vacancy
         :type vacancies: list
 
+        :return: Объект класса VacanciesState
+        """
+        state = VacanciesState(sketches=VacanciesSketches(**self.get_sketch_options()))
+        state.sketches.add_job(self.job_name)
+        state.add_vacancies(vacancies)
+        return state
+
+    def fill_vacancies_info(self, state: VacanciesState) -> None:
+        """
+        Заполняет словарь статистик о вакансиях для отчёта.
+        Основные статистики считаются срезами куба, статистики выбранной профессии - по её агрегатам в скетчах;
+        квантили, количество работодателей, самые востребованные навыки и крупнейшие работодатели - по скетчам
+
+        :param state: Состояние статистик со скетчами, собирающими выбранную профессию
+        :type state: VacanciesState
+
         :return:
         """
-        years = set()
-        cities = dict()
-        for vac in vacancies:
-            years.add(vac.published_at)
-            if vac.area_name in cities:
-                cities[vac.area_name].append(vac.salary.salary_in_rub)
-            else:
-                cities[vac.area_name] = [vac.salary.salary_in_rub]
-        years = sorted(years)
+        cube = state.cube
+        years = cube.get_values('year')
         years = list(range(min(years), max(years) + 1))
-        cities = [city for city in cities.items() if math.floor(len(city[1]) / len(vacancies) * 100) >= 1]
-        vacancies_by_year_and_city = self.get_vacancies_info_by_year(vacancies, years) + \
-                                     self.get_vacancies_info_by_city(vacancies, cities)
+        vacancies_count = sum(measures[1] for measures in cube.cells.values())
+        cities = [(city, measures) for (city,), measures in cube.roll_up(['area_name']).items()
+                  if math.floor(measures[1] / vacancies_count * 100) >= 1]
+        vacancies_by_city = self.get_vacancies_info_by_city(cities, vacancies_count)
+        vacancies_by_year_and_city = \
+            self.get_vacancies_info_by_year(cube, years, state.sketches.jobs[self.job_name][2]) + vacancies_by_city + \
+            self.get_vacancies_quantiles(state.sketches, years, list(vacancies_by_city[0].keys())) + \
+            self.get_employers_count(state.sketches, years, [city[0] for city in cities]) + \
+            self.get_heavy_hitters(state.sketches, years, list(vacancies_by_city[1].keys()))
         for i in range(len(vacancies_by_year_and_city)):
             self.vacancies_info[self.vacancies_info_names[i]] = vacancies_by_year_and_city[i]
 
-    def get_vacancies_info_by_year(self, vacancies: list, years: list):
+    def fill_sample_info(self, vacancies: list, population_count: int) -> None:
         """
-        Собирает данные о вакансиях и формирует статистики по годам
+        Заполняет словарь статистик по случайной выборке вакансий: количества, в том числе у самых
+        востребованных навыков и крупнейших работодателей, пересчитываются на всю выгрузку,
+        для средних зарплат и долей городов считаются доверительные интервалы, а количество работодателей,
+        которое по выборке не оценить, не выводится
 
-        :param vacancies: Список объетов вакансий класса Vacancy
+        :param vacancies: Список объетов вакансий класса Vacancy из выборки
         :type vacancies: list
 
+        :param population_count: Количество вакансий во всей выгрузке
+        :type population_count: int
+
+        :return:
+        """
+        self.fill_vacancies_info(self.get_state(vacancies))
+        scale = population_count / len(vacancies)
+        sampling_fraction = len(vacancies) / population_count
+        for name in ('Динамика количества вакансий по годам',
+                     'Динамика количества вакансий по годам для выбранной профессии'):
+            self.vacancies_info[name] = {year: round(count * scale) for year, count in self.vacancies_info[name].items()}
+        for name in ('Самые востребованные навыки', 'Самые востребованные навыки для выбранной профессии'):
+            self.vacancies_info[name] = {skill: round(count * scale)
+                                         for skill, count in self.vacancies_info[name].items()}
+        for name in ('Самые востребованные навыки по годам', 'Крупнейшие работодатели по городам'):
+            self.vacancies_info[name] = {key: {item: round(count * scale) for item, count in top.items()}
+                                         for key, top in self.vacancies_info[name].items()}
+        for name in ('Количество работодателей по годам', 'Количество работодателей по городам'):
+            self.vacancies_info.pop(name, None)
+        job_filter = self.get_job_filter()
+        salaries_by_year, job_salaries_by_year, salaries_by_city = {}, {}, {}
+        for vac in vacancies:
+            salaries_by_year.setdefault(vac.published_at, []).append(vac.salary.salary_in_rub)
+            if job_filter(vac.name):
+                job_salaries_by_year.setdefault(vac.published_at, []).append(vac.salary.salary_in_rub)
+            salaries_by_city.setdefault(vac.area_name, []).append(vac.salary.salary_in_rub)
+        mean_groups = {'Динамика уровня зарплат по годам': salaries_by_year,
+                       'Динамика уровня зарплат по годам для выбранной профессии': job_salaries_by_year,
+                       'Уровень зарплат по городам (в порядке убывания)': salaries_by_city}
+        for name, groups in mean_groups.items():
+            self.confidence_intervals[name] = \
+                {key: tuple(int(bound) for bound in interval) for key, interval in
+                 ((key, get_mean_interval(groups.get(key, []), sampling_fraction)) for key in self.vacancies_info[name])
+                 if interval is not None}
+        name = 'Доля вакансий по городам (в порядке убывания)'
+        self.confidence_intervals[name] = \
+            {city: tuple(round(bound, 4) for bound in
+                         get_fraction_interval(len(salaries_by_city[city]), len(vacancies), sampling_fraction))
+             for city in self.vacancies_info[name]}
+
+    def get_vacancies_info_by_year(self, cube: VacanciesCube, years: list, job_by_year: dict):
+        """
+        Формирует статистики по годам срезом куба вакансий и агрегатам выбранной профессии
+
+        :param cube: Предагрегированный куб вакансий
+        :type cube: VacanciesCube
+
         :param years: Список с годами
         :type years: list
 
+        :param job_by_year: Словарь: год -> [сумма, количество, минимум, максимум] зарплат выбранной профессии
+        :type job_by_year: dict
+
         :return: Кортеж словарей с данными годовых статистик
         """
-        all_salaries_by_year = {year: [] for year in years}
-        all_vacancies_count_by_year = {year: 0 for year in years}
-        exact_salaries_by_year = {year: [] for year in years}
-        exact_vacancies_count_by_year = {year: 0 for year in years}
-        for vac in vacancies:
-            all_salaries_by_year[vac.published_at].append(vac.salary.salary_in_rub)
-            all_vacancies_count_by_year[vac.published_at] += 1
-            if self.job_name in vac.name:
-                exact_salaries_by_year[vac.published_at].append(vac.salary.salary_in_rub)
-                exact_vacancies_count_by_year[vac.published_at] += 1
-        all_salaries_by_year = {year: int(sum(salaries) / len(salaries)) if len(salaries) != 0 else 0
-                                for year, salaries in all_salaries_by_year.items()}
-        exact_salaries_by_year = {year: int(sum(salaries) / len(salaries)) if len(salaries) != 0 else 0
-                                  for year, salaries in exact_salaries_by_year.items()}
+        all_by_year = cube.roll_up(['year'])
+        exact_by_year = {(year,): measures for year, measures in job_by_year.items()}
+        all_salaries_by_year = {year: int(all_by_year[(year,)][0] / all_by_year[(year,)][1])
+                                if (year,) in all_by_year else 0 for year in years}
+        all_vacancies_count_by_year = {year: all_by_year[(year,)][1] if (year,) in all_by_year else 0
+                                       for year in years}
+        exact_salaries_by_year = {year: int(exact_by_year[(year,)][0] / exact_by_year[(year,)][1])
+                                  if (year,) in exact_by_year else 0 for year in years}
+        exact_vacancies_count_by_year = {year: exact_by_year[(year,)][1] if (year,) in exact_by_year else 0
+                                         for year in years}
         return all_salaries_by_year, all_vacancies_count_by_year, exact_salaries_by_year, exact_vacancies_count_by_year
 
-    def get_vacancies_info_by_city(self, vacancies: list, cities: list):
+    def get_vacancies_info_by_city(self, cities: list, vacancies_count: int):
         """
-        Собирает данные о вакансиях и формирует статистики по городам
+        Формирует статистики по городам из агрегатов куба вакансий
 
-        :param vacancies: Список объетов вакансий класса Vacancy
-        :type vacancies: list
-
-        :param cities: Список городов
+        :param cities: Список пар (город, [сумма, количество, минимум, максимум])
         :type cities: list
 
+        :param vacancies_count: Общее количество вакансий
+        :type vacancies_count: int
+
         :return: Кортеж словарей с данными статистик по городам
         """
-        all_fractions_by_city = {city[0]: round(len(city[1]) / len(vacancies), 4) for city in cities}
+        all_fractions_by_city = {city[0]: round(city[1][1] / vacancies_count, 4) for city in cities}
         all_fractions_by_city = dict(sorted(all_fractions_by_city.items(),
                                             key=itemgetter(1), reverse=True)[:10])
-        cities = sorted(cities, key=lambda salaries: sum(salaries[1]) / len(salaries[1]), reverse=True)
-        all_salaries_by_cities = {city[0]: int(sum(city[1]) / len(city[1])) if len(city[1]) > 0 else 0
+        cities = sorted(cities, key=lambda measures: measures[1][0] / measures[1][1], reverse=True)
+        all_salaries_by_cities = {city[0]: int(city[1][0] / city[1][1]) if city[1][1] > 0 else 0
                                   for city in cities[:min(10, len(cities))]}
         return all_salaries_by_cities, all_fractions_by_city
 
-    def print_vacancies_info(self, vacancies: list, pdf_name: str) -> None:
+    def get_vacancies_quantiles(self, sketches: VacanciesSketches, years: list, cities: list):
+        """
+        Возвращает квантили зарплат по годам и городам из потоковых скетчей
+
+        :param sketches: Скетчи статистик, собирающие выбранную профессию
+        :type sketches: VacanciesSketches
+
+        :param years: Список с годами
+        :type years: list
+
+        :param cities: Список городов
+        :type cities: list
+
+        :return: Кортеж словарей со списками квантилей зарплат из salary_quantiles
+        """
+        get_quantiles = lambda sketch: [0 for _ in salary_quantiles] if sketch is None else \
+            [int(value) for value in sketch.get_quantiles(salary_quantiles)]
+        job_sketches_by_year = sketches.jobs[self.job_name][0]
+        return ({year: get_quantiles(sketches.salaries_by_year.get(year)) for year in years},
+                {year: get_quantiles(job_sketches_by_year.get(year)) for year in years},
+                {city: get_quantiles(sketches.salaries_by_city.get(city)) for city in cities})
+
+    def get_employers_count(self, sketches: VacanciesSketches, years: list, cities: list):
+        """
+        Возвращает приближённое количество различных работодателей по годам и городам из счётчиков HyperLogLog
+
+        :param sketches: Скетчи статистик
+        :type sketches: VacanciesSketches
+
+        :param years: Список с годами
+        :type years: list
+
+        :param cities: Список городов
+        :type cities: list
+
+        :return: Кортеж словарей с приближённым количеством работодателей
+        """
+        return tuple({key: counters[key].count() if key in counters else 0 for key in keys}
+                     for counters, keys in ((sketches.employers_by_year, years), (sketches.employers_by_city, cities)))
+
+    def get_heavy_hitters(self, sketches: VacanciesSketches, years: list, cities: list):
+        """
+        Возвращает самые востребованные навыки и крупнейших работодателей из скетчей Space-Saving
+        ограниченного размера; общий скетч навыков получается объединением годовых
+
+        :param sketches: Скетчи статистик, собирающие выбранную профессию
+        :type sketches: VacanciesSketches
+
+        :param years: Список с годами
+        :type years: list
+
+        :param cities: Список городов
+        :type cities: list
+
+        :return: Кортеж из словарей навыков, навыков по годам, навыков профессии и работодателей по городам
+            с приближённым количеством вакансий
+        """
+        empty_sketch = SpaceSaving(self.top_capacity)
+        skills_by_year = {year: sketches.skills_by_year.get(year, empty_sketch) for year in years}
+        all_skills = empty_sketch
+        for year_skills in skills_by_year.values():
+            all_skills = all_skills.merge(year_skills)
+        return (all_skills.get_top(self.top_count),
+                {year: sketch.get_top(self.top_count) for year, sketch in skills_by_year.items()},
+                sketches.jobs[self.job_name][1].get_top(self.top_count),
+                {city: sketches.top_employers_by_city.get(city, empty_sketch).get_top(self.top_count)
+                 for city in cities})
+
+    def print_vacancies_info(self, vacancies: list, pdf_name: str, state: VacanciesState = None,
+                             population_count: int = None, excel_name: str = None) -> None:
         """
         Выводит отчёт по сформированным статистикам о вакансиях
 
-        :param vacancies: Список объетов вакансий класса Vacancy
+        :param vacancies: Список объетов вакансий класса Vacancy из выборки; для точной статистики не нужен
         :type vacancies: list
 
         :param pdf_name: Название pdf-файла с отчётом
         :type pdf_name: str
 
+        :param state: Состояние статистик для точной статистики
+        :type state: VacanciesState
+
+        :param population_count: Количество вакансий во всей выгрузке, если vacancies - случайная выборка;
+            тогда статистики и отчёт приближённые
+        :type population_count: int
+
+        :param excel_name: Название xlsx-файла с таблицами отчёта; None - таблица Excel не создаётся
+        :type excel_name: str
+
         :return:
         """
-        self.fill_vacancies_info(vacancies)
+        sample = None
+        with profiler.span('Агрегация статистик'):
+            if population_count is None:
+                self.fill_vacancies_info(state)
+            else:
+                self.fill_sample_info(vacancies, population_count)
+                sample = (len(vacancies), population_count)
+                print(f"Приближённая статистика по выборке из {sample[0]} вакансий из {sample[1]}")
         for key, value in self.vacancies_info.items():
             print(f"{key}: {value}")
-        rep = Report(pdf_name, self.vacancies_info, self.job_name)
+        for key, value in self.confidence_intervals.items():
+            print(f"Доверительный интервал 95% - {key}: {value}")
+        rep = Report(pdf_name, self.vacancies_info, self.job_name, self.confidence_intervals, sample)
         rep.generate_pdf('graph.png')
+        if excel_name is not None:
+            with profiler.span('Таблица Excel'):
+                rep.generate_excel(excel_name)
 
 
 class Report:
@@ -274,8 +724,14 @@ class Report:
 
     :param job_name: Название выбранной профессии
     :type job_name: str
+
+    :param confidence_intervals: Доверительные интервалы статистик, посчитанных по выборке
+    :type confidence_intervals: dict
+
+    :param sample: Кортеж из размера выборки и количества вакансий в выгрузке для приближённого отчёта или None
+    :type sample: tuple
     """
-    def __init__(self, name, years_data, job_name):
+    def __init__(self, name, years_data, job_name, confidence_intervals: dict = None, sample: tuple = None):
         """
         Инициализирует объект класса Report
 
@@ -287,10 +743,52 @@ class Report:
 
         :param job_name: Название выбранной профессии
         :type job_name: str
+
+        :param confidence_intervals: Доверительные интервалы статистик, посчитанных по выборке
+        :type confidence_intervals: dict
+
+        :param sample: Кортеж из размера выборки и количества вакансий в выгрузке для приближённого отчёта
+        :type sample: tuple
         """
         self.name = name
         self.years_data = years_data
         self.job_name = job_name
+        self.confidence_intervals = {} if confidence_intervals is None else confidence_intervals
+        self.sample = sample
+
+    def get_approximate_note(self) -> str:
+        """
+        Возвращает пометку приближённого отчёта
+
+        :return: Текст пометки или пустая строка для точного отчёта
+        """
+        if self.sample is None:
+            return ''
+        return f"Приближённый отчёт: случайная выборка из {self.sample[0]} вакансий из {self.sample[1]}, " \
+               f"количества пересчитаны на всю выгрузку, в квадратных скобках - доверительные интервалы 95%"
+
+    def add_interval(self, stats_key: str, key, value, format_value=str):
+        """
+        Дополняет значение статистики доверительным интервалом, если он есть
+
+        :param stats_key: Название статистики
+        :type stats_key: str
+
+        :param key: Год или город
+        :type key: object
+
+        :param value: Значение для таблицы
+        :type value: object
+
+        :param format_value: Функция форматирования границ интервала
+        :type format_value: function
+
+        :return: Значение с интервалом вида "значение [нижняя; верхняя]" или исходное значение
+        """
+        interval = self.confidence_intervals.get(stats_key, {}).get(key)
+        if interval is None:
+            return value
+        return f"{value} [{format_value(interval[0])}; {format_value(interval[1])}]"
 
     def generate_pdf(self, image_name: str) -> None:
         """
@@ -301,26 +799,40 @@ class Report:
 
         :return:
         """
+        with profiler.span('Графики matplotlib'):
+            self.generate_image(image_name)
+        with profiler.span('Шаблон Jinja'):
+            pdf_template = self.get_html(image_name)
+        with profiler.span('Pdf wkhtmltopdf'):
+            config = pdfkit.configuration(wkhtmltopdf=r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe')
+            pdfkit.from_string(pdf_template, self.name, configuration=config,
+                               options={'enable-local-file-access': None})
+
+    def get_html(self, image_name: str) -> str:
+        """
+        Формирует html-разметку отчёта по шаблону
+
+        :param image_name: Название изображения с графиками по статистикам
+        :type image_name: str
+
+        :return: Html-разметка отчёта
+        """
         environment = Environment(loader=FileSystemLoader('.'))
         template = environment.get_template('pdf_template.html')
-        years_headers = ['Год', 'Средняя зарплата', f"Средняя зарплата - {self.job_name}", 'Количество вакансий',
-                         f"Количество вакансий - {self.job_name}"]
-        area_headers = ['Город', 'Уровень зарплат', '', 'Город', 'Доля вакансий']
-        self.generate_image(image_name)
-        pdf_template = template.render({
+        return template.render({
             'pdf_title': 'style = "text-align: center; font-size: 36px"',
             'job_name': self.job_name,
+            'approximate_note': self.get_approximate_note(),
             'image_file': image_name,
             'table_title': 'style = "text-align: center"',
             'cell_style': 'style = "border: 1px solid #000000; border-collapse: collapse; font-size: 18px; height: 19pt; padding: 5px; text-align: center"',
             'empty_cell': 'style = ""',
-            'years_headers': years_headers,
+            'years_headers': self.get_years_headers(),
             'years_data': self.get_years_statistics(),
-            'area_headers': area_headers,
-            'area_data': self.get_area_statistics()
+            'area_headers': self.get_area_headers(),
+            'area_data': self.get_area_statistics(),
+            'additional_tables': self.get_additional_tables()
         })
-        config = pdfkit.configuration(wkhtmltopdf=r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe')
-        pdfkit.from_string(pdf_template, self.name, configuration=config, options={'enable-local-file-access': None})
 
     def generate_image(self, image_name: str) -> None:
         """
@@ -331,7 +843,10 @@ class Report:
 
         :return:
         """
-        figure, axes = plt.subplots(nrows=2, ncols=2, figsize=(16, 9))
+        has_quantiles = 'Квантили уровня зарплат по годам' in self.years_data
+        has_skills = 'Самые востребованные навыки' in self.years_data
+        rows_count = 2 + has_quantiles + has_skills
+        figure, axes = plt.subplots(nrows=rows_count, ncols=2, figsize=(16, 4.5 * rows_count))
         axes = axes.flatten()
         plt.rcParams['font.size'] = '8'
         self.draw_vertical_graph(axes[0], 'Динамика уровня зарплат по годам',
@@ -344,6 +859,18 @@ class Report:
         self.draw_horizontal_graph(axes[2], 'Уровень зарплат по городам (в порядке убывания)',
                                    'Уровень зарплат по городам')
         self.draw_pie_graph(axes[3], 'Доля вакансий по городам (в порядке убывания)', 'Доля вакансий по городам')
+        if has_quantiles:
+            self.draw_quantiles_graph(axes[4], 'Квантили уровня зарплат по годам',
+                                      'Квантили уровня зарплат по годам для выбранной профессии',
+                                      'Квантили зарплат по годам', 'з/п', f"з/п {self.job_name.lower()}")
+            self.draw_horizontal_quantiles_graph(axes[5], 'Квантили уровня зарплат по городам',
+                                                 'Медиана и квартили зарплат по городам')
+        if has_skills:
+            self.draw_horizontal_graph(axes[-2], 'Самые востребованные навыки', 'Самые востребованные навыки')
+            self.draw_horizontal_graph(axes[-1], 'Самые востребованные навыки для выбранной профессии',
+                                       f"Навыки {self.job_name.lower()}")
+        if self.sample is not None:
+            figure.suptitle(f"Приближённо: выборка из {self.sample[0]} вакансий из {self.sample[1]}")
         figure.tight_layout(pad=3)
         figure.savefig(image_name)
 
@@ -425,19 +952,114 @@ class Report:
         area_axis.axis('equal')
         area_axis.set_title(graph_title, fontsize=16)
 
+    def draw_quantiles_graph(self, year_axis, average_stats_key, job_stats_key, graph_title, average_label,
+                             job_label) -> None:
+        """
+        Создаёт график медианы и межквартильного размаха зарплат по годам
+
+        :param year_axis: Ось графика по годовой статистике
+        :type year_axis: ndarray
+
+        :param average_stats_key: Ключ словаря с общими годовыми квантилями
+        :type average_stats_key: str
+
+        :param job_stats_key: Ключ словаря с годовыми квантилями выбранной профессии
+        :type job_stats_key: str
+
+        :param graph_title: Название графика
+        :type graph_title: str
+
+        :param average_label: Название графика общей годовой статистики
+        :type average_label: str
+
+        :param job_label: Название графика годовой статистики выбранной профессии
+        :type job_label: str
+
+        :return:
+        """
+        lower, median, upper = salary_quantiles.index(0.25), salary_quantiles.index(0.5), salary_quantiles.index(0.75)
+        x = np.arange(len(self.years_data[average_stats_key].keys()))
+        for stats_key, label in ((average_stats_key, average_label), (job_stats_key, job_label)):
+            quantiles = list(self.years_data[stats_key].values())
+            year_axis.fill_between(x, [value[lower] for value in quantiles], [value[upper] for value in quantiles],
+                                   alpha=0.3)
+            year_axis.plot(x, [value[median] for value in quantiles], label=f"медиана {label}")
+        year_axis.set_title(graph_title, fontsize=16)
+        year_axis.set_xticks(x, self.years_data[average_stats_key].keys())
+        year_axis.legend()
+        year_axis.grid(axis='y')
+        year_axis.tick_params(axis='x', labelrotation=90)
+
+    def draw_horizontal_quantiles_graph(self, area_axis, area_stats_key, graph_title) -> None:
+        """
+        Создаёт горизонтальную диаграмму медиан зарплат по городам с отметкой квартилей
+
+        :param area_axis: Ось диаграммы по статистике по городам
+        :type area_axis: ndarray
+
+        :param area_stats_key: Ключ словаря с квантилями зарплат по городам
+        :type area_stats_key: str
+
+        :param graph_title: Название диаграммы
+        :type graph_title: str
+
+        :return:
+        """
+        lower, median, upper = salary_quantiles.index(0.25), salary_quantiles.index(0.5), salary_quantiles.index(0.75)
+        quantiles = list(self.years_data[area_stats_key].values())
+        y_labels = [area.replace('-', '-\n').replace(' ', '\n') for area in self.years_data[area_stats_key].keys()]
+        y = np.arange(len(y_labels))
+        area_axis.barh(y, [value[median] for value in quantiles],
+                       xerr=[[value[median] - value[lower] for value in quantiles],
+                             [value[upper] - value[median] for value in quantiles]])
+        area_axis.set_title(graph_title, fontsize=16)
+        area_axis.set_yticks(y, labels=y_labels, fontsize=6, verticalalignment='center', horizontalalignment='right')
+        area_axis.invert_yaxis()
+        area_axis.grid(axis='x')
+
+    def get_years_headers(self) -> list:
+        """
+        Возвращает названия колонок таблицы годовых статистик
+
+        :return: Список с названиями колонок
+        """
+        years_headers = ['Год', 'Средняя зарплата', f"Средняя зарплата - {self.job_name}", 'Количество вакансий',
+                         f"Количество вакансий - {self.job_name}"]
+        if 'Количество работодателей по годам' in self.years_data:
+            years_headers.append('Количество работодателей')
+        return years_headers
+
+    def get_area_headers(self) -> list:
+        """
+        Возвращает названия колонок таблицы статистик по городам; пустое название - колонка-разделитель
+
+        :return: Список с названиями колонок
+        """
+        area_headers = ['Город', 'Уровень зарплат', '', 'Город', 'Доля вакансий']
+        if 'Количество работодателей по городам' in self.years_data:
+            area_headers.append('Количество работодателей')
+        return area_headers
+
     def get_years_statistics(self):
         """
         Возвращает словарь с данными годовых статистик для таблицы
 
         :return: Словарь с данными годовых статистик
         """
-        return {year: [salary, job_salary, count, job_count]
-                for year, salary, job_salary, count, job_count in
-                zip(self.years_data['Динамика уровня зарплат по годам'].keys(),
-                    self.years_data['Динамика уровня зарплат по годам'].values(),
-                    self.years_data['Динамика уровня зарплат по годам для выбранной профессии'].values(),
-                    self.years_data['Динамика количества вакансий по годам'].values(),
-                    self.years_data['Динамика количества вакансий по годам для выбранной профессии'].values())}
+        years_statistics = {year: [salary, job_salary, count, job_count]
+                            for year, salary, job_salary, count, job_count in
+                            zip(self.years_data['Динамика уровня зарплат по годам'].keys(),
+                                self.years_data['Динамика уровня зарплат по годам'].values(),
+                                self.years_data['Динамика уровня зарплат по годам для выбранной профессии'].values(),
+                                self.years_data['Динамика количества вакансий по годам'].values(),
+                                self.years_data['Динамика количества вакансий по годам для выбранной профессии'].values())}
+        for year, values in years_statistics.items():
+            values[0] = self.add_interval('Динамика уровня зарплат по годам', year, values[0])
+            values[1] = self.add_interval('Динамика уровня зарплат по годам для выбранной профессии', year, values[1])
+        if 'Количество работодателей по годам' in self.years_data:
+            for year, values in years_statistics.items():
+                values.append(self.years_data['Количество работодателей по годам'][year])
+        return years_statistics
 
     def get_area_statistics(self):
         """
@@ -445,28 +1067,709 @@ class Report:
 
         :return: Словарь с данными статистик по городам
         """
-        self.years_data['Доля вакансий по городам (в порядке убывания)'] = \
-            {area: str(f"{fraction * 100:,.2f}%").replace('.', ',')
-             for area, fraction in self.years_data['Доля вакансий по городам (в порядке убывания)'].items()}
-        return {i: [area_salary, salary, area_fractions, fractions_by_area]
-                for i, (area_salary, salary, area_fractions, fractions_by_area) in
-                enumerate(zip(self.years_data['Уровень зарплат по городам (в порядке убывания)'].keys(),
-                              self.years_data['Уровень зарплат по городам (в порядке убывания)'].values(),
-                              self.years_data['Доля вакансий по городам (в порядке убывания)'].keys(),
-                              self.years_data['Доля вакансий по городам (в порядке убывания)'].values()))}
+        format_fraction = lambda fraction: str(f"{fraction * 100:,.2f}%").replace('.', ',')
+        fractions = {area: self.add_interval('Доля вакансий по городам (в порядке убывания)', area,
+                                             format_fraction(fraction), format_fraction)
+                     for area, fraction in self.years_data['Доля вакансий по городам (в порядке убывания)'].items()}
+        area_statistics = {i: [area_salary, salary, area_fractions, fractions_by_area]
+                           for i, (area_salary, salary, area_fractions, fractions_by_area) in
+                           enumerate(zip(self.years_data['Уровень зарплат по городам (в порядке убывания)'].keys(),
+                                         self.years_data['Уровень зарплат по городам (в порядке убывания)'].values(),
+                                         fractions.keys(), fractions.values()))}
+        for values in area_statistics.values():
+            values[1] = self.add_interval('Уровень зарплат по городам (в порядке убывания)', values[0], values[1])
+        if 'Количество работодателей по городам' in self.years_data:
+            for values in area_statistics.values():
+                values.append(self.years_data['Количество работодателей по городам'].get(values[2], ''))
+        return area_statistics
+
+    def get_additional_tables(self):
+        """
+        Возвращает дополнительные таблицы отчёта для статистик, присутствующих в словаре
+
+        :return: Список таблиц вида [заголовок, названия колонок, словарь строк]
+        """
+        quantile_headers = ['Медиана' if fraction == 0.5 else f"{round(fraction * 100)}%"
+                            for fraction in salary_quantiles]
+        tables = [['Квантили зарплат по годам', 'Год', 'Квантили уровня зарплат по годам'],
+                  [f"Квантили зарплат по годам - {self.job_name}", 'Год',
+                   'Квантили уровня зарплат по годам для выбранной профессии'],
+                  ['Квантили зарплат по городам', 'Город', 'Квантили уровня зарплат по городам']]
+        additional_tables = [[title, [first_header] + quantile_headers, self.years_data[stats_key]]
+                             for title, first_header, stats_key in tables if stats_key in self.years_data]
+        format_top = lambda top: ', '.join(f"{item} ({count})" for item, count in top.items())
+        tables = [['Самые востребованные навыки', 'Навык', 'Самые востребованные навыки'],
+                  [f"Самые востребованные навыки - {self.job_name}", 'Навык',
+                   'Самые востребованные навыки для выбранной профессии']]
+        additional_tables += [[title, [first_header, 'Количество вакансий'],
+                               {skill: [count] for skill, count in self.years_data[stats_key].items()}]
+                              for title, first_header, stats_key in tables if stats_key in self.years_data]
+        tables = [['Самые востребованные навыки по годам', ['Год', 'Навыки (количество вакансий)'],
+                   'Самые востребованные навыки по годам'],
+                  ['Крупнейшие работодатели по городам', ['Город', 'Работодатели (количество вакансий)'],
+                   'Крупнейшие работодатели по городам']]
+        additional_tables += [[title, headers,
+                               {key: [format_top(top)] for key, top in self.years_data[stats_key].items()}]
+                              for title, headers, stats_key in tables if stats_key in self.years_data]
+        return additional_tables
+
+    def generate_excel(self, excel_name: str) -> None:
+        """
+        Генерирует xlsx-файл с листами таблиц отчёта
+
+        :param excel_name: Название xlsx-файла
+        :type excel_name: str
+
+        :return:
+        """
+        table = Workbook()
+        table_style = self.create_style()
+        highlight = Font(bold=True)
+        area_statistics = [values[:2] + [''] + values[2:] for values in self.get_area_statistics().values()]
+        sheets = [['Статистика по годам', self.get_years_headers(),
+                   [[year] + values for year, values in self.get_years_statistics().items()]],
+                  ['Статистика по городам', self.get_area_headers(), area_statistics]]
+        sheets += [[title, headers, [[key] + values for key, values in rows.items()]]
+                   for title, headers, rows in self.get_additional_tables()]
+        for title, headers, rows in sheets:
+            # названия листов Excel не длиннее 31 символа и без символов []:*?/\
+            sheet = table.create_sheet(re.sub(r'[\[\]:*?/\\]', ' ', title)[:31])
+            sheet.append(headers)
+            for values in rows:
+                sheet.append(values)
+            self.reform_cells(sheet, table_style, rows, highlight)
+        table.remove(table.active)
+        table.save(excel_name)
+
+    def create_style(self) -> NamedStyle:
+        """
+        Создаёт стиль ячеек таблиц Excel
+
+        :return: Стиль с шрифтом Calibri и тонкими границами
+        """
+        new_style = NamedStyle('highlight')
+        new_style.font = Font(name='Calibri', size=11, color='000000')
+        border = Side(style="thin", color="000000")
+        new_style.border = Border(left=border, right=border, top=border, bottom=border)
+        return new_style
+
+    def reform_cells(self, current_sheet, table_style: NamedStyle, sheet_data: list, highlight: Font) -> None:
+        """
+        Оформляет ячейки листа: границы, жирные заголовки и ширина колонок по содержимому;
+        пустые ячейки-разделители остаются без оформления
+
+        :param current_sheet: Лист Excel
+        :type current_sheet: Worksheet
+
+        :param table_style: Стиль ячеек
+        :type table_style: NamedStyle
+
+        :param sheet_data: Строки таблицы без заголовка
+        :type sheet_data: list
+
+        :param highlight: Шрифт заголовков
+        :type highlight: Font
+
+        :return:
+        """
+        dimensions = {}
+        for i in range(1, len(sheet_data) + 2):
+            for cell in current_sheet[i]:
+                if cell.value is None or cell.value == '':
+                    dimensions[cell.column_letter] = max(dimensions.get(cell.column_letter, 0), 0)
+                else:
+                    cell.style = table_style
+                    if i == 1:
+                        cell.font = highlight
+                    dimensions[cell.column_letter] = max(dimensions.get(cell.column_letter, 0), len(str(cell.value)))
+        for key, value in dimensions.items():
+            current_sheet.column_dimensions[key].width = value + 2
+
+
+def clean_vacancies_chunk(rows: list, column_names: list, key_columns: list = None) -> tuple:
+    """
+    Стадия очистки конвейера: считает отпечатки строк пакета и создаёт из них вакансии;
+    функция для запуска в отдельном процессе
+
+    :param rows: Пакет строк csv-файла
+    :type rows: list
+
+    :param column_names: Список с названиями колонок таблицы
+    :type column_names: list
+
+    :param key_columns: Колонки удаления повторов, по которым считаются отпечатки; None - fingerprint_columns
+    :type key_columns: list
+
+    :return: Кортеж из списка вакансий и отпечатков строк
+    """
+    fingerprints = array('Q', get_row_fingerprints(rows, column_names, key_columns))
+    return DataSet.get_reformed_file(rows, column_names), fingerprints
+
+
+def read_vacancies_range(ranges: list, file_name: str, column_names: list, key_columns: list = None) -> tuple:
+    """
+    Стадия конвейера параллельного чтения одного файла: читает диапазоны байтов файла через отображение в память
+    и очищает их строки; функция для запуска в отдельном процессе
+
+    :param ranges: Список пар (начало, конец) смещений из MappedCsvReader.get_row_ranges
+    :type ranges: list
+
+    :param file_name: Название несжатого csv-файла
+    :type file_name: str
+
+    :param column_names: Названия читаемых колонок, присутствующих в файле
+    :type column_names: list
+
+    :param key_columns: Колонки удаления повторов, по которым считаются отпечатки; None - fingerprint_columns
+    :type key_columns: list
+
+    :return: Кортеж из списка вакансий, отпечатков строк, количества отброшенных строк и количества повторов
+        внутри диапазонов
+    """
+    rows = []
+    rejected_count = 0
+    for start, end in ranges:
+        range_rows, range_rejected_count = read_rows_range(file_name, column_names, start, end)
+        rows.extend(range_rows)
+        rejected_count += range_rejected_count
+    duplicates_count = 0
+    if key_columns is not None:
+        # повторы внутри диапазонов отбрасываются до создания вакансий, повторы между диапазонами - в порядке файла
+        keys_seen = set()
+        unique_rows = []
+        for row, key in zip(rows, get_row_fingerprints(rows, column_names, key_columns)):
+            if key in keys_seen:
+                duplicates_count += 1
+            else:
+                keys_seen.add(key)
+                unique_rows.append(row)
+        rows = unique_rows
+    return clean_vacancies_chunk(rows, column_names, key_columns) + (rejected_count, duplicates_count)
+
+
+def read_vacancies_part(file_name: str, dataset_options: dict) -> tuple:
+    """
+    Читает и очищает один файл из нескольких входных; функция для запуска в отдельном процессе
+
+    :param file_name: Название csv-файла
+    :type file_name: str
+
+    :param dataset_options: Параметры чтения для DataSet
+    :type dataset_options: dict
+
+    :return: Кортеж из списка вакансий, отпечатков строк, отпечатков ключей повторов (или None)
+        и количества повторов внутри файла
+    """
+    data = DataSet(file_name, [], **dataset_options)
+    column_names, rows = data.read_file()
+    fingerprints = array('Q', get_row_fingerprints(rows, column_names, data.dedup_columns))
+    if data.deduplicator is None:
+        return data.get_reformed_file(rows, column_names), fingerprints, None, 0
+    # при удалении повторов отпечаток строки и есть отпечаток её ключа
+    return data.get_reformed_file(rows, column_names), fingerprints, fingerprints, data.deduplicator.duplicates_count
+
+
+def read_vacancies_files(file_names: list, dataset_options: dict, workers: int = 1, stats: dict = None):
+    """
+    Читает несколько файлов в пуле процессов и выдаёт вакансии пофайлово в порядке файлов,
+    удаляя повторы между файлами по отпечаткам ключевых колонок; вакансии всех файлов сразу в памяти не хранятся
+
+    :param file_names: Список названий csv-файлов
+    :type file_names: list
+
+    :param dataset_options: Параметры чтения для DataSet
+    :type dataset_options: dict
+
+    :param workers: Количество процессов
+    :type workers: int
+
+    :param stats: Словарь, в котором накапливается количество удалённых повторов (duplicates)
+    :type stats: dict
+
+    :return: Генератор кортежей из списка вакансий файла и отпечатков их строк
+    """
+    stats = {} if stats is None else stats
+    stats.setdefault('duplicates', 0)
+    keys_seen = None if dataset_options.get('dedup_columns') is None else \
+        get_fingerprint_set(dataset_options.get('bloom_capacity'))
+    file_names = select_files(file_names, required_columns + (dataset_options.get('dedup_columns') or []))
+    for part_vacancies, part_fingerprints, part_keys, part_duplicates in \
+            map_files(read_vacancies_part, file_names, (dataset_options,), workers):
+        stats['duplicates'] += part_duplicates
+        if keys_seen is None:
+            yield part_vacancies, part_fingerprints
+            continue
+        vacancies = []
+        fingerprints = array('Q')
+        for vac, fingerprint, key in zip(part_vacancies, part_fingerprints, part_keys):
+            if keys_seen.add(key):
+                vacancies.append(vac)
+                fingerprints.append(fingerprint)
+            else:
+                stats['duplicates'] += 1
+        yield vacancies, fingerprints
+
+
+def scan_job_vacancies(state: VacanciesState, file_name: str, job_name: str, dataset_options: dict,
+                       workers: int = 1) -> None:
+    """
+    Досчитывает скетчи профессии, которой нет в сохранённом состоянии: заново читает csv-файл с теми же
+    параметрами и файл дополнений, отбрасывая дополнения, уже встреченные в файле, как при построении состояния
+
+    :param state: Загруженное состояние статистик со скетчами
+    :type state: VacanciesState
+
+    :param file_name: Название csv-файла
+    :type file_name: str
+
+    :param job_name: Название профессии, добавленной в скетчи методом add_job
+    :type job_name: str
 
+    :param dataset_options: Параметры чтения для DataSet: dedup_columns, bloom_capacity, backend
+    :type dataset_options: dict
 
-def get_statistics() -> None:
+    :param workers: Количество процессов для очистки строк
+    :type workers: int
+
+    :return:
+    """
+    seen = VacanciesState()
+    data = DataSet(file_name, [], **dataset_options)
+    with start_workers(workers) as executor:
+        for vacancies, fingerprints in data.get_vacancy_batches(workers, executor):
+            seen.fingerprints.update(fingerprints)
+            state.sketches.add_job_vacancies(job_name, vacancies)
+    for vacancies, fingerprints in read_delta(get_delta_name(file_name)):
+        state.sketches.add_job_vacancies(job_name, seen.get_new_items(vacancies, fingerprints))
+
+
+def get_database_state(file_name: str, job_name: str, sketches: VacanciesSketches) -> VacanciesState:
+    """
+    Загружает сохранённое рядом с базой данных состояние статистик, если оно не старше базы и построено с теми же
+    параметрами скетчей, иначе одним чтением вакансий базы строит куб, индекс названий и скетчи и сохраняет
+    состояние. Скетчи профессии, которой нет в загруженном состоянии, досчитываются по вакансиям базы,
+    в названии которых есть название профессии
+
+    :param file_name: Название файла базы данных
+    :type file_name: str
+
+    :param job_name: Название профессии, скетчи которой нужны для отчёта; None - без скетчей профессии
+    :type job_name: str
+
+    :param sketches: Пустые скетчи с выбранной профессией
+    :type sketches: VacanciesSketches
+
+    :return: Объект класса VacanciesState
+    """
+    # имя файла состояния включает расширение, чтобы не совпасть с состоянием csv-файла с тем же именем
+    state_name = file_name + '.state'
+    with VacanciesDatabase(file_name) as database:
+        if os.path.exists(state_name) and os.path.getmtime(state_name) >= os.path.getmtime(file_name):
+            state = VacanciesState.load(state_name)
+            if state is not None and state.sketches.get_options() == sketches.get_options():
+                if job_name is not None and state.sketches.add_job(job_name, state.name_index):
+                    with profiler.span('Скетчи выбранной профессии'):
+                        for rows in database.iter_rows(vacancy_columns, 'instr(name, ?) > 0', (job_name,)):
+                            vacancies = DataSet.get_reformed_file(rows, vacancy_columns)
+                            state.sketches.add_job_vacancies(job_name, vacancies)
+                    with profiler.span('Сохранение состояния'):
+                        state.save(state_name)
+                return state
+        state = VacanciesState(sketches=sketches)
+        with profiler.span('Чтение базы данных, построение куба') as stage:
+            stage['rows'] = 0
+            for rows in database.iter_rows(vacancy_columns):
+                state.add_vacancies(DataSet.get_reformed_file(rows, vacancy_columns))
+                stage['rows'] += len(rows)
+    with profiler.span('Сохранение состояния'):
+        state.save(state_name)
+    return state
+
+
+def get_vacancies_state(file_name: str, dataset_options: dict = None, workers: int = 1, job_name: str = None,
+                        sketch_options: dict = None):
+    """
+    Загружает сохранённое рядом с csv-файлом состояние статистик, если оно не старше файла и файла дополнений
+    и построено с теми же колонками удаления повторов и параметрами скетчей, иначе читает файл, строит куб
+    и скетчи с отпечатками строк, добавляет вакансии из файла дополнений (get_delta_name) и сохраняет состояние.
+    Скетчи профессии, которой нет в загруженном состоянии, досчитываются повторным чтением файла.
+    Один файл обрабатывается конвейером StagedPipeline (DataSet.get_vacancy_batches: при workers > 1 очистка идёт
+    в пуле процессов, а при чтении через mmap процессы сами читают диапазоны байтов файла),
+    несколько файлов читаются параллельно, а их общее состояние не сохраняется. Пакеты вакансий сразу
+    добавляются в куб и скетчи и не хранятся, поэтому память ограничена состоянием и очередями конвейера.
+    Состояние базы данных SQLite строится get_database_state
+
+    :param file_name: Название csv-файла, каталога, шаблона glob, списка файлов через ', ' или базы данных
+    :type file_name: str
+
+    :param dataset_options: Параметры чтения для DataSet: dedup_columns, bloom_capacity, backend
+    :type dataset_options: dict
+
+    :param workers: Количество процессов для чтения нескольких файлов или очистки строк одного файла
+    :type workers: int
+
+    :param job_name: Название профессии, скетчи которой нужны для отчёта; None - без скетчей профессии
+    :type job_name: str
+
+    :param sketch_options: Параметры VacanciesSketches; по умолчанию параметры по умолчанию
+    :type sketch_options: dict
+
+    :return: Объект класса VacanciesState
+    """
+    dataset_options = {} if dataset_options is None else dataset_options
+    # состояние хранит значения, а не коды, поэтому таблицы кодирования с прошлого построения больше не нужны
+    vacancy_encoding.clear()
+    sketches = VacanciesSketches(**({} if sketch_options is None else sketch_options))
+    if job_name is not None:
+        sketches.add_job(job_name)
+    if is_vacancies_database(file_name):
+        return get_database_state(file_name, job_name, sketches)
+    file_names = get_input_files(file_name)
+    if len(file_names) > 1:
+        state = VacanciesState(dedup_columns=dataset_options.get('dedup_columns'), sketches=sketches)
+        stats = {}
+        with profiler.span('Параллельное чтение файлов, построение куба') as stage:
+            stage['rows'] = 0
+            for vacancies, fingerprints in read_vacancies_files(file_names, dataset_options, workers, stats):
+                state.fingerprints.update(fingerprints)
+                state.add_vacancies(vacancies)
+                stage['rows'] += len(vacancies)
+        if dataset_options.get('dedup_columns') is not None:
+            print(f"Удалено повторяющихся вакансий: {stats['duplicates']}")
+        return state
+    file_name = file_names[0]
+    state_name = get_state_name(file_name)
+    delta_name = get_delta_name(file_name)
+    sources_time = max(os.path.getmtime(name) for name in (file_name, delta_name) if os.path.exists(name))
+    if os.path.exists(state_name) and os.path.getmtime(state_name) >= sources_time:
+        state = VacanciesState.load(state_name)
+        if state is None:
+            print(f"Состояние {state_name} сохранено в устаревшем формате и будет построено заново")
+        elif state.dedup_columns == dataset_options.get('dedup_columns') and \
+                state.sketches.get_options() == sketches.get_options() and \
+                state.name_index.rows_count == sum(measures[1] for measures in state.cube.cells.values()):
+            if job_name is not None and state.sketches.add_job(job_name, state.name_index):
+                with profiler.span('Скетчи выбранной профессии'):
+                    scan_job_vacancies(state, file_name, job_name, dataset_options, workers)
+                with profiler.span('Сохранение состояния'):
+                    state.save(state_name)
+            return state
+    state = VacanciesState(dedup_columns=dataset_options.get('dedup_columns'), sketches=sketches)
+    data = DataSet(file_name, [], **dataset_options)
+    with profiler.span('Конвейер: чтение, очистка, построение куба') as stage:
+        stage['rows'] = 0
+        with start_workers(workers) as executor:
+            for vacancies, fingerprints in data.get_vacancy_batches(workers, executor):
+                state.fingerprints.update(fingerprints)
+                state.add_vacancies(vacancies)
+                stage['rows'] += len(vacancies)
+    if data.deduplicator is not None:
+        print(f"Удалено повторяющихся вакансий: {data.deduplicator.duplicates_count}")
+    if os.path.exists(delta_name):
+        with profiler.span('Вакансии из файла дополнений') as stage:
+            stage['rows'] = 0
+            for vacancies, fingerprints in read_delta(delta_name):
+                new_vacancies = state.get_new_items(vacancies, fingerprints)
+                state.add_vacancies(new_vacancies)
+                stage['rows'] += len(new_vacancies)
+        print(f"Из файла дополнений {delta_name} добавлено вакансий: {stage['rows']}")
+    with profiler.span('Сохранение состояния'):
+        state.save(state_name)
+    return state
+
+
+def get_vacancies_sample(file_name: str, sample_size: int, dataset_options: dict = None) -> tuple:
+    """
+    Одним потоковым чтением отбирает равномерную выборку полных строк и очищает только попавшие в неё строки.
+    Повторы удаляются внутри каждого файла, если заданы колонки удаления повторов
+
+    :param file_name: Название csv-файла, каталога, шаблона glob или списка файлов через ', '
+    :type file_name: str
+
+    :param sample_size: Размер выборки
+    :type sample_size: int
+
+    :param dataset_options: Параметры чтения для DataSet: dedup_columns, bloom_capacity, backend
+    :type dataset_options: dict
+
+    :return: Кортеж из списка вакансий выборки и количества просмотренных полных строк
+    """
+    dataset_options = {} if dataset_options is None else dataset_options
+    sampler = ReservoirSampler(sample_size)
+    file_names = get_input_files(file_name)
+    column_names = get_column_names(file_names[0])
+    with profiler.span('Выборка строк') as stage:
+        for part_name in select_files(file_names, column_names):
+            part_column_names, rows = DataSet(part_name, [], **dataset_options).get_rows()
+            if part_column_names != column_names:
+                indexes = [part_column_names.index(column) for column in column_names]
+                rows = ([row[i] for i in indexes] for row in rows)
+            sampler.sample(rows)
+        stage['rows'] = sampler.seen_count
+    with profiler.span('Очистка выборки') as stage:
+        vacancies = DataSet.get_reformed_file(sampler.items, column_names)
+        stage['rows'] = len(vacancies)
+    return vacancies, sampler.seen_count
+
+
+def get_statistics(dataset_options: dict = None, workers: int = 1, sample_size: int = None,
+                   is_excel: bool = False) -> None:
     """
     Собирает статистику о вакансиях на основе вводимых данных
 
+    :param dataset_options: Параметры чтения для DataSet: dedup_columns, bloom_capacity, backend
+    :type dataset_options: dict
+
+    :param workers: Количество процессов для чтения нескольких файлов или очистки строк одного файла
+    :type workers: int
+
+    :param sample_size: Размер случайной выборки для приближённой статистики; None - по всем вакансиям
+        (для базы данных статистика всегда точная)
+    :type sample_size: int
+
+    :param is_excel: Сохранить таблицы отчёта и в report.xlsx
+    :type is_excel: bool
+
+    :return:
+    """
+    csv_file = InputConnect(input_sentences)
+    excel_name = 'report.xlsx' if is_excel else None
+    if len(get_input_files(csv_file.name)) == 0:
+        print('Пустой файл')
+    elif sample_size is not None and not is_vacancies_database(csv_file.name):
+        vacancies, population_count = get_vacancies_sample(csv_file.name, sample_size, dataset_options)
+        if len(vacancies) == 0:
+            print('Нет данных')
+        else:
+            csv_file.print_vacancies_info(vacancies, 'report.pdf', population_count=population_count,
+                                          excel_name=excel_name)
+    else:
+        state = get_vacancies_state(csv_file.name, dataset_options, workers, csv_file.job_name,
+                                    csv_file.get_sketch_options())
+        csv_file.print_vacancies_info([], 'report.pdf', state, excel_name=excel_name)
+
+
+def add_delta_vacancies(state: VacanciesState, file_name: str, delta_names: list, dataset_options: dict = None,
+                        workers: int = 1) -> tuple:
+    """
+    Добавляет в состояние csv-файла вакансии из файлов выгрузки, которых в нём ещё нет, дописывает их
+    в файл дополнений и сохраняет состояние. Строки выгрузки сравниваются с состоянием по тем же колонкам
+    удаления повторов, по которым оно построено
+
+    :param state: Состояние статистик csv-файла
+    :type state: VacanciesState
+
+    :param file_name: Название csv-файла состояния
+    :type file_name: str
+
+    :param delta_names: Список названий файлов с новыми вакансиями
+    :type delta_names: list
+
+    :param dataset_options: Параметры чтения для DataSet: bloom_capacity, backend
+    :type dataset_options: dict
+
+    :param workers: Количество процессов для чтения нескольких файлов с новыми вакансиями
+    :type workers: int
+
+    :return: Кортеж из количества прочитанных и количества добавленных вакансий
+    """
+    dataset_options = {} if dataset_options is None else dataset_options
+    delta_options = {'backend': dataset_options.get('backend', 'csv'), 'dedup_columns': state.dedup_columns,
+                     'bloom_capacity': dataset_options.get('bloom_capacity')}
+    rows_count = added_count = 0
+    with profiler.span('Чтение csv-файла, построение куба') as stage:
+        # пакеты новых вакансий сразу попадают в куб, скетчи и файл дополнений и дальше не хранятся;
+        # файл дополнений пишется раньше состояния, чтобы состояние оставалось не старше него
+        for vacancies, fingerprints in read_vacancies_files(delta_names, delta_options, workers):
+            new_items = state.get_new_items(list(zip(vacancies, fingerprints)), fingerprints)
+            new_vacancies = [vac for vac, _ in new_items]
+            state.add_vacancies(new_vacancies)
+            append_delta(get_delta_name(file_name), new_vacancies,
+                         array('Q', (fingerprint for _, fingerprint in new_items)))
+            rows_count += len(vacancies)
+            added_count += len(new_vacancies)
+        stage['rows'] = rows_count
+    with profiler.span('Сохранение состояния'):
+        state.save(get_state_name(file_name))
+    return rows_count, added_count
+
+
+def append_statistics(dataset_options: dict = None, workers: int = 1, is_excel: bool = False) -> None:
+    """
+    Дополняет сохранённое состояние статистик новыми вакансиями из файлов выгрузки
+    и формирует отчёт по обновлённому состоянию. Новые вакансии дописываются и в файл дополнений,
+    поэтому пересчёт состояния после изменения csv-файла их не теряет
+
+    :param dataset_options: Параметры чтения для DataSet: dedup_columns, bloom_capacity, backend
+    :type dataset_options: dict
+
+    :param workers: Количество процессов для чтения нескольких файлов с новыми вакансиями
+    :type workers: int
+
+    :param is_excel: Сохранить таблицы отчёта и в report.xlsx
+    :type is_excel: bool
+
     :return:
     """
     csv_file = InputConnect(input_sentences)
-    if os.path.getsize(csv_file.name) == 0:
+    delta_name = input('Введите название файла с новыми вакансиями: ')
+    file_names = get_input_files(csv_file.name)
+    delta_names = get_input_files(delta_name)
+    if len(file_names) == 0 or len(delta_names) == 0:
+        print('Пустой файл')
+    elif len(file_names) > 1 or is_vacancies_database(file_names[0]):
+        print('Дополнить можно только состояние одного csv-файла')
+    else:
+        state = get_vacancies_state(file_names[0], dataset_options, workers, csv_file.job_name,
+                                    csv_file.get_sketch_options())
+        rows_count, added_count = add_delta_vacancies(state, file_names[0], delta_names, dataset_options, workers)
+        print(f"Добавлено вакансий: {added_count}, пропущено повторов: {rows_count - added_count}")
+        csv_file.print_vacancies_info([], 'report.pdf', state, excel_name='report.xlsx' if is_excel else None)
+
+
+def get_cube_slice(dataset_options: dict = None, workers: int = 1) -> None:
+    """
+    Выводит срез куба вакансий по вводимым измерениям и фильтрам
+
+    :param dataset_options: Параметры чтения для DataSet: dedup_columns, bloom_capacity, backend
+    :type dataset_options: dict
+
+    :param workers: Количество процессов для чтения нескольких файлов или очистки строк одного файла
+    :type workers: int
+
+    :return:
+    """
+    name = input('Введите название файла: ')
+    dimensions = reform_parameters(input('Введите измерения среза: '), ', ')
+    filter_parameters = reform_parameters(input('Введите параметры фильтрации среза: '), '; ')
+    filters = {}
+    for parameter in filter_parameters:
+        dimension, value = parameter.split(': ') if parameter.count(': ') == 1 else (parameter, '')
+        filters[dimension] = int(value) if dimension in ('year', 'month') and value.isdigit() else value
+    if len(get_input_files(name)) == 0:
+        print('Пустой файл')
+    elif any(dimension not in cube_dimensions for dimension in dimensions + list(filters.keys())):
+        print('Измерение среза некорректно')
+    else:
+        cube = get_vacancies_state(name, dataset_options, workers).cube
+        for key, (salary_sum, count, salary_min, salary_max) in sorted(cube.roll_up(dimensions, filters).items()):
+            print(f"{', '.join(str(value) for value in key)}: средняя з/п {int(salary_sum / count)}, "
+                  f"количество {count}, минимум {int(salary_min)}, максимум {int(salary_max)}")
+
+
+def get_groups(file_names: list, dimensions: list, dataset_options: dict, workers: int = 1,
+               memory_budget: int = 256 * 1024 * 1024) -> GroupAggregator:
+    """
+    Группирует вакансии csv-файлов по измерениям, не храня ни строки, ни вакансии: пакеты строк очищаются
+    конвейером StagedPipeline, а агрегаты копятся в GroupAggregator с ограничением памяти
+
+    :param file_names: Список названий csv-файлов
+    :type file_names: list
+
+    :param dimensions: Список измерений из group_dimensions
+    :type dimensions: list
+
+    :param dataset_options: Параметры чтения для DataSet: dedup_columns, bloom_capacity, backend
+    :type dataset_options: dict
+
+    :param workers: Количество процессов для очистки строк
+    :type workers: int
+
+    :param memory_budget: Бюджет памяти на группы в байтах
+    :type memory_budget: int
+
+    :return: Объект класса GroupAggregator
+    """
+    getters = [group_getters[dimension] for dimension in dimensions]
+    aggregator = GroupAggregator(memory_budget)
+    with start_workers(workers) as executor:
+        for file_name in file_names:
+            data = DataSet(file_name, [], **dataset_options)
+            column_names, rows = data.get_rows()
+            for vacancies in StagedPipeline(rows, DataSet.get_reformed_file, (column_names,),
+                                            workers=workers if workers > 1 else 0, executor=executor):
+                for vac in vacancies:
+                    salary = vac.salary.salary_in_rub
+                    aggregator.add(tuple(getter(vac) for getter in getters), [salary, 1, salary, salary])
+    return aggregator
+
+
+def get_grouped_statistics(dataset_options: dict = None, workers: int = 1, memory_budget: int = 256 * 1024 * 1024,
+                           output_name: str = None) -> None:
+    """
+    Выводит зарплаты и количество вакансий по группам из вводимых измерений, в том числе высококардинальных
+    (работодатель, название вакансии); группы не ограничены памятью - при превышении бюджета частичные
+    агрегаты сбрасываются на диск. Для базы данных группирует SQLite
+
+    :param dataset_options: Параметры чтения для DataSet: dedup_columns, bloom_capacity, backend
+    :type dataset_options: dict
+
+    :param workers: Количество процессов для очистки строк
+    :type workers: int
+
+    :param memory_budget: Бюджет памяти на группы в байтах
+    :type memory_budget: int
+
+    :param output_name: Название файла .csv или .jsonl для построчной выгрузки групп ('-' - стандартный вывод)
+        вместо печати
+    :type output_name: str
+
+    :return:
+    """
+    dataset_options = {} if dataset_options is None else dataset_options
+    name = input('Введите название файла: ')
+    dimensions = reform_parameters(input('Введите измерения группировки: '), ', ')
+    file_names = get_input_files(name)
+    if len(file_names) == 0:
+        print('Пустой файл')
+        return
+    if len(dimensions) == 0 or any(dimension not in group_dimensions for dimension in dimensions):
+        print('Измерение группировки некорректно')
+        return
+    aggregator = None
+    with profiler.span('Агрегация групп') as stage:
+        if is_vacancies_database(file_names[0]):
+            database = VacanciesDatabase(file_names[0])
+            groups = database.iter_groups(dimensions)
+        else:
+            database = None
+            aggregator = get_groups(file_names, dimensions, dataset_options, workers, memory_budget)
+            groups = aggregator.items(ordered=True)
+        fields = dimensions + ['Средняя зарплата', 'Количество вакансий', 'Минимальная зарплата',
+                               'Максимальная зарплата']
+        rows = (dict(zip(fields, key + (int(salary_sum / count), count, int(salary_min), int(salary_max))))
+                for key, (salary_sum, count, salary_min, salary_max) in groups)
+        try:
+            if output_name is not None:
+                stage['rows'] = write_table(rows, fields, output_name)
+            else:
+                stage['rows'] = 0
+                for row in rows:
+                    print(f"{', '.join(str(row[dimension]) for dimension in dimensions)}: "
+                          f"средняя з/п {row['Средняя зарплата']}, количество {row['Количество вакансий']}, "
+                          f"минимум {row['Минимальная зарплата']}, максимум {row['Максимальная зарплата']}")
+                    stage['rows'] += 1
+        finally:
+            if database is not None:
+                database.close()
+    if aggregator is not None:
+        profiler.add('Агрегация групп', 'spills', aggregator.spills_count)
+    if output_name is not None and output_name != '-':
+        print(f"Выгружено групп: {stage['rows']}")
+
+
+def import_vacancies() -> None:
+    """
+    Загружает вакансии из csv-файлов в базу данных SQLite для повторных запросов таблицы и статистики
+
+    :return:
+    """
+    name = input('Введите название файла: ')
+    database_name = input('Введите название базы данных: ')
+    file_names = get_input_files(name)
+    if len(file_names) == 0:
         print('Пустой файл')
     else:
-        data = DataSet(csv_file.name, [])
-        info = data.read_file()
-        data.vacancies_objects = data.get_reformed_file(info[1], info[0])
-        csv_file.print_vacancies_info(data.vacancies_objects, 'report.pdf')
+        with profiler.span('Загрузка в базу данных') as stage, VacanciesDatabase(database_name) as database:
+            stage['rows'] = database.import_files(file_names, currency_to_rub)
+        print(f"Загружено вакансий: {stage['rows']}")
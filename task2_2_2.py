@@ -1,12 +1,76 @@
-from task1_5_2 import get_vacancies_table
-from task2_1_3 import get_statistics
+import argparse
+import os
+from task1_5_2 import get_vacancies_table, build_columnar_store, title_translations1
+from task2_1_3 import get_statistics, get_cube_slice, append_statistics, import_vacancies, get_grouped_statistics
+from deduplication import dedup_columns
+from instrumentation import profiler
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--dedup', nargs='?', const=', '.join(dedup_columns), default=None,
+                    help='удалять повторяющиеся вакансии по колонкам, перечисленным через ", "')
+parser.add_argument('--bloom-capacity', type=int, default=None,
+                    help='ожидаемое количество вакансий для удаления повторов фильтром Блума')
+parser.add_argument('--profile', action='store_true',
+                    help='вывести время, количество строк и пиковую память этапов (или VACANCIES_PROFILE=1)')
+parser.add_argument('--profile-json', default=os.environ.get('VACANCIES_PROFILE_JSON'),
+                    help='сохранить замеры этапов в JSON-файл (или VACANCIES_PROFILE_JSON)')
+parser.add_argument('--reader', choices=['csv', 'mmap'], default='csv',
+                    help='способ чтения csv-файла для статистики: csv.reader или отображение в память')
+parser.add_argument('--workers', type=int, default=1,
+                    help='количество процессов для чтения нескольких файлов (каталог, шаблон или список через ", ") '
+                         'и для очистки строк одного файла')
+parser.add_argument('--output', default=None,
+                    help='выгрузить таблицу вакансий или группы построчно в файл .csv или .jsonl '
+                         '("-" - стандартный вывод, csv) вместо печати')
+parser.add_argument('--sort', choices=['Оклад', 'Дата публикации вакансии', 'Название', 'Навыки'], default=None,
+                    help='сортировать таблицу вакансий по окладу в рублях, дате публикации, названию или числу навыков')
+parser.add_argument('--descending', action='store_true', help='сортировать таблицу вакансий по убыванию')
+parser.add_argument('--sample', type=int, default=None,
+                    help='приближённая статистика по случайной выборке из указанного количества вакансий '
+                         'с доверительными интервалами')
+parser.add_argument('--excel', action='store_true',
+                    help='сохранить таблицы отчёта статистики и в report.xlsx')
+parser.add_argument('--group-memory', type=int, default=256,
+                    help='бюджет памяти группировки в МБ; при превышении частичные агрегаты сбрасываются на диск')
+args = parser.parse_args()
+if args.dedup is not None:
+    unknown_columns = [column for column in args.dedup.split(', ') if column not in title_translations1 or column == '№']
+    if len(unknown_columns) != 0:
+        parser.error(f"неизвестные колонки --dedup: {', '.join(unknown_columns)} (колонки перечисляются через \", \")")
+if args.bloom_capacity is not None and args.bloom_capacity < 1:
+    parser.error('ёмкость --bloom-capacity должна быть положительной')
+if args.workers < 1:
+    parser.error('количество процессов --workers должно быть не меньше 1')
+if args.group_memory < 1:
+    parser.error('бюджет памяти --group-memory должен быть не меньше 1 МБ')
+if args.sample is not None and args.sample < 2:
+    parser.error('размер выборки --sample должен быть не меньше 2')
+profiler.enabled = profiler.enabled or args.profile or args.profile_json is not None
+dataset_options = {'dedup_columns': None if args.dedup is None else args.dedup.split(', '),
+                   'bloom_capacity': args.bloom_capacity, 'backend': args.reader}
 
 request = input()
 
 #ветка main
 
-if request == 'Вакансии':
-    get_vacancies_table()
-elif request == 'Статистика':
-    get_statistics()
+with profiler.span(request):
+    if request == 'Вакансии':
+        get_vacancies_table(args.workers, args.output, args.sort, args.descending)
+    elif request == 'Статистика':
+        get_statistics(dataset_options, args.workers, args.sample, args.excel)
+    elif request == 'Срез':
+        get_cube_slice(dataset_options, args.workers)
+    elif request == 'Дополнение':
+        append_statistics(dataset_options, args.workers, args.excel)
+    elif request == 'Импорт':
+        import_vacancies()
+    elif request == 'Колонки':
+        build_columnar_store()
+    elif request == 'Группировка':
+        get_grouped_statistics(dataset_options, args.workers, args.group_memory * 1024 * 1024, args.output)
+
+if profiler.enabled:
+    profiler.print_table()
+    if args.profile_json is not None:
+        profiler.export_json(args.profile_json)
 
@@ -0,0 +1,55 @@
+import pytest
+from columnar_store import ColumnarStore
+from task1_5_2 import get_store_filter, parse_filter_string
+
+column_names = ['name', 'salary_from', 'salary_to', 'area_name', 'published_at']
+areas = ['Москва', 'Казань', 'Пермь', 'Омск']
+
+
+def get_rows(count: int = 1000) -> list:
+    """
+    Возвращает очищенные вакансии, упорядоченные по окладу и дате, с городом, меняющимся каждые 250 строк
+
+    :param count: Количество вакансий
+    :type count: int
+
+    :return: Список словарей вакансий
+    """
+    return [{'name': f"Программист {i}", 'salary_from': f"{10000 + i * 100}.0", 'salary_to': f"{15000 + i * 100}.0",
+             'area_name': areas[i * len(areas) // count], 'published_at': f"2022-{i // 100 + 1:02}-05T10:00:00+0300"}
+            for i in range(count)]
+
+
+@pytest.mark.parametrize('filter_parameter', ['Оклад: 60000', 'Название региона: Пермь',
+                                              'Дата публикации вакансии: 05.03.2022'])
+def test_zone_maps_skip_chunks(tmp_path, filter_parameter):
+    rows = get_rows()
+    store_name = str(tmp_path / 'vacancies.columns')
+    assert ColumnarStore.write(store_name, 'vacancies.csv', column_names, rows, chunk_size=100) == len(rows)
+    reformed = parse_filter_string(filter_parameter)
+    filter_columns, row_filter, chunk_filter = get_store_filter(column_names, filter_parameter, reformed)
+    expected = [row for row in rows if row_filter([row[column] for column in filter_columns])]
+    stats = {}
+    with ColumnarStore(store_name) as store:
+        assert list(store.iter_rows(filter_columns, row_filter, chunk_filter, stats)) == expected
+    # блоки по 100 строк: подходящие строки лежат в одном-трёх блоках, остальные пропускаются по зональной карте
+    assert 0 < len(expected) and stats['read'] <= 3
+    assert stats['skipped'] + stats['read'] == 10
+
+
+def test_chunks_without_zone_are_read(tmp_path):
+    rows = get_rows()
+    # оклад не число: у блока нет диапазона окладов, и он читается при любом фильтре по окладу
+    rows[150]['salary_from'] = 'нет'
+    store_name = str(tmp_path / 'vacancies.columns')
+    ColumnarStore.write(store_name, 'vacancies.csv', column_names, rows, chunk_size=100)
+    filter_parameter = 'Оклад: 80000'
+    reformed = parse_filter_string(filter_parameter)
+    filter_columns, row_filter, chunk_filter = get_store_filter(column_names, filter_parameter, reformed)
+    stats = {}
+    with ColumnarStore(store_name) as store:
+        assert store.chunks[1]['zones']['salary_from'] is None
+        vacancies = list(store.iter_rows(filter_columns, lambda values: 'нет' not in values and row_filter(values),
+                                         chunk_filter, stats))
+    assert [vac['name'] for vac in vacancies] == [f"Программист {i}" for i in range(650, 701)]
+    assert stats == {'skipped': 7, 'read': 3}
@@ -0,0 +1,27 @@
+import random
+from deduplication import BloomFilter, FingerprintSet
+
+
+def test_bloom_filter_false_positive_rate():
+    generator = random.Random(0)
+    capacity = 10000
+    bloom = BloomFilter(capacity, 0.01)
+    for _ in range(capacity):
+        bloom.add(generator.getrandbits(64))
+    bits = bytes(bloom.bits)
+    false_positives_count = 0
+    probes_count = 20000
+    for _ in range(probes_count):
+        false_positives_count += not bloom.add(generator.getrandbits(64))
+        # новый отпечаток не должен заполнять фильтр сверх capacity, поэтому биты восстанавливаются
+        bloom.bits[:] = bits
+    assert false_positives_count / probes_count < 0.02
+
+
+def test_fingerprint_set_is_exact():
+    generator = random.Random(0)
+    fingerprints = [generator.getrandbits(64) | 1 for _ in range(50000)]
+    exact = FingerprintSet()
+    assert all(exact.add(fingerprint) for fingerprint in fingerprints)
+    assert not any(exact.add(fingerprint) for fingerprint in fingerprints)
+    assert len(exact) == len(set(fingerprints))
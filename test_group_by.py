@@ -0,0 +1,106 @@
+import random
+from group_by import GroupAggregator
+
+
+def get_stream(rows_count: int = 20000, keys_count: int = 3000, seed: int = 0) -> list:
+    """
+    Возвращает воспроизводимый поток пар (ключ, агрегаты одной вакансии)
+
+    :param rows_count: Количество вакансий
+    :type rows_count: int
+
+    :param keys_count: Количество различных работодателей
+    :type keys_count: int
+
+    :param seed: Начальное значение генератора
+    :type seed: int
+
+    :return: Список пар (ключ, [сумма, количество, минимум, максимум])
+    """
+    generator = random.Random(seed)
+    stream = []
+    for _ in range(rows_count):
+        salary = generator.randint(10000, 500000)
+        key = (f"ООО Фирма {generator.randrange(keys_count)}", generator.randint(2007, 2022))
+        stream.append((key, [salary, 1, salary, salary]))
+    return stream
+
+
+def get_expected(stream: list) -> dict:
+    """
+    Считает группы потока в памяти без ограничений
+
+    :param stream: Список пар (ключ, агрегаты)
+    :type stream: list
+
+    :return: Словарь: ключ -> [сумма, количество, минимум, максимум]
+    """
+    groups = {}
+    for key, (salary_sum, count, salary_min, salary_max) in stream:
+        cell = groups.setdefault(key, [0, 0, salary_min, salary_max])
+        cell[0] += salary_sum
+        cell[1] += count
+        cell[2] = min(cell[2], salary_min)
+        cell[3] = max(cell[3], salary_max)
+    return groups
+
+
+def aggregate(stream: list, memory_budget: int, partitions_count: int = 16) -> GroupAggregator:
+    """
+    Группирует поток с ограничением памяти
+
+    :param stream: Список пар (ключ, агрегаты)
+    :type stream: list
+
+    :param memory_budget: Бюджет памяти на группы в байтах
+    :type memory_budget: int
+
+    :param partitions_count: Количество разделов при сбросе на диск
+    :type partitions_count: int
+
+    :return: Объект класса GroupAggregator с добавленными группами
+    """
+    aggregator = GroupAggregator(memory_budget, partitions_count)
+    for key, measures in stream:
+        aggregator.add(key, measures)
+    return aggregator
+
+
+def test_groups_in_memory():
+    stream = get_stream()
+    aggregator = aggregate(stream, 1 << 30)
+    assert aggregator.spills_count == 0
+    assert dict(aggregator.items()) == get_expected(stream)
+
+
+def test_spill_to_disk():
+    stream = get_stream()
+    aggregator = aggregate(stream, 64 * 1024)
+    assert aggregator.spills_count > 0
+    groups = list(aggregator.items())
+    assert len(groups) == len({key for key, _ in groups})
+    assert dict(groups) == get_expected(stream)
+
+
+def test_repartition_of_large_partition():
+    stream = get_stream()
+    aggregator = aggregate(stream, 16 * 1024, partitions_count=2)
+    spills_count = aggregator.spills_count
+    # раздел из половины групп не помещается в бюджет и делится дальше с другим хешем
+    groups = dict(aggregator.items())
+    assert aggregator.spills_count > spills_count
+    assert groups == get_expected(stream)
+
+
+def test_ordered_merge_of_partitions():
+    stream = get_stream()
+    expected = get_expected(stream)
+    groups = list(aggregate(stream, 16 * 1024, partitions_count=4).items(ordered=True))
+    assert [key for key, _ in groups] == sorted(expected)
+    assert dict(groups) == expected
+
+
+def test_ordered_groups_without_spills():
+    stream = get_stream(rows_count=1000)
+    groups = list(aggregate(stream, 1 << 30).items(ordered=True))
+    assert groups == sorted(get_expected(stream).items())
@@ -0,0 +1,47 @@
+import random
+from collections import Counter
+from heavy_hitters import SpaceSaving
+
+
+def get_zipf_stream(count: int = 100000, items_count: int = 5000, seed: int = 0) -> list:
+    """
+    Возвращает воспроизводимый поток навыков с частотами по закону Ципфа
+
+    :param count: Длина потока
+    :type count: int
+
+    :param items_count: Количество различных навыков
+    :type items_count: int
+
+    :param seed: Начальное значение генератора
+    :type seed: int
+
+    :return: Список навыков
+    """
+    generator = random.Random(seed)
+    items = [f"Навык {i}" for i in range(items_count)]
+    return generator.choices(items, weights=[1 / (i + 1) for i in range(items_count)], k=count)
+
+
+def test_space_saving_overestimate_within_error():
+    stream = get_zipf_stream()
+    sketch = SpaceSaving(200)
+    for skill in stream:
+        sketch.add(skill)
+    frequencies = Counter(stream)
+    assert sketch.total == len(stream)
+    for skill, count in sketch.counts.items():
+        assert frequencies[skill] <= count <= frequencies[skill] + sketch.errors[skill]
+        assert sketch.errors[skill] <= len(stream) / sketch.capacity
+    # любой элемент с частотой больше total / capacity присутствует в скетче
+    for skill, frequency in frequencies.items():
+        if frequency > len(stream) / sketch.capacity:
+            assert skill in sketch.counts
+
+
+def test_space_saving_top_matches_exact_top():
+    stream = get_zipf_stream()
+    sketch = SpaceSaving(500)
+    for skill in stream:
+        sketch.add(skill)
+    assert list(sketch.get_top(5)) == [skill for skill, _ in Counter(stream).most_common(5)]
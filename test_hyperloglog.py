@@ -0,0 +1,20 @@
+from hyperloglog import HyperLogLog
+
+
+def test_hyperloglog_relative_error():
+    for distinct_count in (100, 10000, 200000):
+        counter = HyperLogLog(12)
+        for i in range(distinct_count):
+            counter.add(f"ООО Фирма {i}")
+            counter.add(f"ООО Фирма {i // 2}")
+        # при 4096 регистрах стандартная ошибка около 1.6%
+        assert abs(counter.count() - distinct_count) / distinct_count < 0.05
+
+
+def test_hyperloglog_merge_matches_single_counter():
+    single, first, second = HyperLogLog(10), HyperLogLog(10), HyperLogLog(10)
+    for i in range(50000):
+        single.add(str(i))
+        (first if i % 3 else second).add(str(i))
+    first.merge(second)
+    assert first.count() == single.count()
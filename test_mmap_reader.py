@@ -0,0 +1,72 @@
+import csv
+import random
+import task2_1_3
+from mmap_reader import MappedCsvReader
+from task2_1_3 import DataSet
+
+column_names = ['name', 'description', 'key_skills', 'experience_id', 'premium', 'employer_name', 'salary_from',
+                'salary_to', 'salary_gross', 'salary_currency', 'area_name', 'published_at']
+
+
+def write_vacancies(file_name: str, count: int = 300, seed: int = 0) -> list:
+    """
+    Записывает csv-файл с вакансиями, многие поля которых занимают несколько строк и содержат запятые и кавычки
+
+    :param file_name: Название файла
+    :type file_name: str
+
+    :param count: Количество вакансий
+    :type count: int
+
+    :param seed: Начальное значение генератора
+    :type seed: int
+
+    :return: Список записанных строк
+    """
+    generator = random.Random(seed)
+    rows = []
+    for i in range(count):
+        description = '\n'.join(f'Строка {j}, "цитата" {i}' for j in range(generator.randint(1, 5)))
+        rows.append([generator.choice(['Программист', 'Аналитик']), description,
+                     '\n'.join(generator.sample(['Git', 'SQL', 'Python', 'Excel'], 2)), 'noExperience', 'False',
+                     f'ООО "Фирма {i % 7}"', '100000.0', '' if i % 17 == 0 else '150000.0', 'False', 'RUR',
+                     generator.choice(['Москва', 'Казань']), f'2022-0{i % 9 + 1}-05T10:00:00+0300'])
+    with open(file_name, 'w', encoding='utf-8-sig', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(column_names)
+        writer.writerows(rows)
+    return rows
+
+
+def test_ranges_do_not_split_quoted_records(tmp_path):
+    file_name = str(tmp_path / 'vacancies.csv')
+    rows = write_vacancies(file_name)
+    expected = [row for row in rows if '' not in row]
+    with MappedCsvReader(file_name) as reader:
+        bounds = reader.get_row_bounds(reader.data_start, len(reader.map))
+        row_starts = {reader.data_start, len(reader.map)} | {next_start for _, next_start in bounds}
+        for parts_count in (2, 3, 7, 50, 1000):
+            ranges = reader.get_row_ranges(parts_count)
+            assert all(start in row_starts and end in row_starts for start, end in ranges)
+            assert [start for start, _ in ranges[1:]] == [end for _, end in ranges[:-1]]
+            assert [row for start, end in ranges for row in reader.read_rows(start, end)] == expected
+
+
+def test_parallel_ranges_match_sequential_reading(tmp_path, monkeypatch):
+    file_name = str(tmp_path / 'vacancies.csv')
+    write_vacancies(file_name)
+    # маленькие диапазоны, чтобы файл делился на много частей
+    monkeypatch.setattr(task2_1_3, 'range_bytes', 2048)
+    for dedup_columns in (None, ['employer_name', 'area_name']):
+        sequential = DataSet(file_name, [], dedup_columns=dedup_columns)
+        parallel = DataSet(file_name, [], dedup_columns=dedup_columns, backend='mmap')
+        expected = [(vac.name, vac.salary.salary_in_rub, fingerprint)
+                    for vacancies, fingerprints in sequential.get_vacancy_batches()
+                    for vac, fingerprint in zip(vacancies, fingerprints)]
+        batches = list(parallel.get_vacancy_batches(workers=2))
+        assert len(batches) > 2
+        assert [(vac.name, vac.salary.salary_in_rub, fingerprint) for vacancies, fingerprints in batches
+                for vac, fingerprint in zip(vacancies, fingerprints)] == expected
+        assert parallel.rejected_count == sequential.rejected_count
+        if dedup_columns is not None:
+            assert parallel.deduplicator.duplicates_count == sequential.deduplicator.duplicates_count > 0
@@ -0,0 +1,64 @@
+import csv
+import os
+from name_index import NameIndex, get_names_name
+from task1_5_2 import get_indexed_vacancies
+
+column_names = ['name', 'description', 'key_skills', 'salary_from', 'area_name']
+rows = [['Программист', 'Описание, "с кавычками"\nи переводом строки', 'Git\nSQL', '100000.0', 'Москва'],
+        ['Аналитик', 'Описание 2', 'SQL', '50000.0', 'Казань'],
+        ['Программист', 'Описание 3', '', '90000.0', 'Пермь'],
+        ['Программист Python', 'Описание 4', 'Python', '120000.0', 'Москва'],
+        ['Программист', 'Многострочное\r\nописание\n\nс пустой строкой', 'Excel', '130000.0', 'Омск']]
+
+
+def write_vacancies(file_name: str, vacancies: list) -> None:
+    """
+    Записывает csv-файл с вакансиями
+
+    :param file_name: Название файла
+    :type file_name: str
+
+    :param vacancies: Список строк вакансий
+    :type vacancies: list
+
+    :return:
+    """
+    with open(file_name, 'w', encoding='utf-8-sig', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(column_names)
+        writer.writerows(vacancies)
+
+
+def test_find_names_from_first_id():
+    name_index = NameIndex()
+    for name in ['Программист', 'Аналитик', 'Программист Python', 'Ведущий программист', 'Программист 1С']:
+        name_index.add(name)
+    assert name_index.find_names('Программист') == ['Программист', 'Программист Python', 'Программист 1С']
+    assert name_index.find_names('Программист', 2) == ['Программист Python', 'Программист 1С']
+    assert name_index.find_names('1С', 3) == ['Программист 1С']
+
+
+def test_index_reads_only_rows_with_name(tmp_path):
+    file_name = str(tmp_path / 'vacancies.csv')
+    write_vacancies(file_name, rows)
+    header, vacancies = get_indexed_vacancies(file_name, ['Название', 'Программист'])
+    assert header == column_names
+    # строка с пустой ячейкой не попадает в индекс, как и при чтении всего файла
+    assert vacancies == [rows[0], [value.replace('\r\n', '\n') for value in rows[4]]]
+    name_index = NameIndex.load(get_names_name(file_name), file_name)
+    assert name_index.rows_count == 4
+    assert len(name_index.row_offsets) == name_index.rows_count
+    assert get_indexed_vacancies(file_name, ['Название', 'Дизайнер']) == (column_names, [])
+
+
+def test_stale_index_is_rebuilt(tmp_path):
+    file_name = str(tmp_path / 'vacancies.csv')
+    write_vacancies(file_name, rows)
+    get_indexed_vacancies(file_name, ['Название', 'Аналитик'])
+    index_time = os.path.getmtime(get_names_name(file_name))
+    # смещения строк сдвигаются, поэтому индекс по старому файлу нельзя использовать
+    write_vacancies(file_name, [rows[3]] + rows)
+    os.utime(file_name, (index_time + 10, index_time + 10))
+    assert NameIndex.load(get_names_name(file_name), file_name) is None
+    assert get_indexed_vacancies(file_name, ['Название', 'Аналитик']) == (column_names, [rows[1]])
+    assert NameIndex.load(get_names_name(file_name), file_name).rows_count == 5
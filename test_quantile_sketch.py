@@ -0,0 +1,45 @@
+import random
+from bisect import bisect_left, bisect_right
+from quantile_sketch import QuantileSketch
+
+
+def get_salaries(count: int = 100000, seed: int = 0) -> list:
+    """
+    Возвращает воспроизводимый поток зарплат с тяжёлым правым хвостом
+
+    :param count: Количество зарплат
+    :type count: int
+
+    :param seed: Начальное значение генератора
+    :type seed: int
+
+    :return: Список зарплат
+    """
+    generator = random.Random(seed)
+    return [round(generator.lognormvariate(11, 0.5), -2) for _ in range(count)]
+
+
+def test_quantile_sketch_rank_error():
+    salaries = get_salaries()
+    sketch = QuantileSketch(seed=0)
+    for salary in salaries:
+        sketch.add(salary)
+    ordered = sorted(salaries)
+    fractions = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+    for fraction, value in zip(fractions, sketch.get_quantiles(fractions)):
+        # у повторяющихся значений ранг - интервал, ошибка считается до ближайшего его конца
+        low_rank, high_rank = bisect_left(ordered, value) / len(ordered), bisect_right(ordered, value) / len(ordered)
+        assert low_rank - 0.02 <= fraction <= high_rank + 0.02
+    assert sketch.count == len(salaries)
+
+
+def test_quantile_sketch_merge_rank_error():
+    salaries = get_salaries()
+    sketches = [QuantileSketch(seed=0), QuantileSketch(seed=1)]
+    for i, salary in enumerate(salaries):
+        sketches[i % 2].add(salary)
+    sketches[0].merge(sketches[1])
+    ordered = sorted(salaries)
+    median = sketches[0].get_quantile(0.5)
+    low_rank, high_rank = bisect_left(ordered, median) / len(ordered), bisect_right(ordered, median) / len(ordered)
+    assert low_rank - 0.02 <= 0.5 <= high_rank + 0.02
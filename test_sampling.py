@@ -0,0 +1,58 @@
+import random
+from sampling import ReservoirSampler, get_fraction_interval, get_mean_interval
+
+
+def test_small_stream_is_kept_whole():
+    sampler = ReservoirSampler(10, seed=0)
+    sampler.sample(range(7))
+    assert sampler.items == list(range(7))
+    assert sampler.seen_count == 7
+
+
+def test_sample_continues_across_streams():
+    sampler = ReservoirSampler(10, seed=0)
+    sampler.sample(range(50))
+    sampler.sample(range(50, 1000))
+    assert sampler.seen_count == 1000
+    assert len(set(sampler.items)) == 10 and all(0 <= item < 1000 for item in sampler.items)
+
+
+def test_reservoir_is_uniform():
+    runs_count, stream_length, size = 3000, 100, 10
+    hits = [0] * stream_length
+    for seed in range(runs_count):
+        sampler = ReservoirSampler(size, seed=seed)
+        sampler.sample(range(stream_length))
+        for item in sampler.items:
+            hits[item] += 1
+    # каждая строка попадает в выборку с вероятностью size / stream_length: 300 раз, стандартное отклонение около 16
+    expected = runs_count * size / stream_length
+    assert all(abs(count - expected) < 80 for count in hits)
+    # строки начала и конца потока попадают в выборку одинаково часто
+    assert abs(sum(hits[:50]) - sum(hits[50:])) < 0.05 * runs_count * size
+
+
+def test_confidence_intervals_cover_population_values():
+    generator = random.Random(0)
+    salaries = [round(generator.lognormvariate(11, 0.5), -2) for _ in range(20000)]
+    mean = sum(salaries) / len(salaries)
+    share = sum(salary > 80000 for salary in salaries) / len(salaries)
+    runs_count, size = 300, 500
+    mean_hits = share_hits = 0
+    for seed in range(runs_count):
+        sampler = ReservoirSampler(size, seed=seed)
+        sampler.sample(salaries)
+        low, high = get_mean_interval(sampler.items, size / len(salaries))
+        mean_hits += low <= mean <= high
+        low, high = get_fraction_interval(sum(salary > 80000 for salary in sampler.items), size,
+                                          size / len(salaries))
+        share_hits += low <= share <= high
+    # 95% интервалы: доля накрытий близка к 0.95
+    assert 0.9 <= mean_hits / runs_count <= 0.99
+    assert 0.9 <= share_hits / runs_count <= 0.99
+
+
+def test_interval_of_whole_population_has_zero_width():
+    assert get_mean_interval([1, 2, 3, 4], 1) == (2.5, 2.5)
+    assert get_fraction_interval(1, 4, 1) == (0.25, 0.25)
+    assert get_mean_interval([5]) is None and get_fraction_interval(0, 0) is None
@@ -0,0 +1,75 @@
+import random
+from math import prod
+from task2_1_3 import Vacancy
+from vacancies_cube import VacanciesCube, cube_dimensions
+from vacancies_sketches import VacanciesSketches
+from vacancies_state import VacanciesState
+
+
+def get_vacancies(count: int = 5000, seed: int = 0) -> list:
+    """
+    Возвращает воспроизводимый список вакансий с уникальными названиями
+
+    :param count: Количество вакансий
+    :type count: int
+
+    :param seed: Начальное значение генератора
+    :type seed: int
+
+    :return: Список объектов вакансий класса Vacancy
+    """
+    generator = random.Random(seed)
+    vacancies = []
+    for i in range(count):
+        salary_from = generator.randint(20, 200) * 1000
+        vacancies.append(Vacancy({
+            'name': f"{generator.choice(['Программист', 'Аналитик', 'Тестировщик'])} {i}",
+            'salary_from': str(salary_from), 'salary_to': str(salary_from + 20000), 'salary_gross': 'False',
+            'salary_currency': generator.choice(['RUR', 'USD']),
+            'area_name': generator.choice(['Москва', 'Казань', 'Пермь']),
+            'experience_id': generator.choice(['noExperience', 'between1And3']),
+            'premium': generator.choice(['True', 'False']), 'employer_name': f"ООО Фирма {i % 50}",
+            'key_skills': 'Git', 'published_at': f"{generator.randint(2019, 2022)}-0{generator.randint(1, 6)}-01"}))
+    return vacancies
+
+
+def test_cells_bounded_by_dimension_cardinalities():
+    vacancies = get_vacancies()
+    cube = VacanciesCube()
+    for vac in vacancies:
+        cube.add(vac)
+    cardinalities = [len(cube.get_values(dimension)) for dimension in cube_dimensions]
+    # 4 года * 6 месяцев * 3 города * 2 опыта * 2 валюты * 2 признака премиум; названия ячеек не множат
+    assert cardinalities == [4, 6, 3, 2, 2, 2]
+    assert len(cube.cells) <= prod(cardinalities) < len(vacancies)
+    assert sum(measures[1] for measures in cube.cells.values()) == len(vacancies)
+
+
+def test_roll_up_matches_direct_aggregation():
+    vacancies = get_vacancies()
+    cube = VacanciesCube()
+    for vac in vacancies:
+        cube.add(vac)
+    expected = {}
+    for vac in vacancies:
+        if vac.area_name == 'Москва':
+            salaries = expected.setdefault((vac.published_at,), [])
+            salaries.append(vac.salary.salary_in_rub)
+    by_year = cube.roll_up(['year'], {'area_name': 'Москва'})
+    assert by_year == {key: [sum(salaries), len(salaries), min(salaries), max(salaries)]
+                       for key, salaries in expected.items()}
+
+
+def test_job_totals_by_year():
+    vacancies = get_vacancies()
+    state = VacanciesState(sketches=VacanciesSketches())
+    state.sketches.add_job('Аналитик')
+    # названия профессии отбираются по индексу названий между пакетами, поэтому вакансии добавляются частями
+    for i in range(0, len(vacancies), 1000):
+        state.add_vacancies(vacancies[i:i + 1000])
+    expected = {}
+    for vac in vacancies:
+        if 'Аналитик' in vac.name:
+            expected.setdefault(vac.published_at, []).append(vac.salary.salary_in_rub)
+    assert state.sketches.jobs['Аналитик'][2] == {year: [sum(salaries), len(salaries), min(salaries), max(salaries)]
+                                                 for year, salaries in expected.items()}
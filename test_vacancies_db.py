@@ -0,0 +1,85 @@
+import csv
+import pytest
+from currency import currency_to_rub
+from task1_5_2 import csv_filer, get_database_condition, parse_filter_string, title_translations1
+from task2_1_3 import get_vacancies_state
+from vacancies_db import VacanciesDatabase, database_columns
+
+rows = [['Программист', 'Описание <b>1</b>', 'Git\nSQL', 'noExperience', 'True', 'ООО Фирма 1', '100000.0', '150000.0',
+         'False', 'RUR', 'Москва', '2022-05-05T10:00:00+0300'],
+        ['Аналитик', 'Описание 2', 'SQL', 'between1And3', 'False', 'ООО Фирма 2', '50000.0', '70000.0', 'True', 'RUR',
+         'Казань', '2022-05-05T12:00:00+0300'],
+        ['Программист Python', 'Описание 3', 'Python\nGit\nSQL', 'moreThan6', 'False', 'ООО Фирма 1', '2000.0',
+         '3000.0', 'False', 'USD', 'Москва', '2021-03-01T10:00:00+0300'],
+        ['Тестировщик', 'Описание 4', 'Git', 'noExperience', 'True', 'ООО Фирма 3', '100000.0', '120000.0', 'False',
+         'RUR', 'Пермь', '2020-01-10T10:00:00+0300'],
+        ['Программист', 'Описание 5', 'Excel', 'between3And6', 'False', 'ООО Фирма 2', '130000.0', '200000.0', 'True',
+         'RUR', 'Омск', '2022-05-06T10:00:00+0300']]
+# фильтр по каждой колонке таблицы и описания вакансий, которые он должен оставить
+filters = [('№: 5', ['Описание 1', 'Описание 2', 'Описание 3', 'Описание 4', 'Описание 5']),
+           ('Название: Программист', ['Описание 1', 'Описание 5']),
+           ('Описание: Описание 1', ['Описание 1']),
+           ('Навыки: Git, SQL', ['Описание 1', 'Описание 3']),
+           ('Опыт работы: Нет опыта', ['Описание 1', 'Описание 4']),
+           ('Премиум-вакансия: Да', ['Описание 1', 'Описание 4']),
+           ('Компания: ООО Фирма 1', ['Описание 1', 'Описание 3']),
+           (': 100000.0', ['Описание 1', 'Описание 4']),
+           ('Оклад: 120000', ['Описание 1', 'Описание 4']),
+           ('Оклад указан до вычета налогов: Да', ['Описание 2', 'Описание 5']),
+           ('Идентификатор валюты оклада: Рубли', ['Описание 1', 'Описание 2', 'Описание 3', 'Описание 4',
+                                                   'Описание 5']),
+           ('Идентификатор валюты оклада: USD', ['Описание 3']),
+           ('Название региона: Москва', ['Описание 1', 'Описание 3']),
+           ('Дата публикации вакансии: 05.05.2022', ['Описание 1', 'Описание 2'])]
+
+
+@pytest.fixture
+def database_name(tmp_path) -> str:
+    """
+    Записывает вакансии rows в csv-файл и загружает их в базу данных
+
+    :param tmp_path: Каталог для файлов
+    :type tmp_path: pathlib.Path
+
+    :return: Название файла базы данных
+    """
+    with open(tmp_path / 'vacancies.csv', 'w', encoding='utf-8-sig', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(database_columns)
+        writer.writerows(rows)
+    with VacanciesDatabase(str(tmp_path / 'vacancies.db')) as database:
+        database.import_files([str(tmp_path / 'vacancies.csv')], currency_to_rub)
+    return str(tmp_path / 'vacancies.db')
+
+
+def test_filters_cover_all_titles():
+    assert {filter_parameter.split(': ')[0] for filter_parameter, _ in filters} == set(title_translations1.values())
+
+
+@pytest.mark.parametrize('filter_parameter, expected', filters)
+def test_database_filter_matches_csv_filter(database_name, filter_parameter, expected):
+    reformed = parse_filter_string(filter_parameter)
+    descriptions = csv_filer([list(row) for row in rows], list(database_columns), filter_parameter, reformed)
+    # от отброшенных строк csv_filer оставляет только номер
+    assert [vac['description'] for vac in descriptions if len(vac) > 1] == expected
+    with VacanciesDatabase(database_name) as database:
+        vacancies = database.select_vacancies(*get_database_condition(reformed))
+    assert [vac['description'] for vac in vacancies] == expected
+
+
+def test_database_state_matches_csv_state(database_name, tmp_path):
+    database_state = get_vacancies_state(database_name, job_name='Программист')
+    csv_state = get_vacancies_state(str(tmp_path / 'vacancies.csv'), job_name='Программист')
+    assert database_state.cube.cells == csv_state.cube.cells
+    assert database_state.name_index.find_names('Программист') == csv_state.name_index.find_names('Программист')
+    assert database_state.sketches.skills_by_year[2022].counts == csv_state.sketches.skills_by_year[2022].counts
+    assert database_state.sketches.jobs['Программист'][1].counts == {'Git': 2, 'SQL': 2, 'Python': 1, 'Excel': 1}
+
+
+def test_database_state_is_saved_and_extended(database_name):
+    state = get_vacancies_state(database_name, job_name='Программист')
+    loaded = get_vacancies_state(database_name, job_name='Аналитик')
+    assert loaded.cube.cells == state.cube.cells
+    assert loaded.name_index.names == state.name_index.names
+    assert list(loaded.sketches.jobs) == ['Программист', 'Аналитик']
+    assert sum(sketch.count for sketch in loaded.sketches.jobs['Аналитик'][0].values()) == 1
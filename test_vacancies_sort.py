@@ -0,0 +1,56 @@
+import random
+import vacancies_sort
+from vacancies_sort import external_sort, sort_rows
+
+
+def get_rows(count: int = 5000, seed: int = 0) -> list:
+    """
+    Возвращает воспроизводимый поток строк таблицы вакансий с повторяющимися днями публикации
+
+    :param count: Количество строк
+    :type count: int
+
+    :param seed: Начальное значение генератора
+    :type seed: int
+
+    :return: Список словарей вакансий
+    """
+    generator = random.Random(seed)
+    return [{'№': i, 'name': f"Вакансия {generator.randrange(100)}", 'salary_from': '10000.0',
+             'salary_to': str(generator.randint(10000, 500000)), 'salary_currency': 'RUR', 'key_skills': 'Git',
+             'published_at': f"2022-0{generator.randint(1, 9)}-1{generator.randint(0, 9)}T"
+                             f"{generator.randint(10, 23)}:00:00+0300"}
+            for i in range(count)]
+
+
+def test_external_sort_spills_runs(monkeypatch):
+    rows = get_rows()
+    runs_count = 0
+    write_run = vacancies_sort.write_run
+
+    def count_runs(run):
+        nonlocal runs_count
+        runs_count += 1
+        return write_run(run)
+    monkeypatch.setattr(vacancies_sort, 'write_run', count_runs)
+    key = lambda row: int(row['salary_to'])
+    assert list(external_sort(rows, key, run_size=700)) == sorted(rows, key=key)
+    assert runs_count == len(rows) // 700 + 1
+    assert list(external_sort(rows, key, True, run_size=700)) == sorted(rows, key=key, reverse=True)
+
+
+def test_date_sort_keeps_order_within_day():
+    rows = get_rows()
+    # как и ORDER BY published_at, id в базе данных: по дню, а внутри дня - в исходном порядке
+    expected = sorted(rows, key=lambda row: (row['published_at'][:10], row['№']))
+    assert list(sort_rows(rows, 'Дата публикации вакансии', run_size=700)) == expected
+    descending = sorted(rows, key=lambda row: (row['published_at'][:10], -row['№']), reverse=True)
+    assert list(sort_rows(rows, 'Дата публикации вакансии', True, run_size=700)) == descending
+
+
+def test_top_rows_match_full_sort():
+    rows = get_rows()
+    full = list(sort_rows(rows, 'Оклад', True, run_size=700))
+    assert sort_rows(rows, 'Оклад', True, limit=25) == full[:25]
+    assert sort_rows(rows, 'Дата публикации вакансии', limit=25) == \
+        list(sort_rows(rows, 'Дата публикации вакансии', run_size=700))[:25]
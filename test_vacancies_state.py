@@ -0,0 +1,105 @@
+import csv
+import os
+from task2_1_3 import get_vacancies_state, add_delta_vacancies
+from vacancies_state import get_delta_name, get_state_name
+
+column_names = ['name', 'key_skills', 'experience_id', 'premium', 'employer_name', 'salary_from', 'salary_to',
+                'salary_gross', 'salary_currency', 'area_name', 'published_at']
+
+
+def write_vacancies(file_name: str, rows: list) -> None:
+    """
+    Записывает csv-файл с вакансиями
+
+    :param file_name: Название файла
+    :type file_name: str
+
+    :param rows: Список кортежей (название, город, нижняя граница оклада, дата публикации)
+    :type rows: list
+
+    :return:
+    """
+    with open(file_name, 'w', encoding='utf-8-sig', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(column_names)
+        for name, area_name, salary_from, published_at in rows:
+            writer.writerow([name, 'Git', 'noExperience', 'False', 'ООО Фирма', salary_from, salary_from + 10000,
+                             'False', 'RUR', area_name, published_at])
+
+
+def get_count(state) -> int:
+    """
+    Возвращает количество вакансий в кубе состояния
+
+    :param state: Состояние статистик
+    :type state: VacanciesState
+
+    :return: Количество вакансий
+    """
+    return sum(measures[1] for measures in state.cube.cells.values())
+
+
+base_rows = [('Программист', 'Москва', 100000, '2021-05-05T10:00:00+0300'),
+             ('Аналитик', 'Москва', 80000, '2021-06-05T10:00:00+0300'),
+             ('Программист', 'Казань', 90000, '2022-01-05T10:00:00+0300')]
+# первая строка отличается от вакансии файла только окладом и датой
+delta_rows = [('Программист', 'Москва', 150000, '2022-07-05T10:00:00+0300'),
+              ('Тестировщик', 'Пермь', 70000, '2022-07-06T10:00:00+0300')]
+
+
+def build_state(tmp_path, dedup_columns: list = None):
+    """
+    Строит состояние файла base_rows и дополняет его строками delta_rows
+
+    :param tmp_path: Каталог для файлов
+    :type tmp_path: pathlib.Path
+
+    :param dedup_columns: Колонки удаления повторов
+    :type dedup_columns: list
+
+    :return: Кортеж из названия csv-файла, состояния, количества прочитанных и добавленных вакансий
+    """
+    file_name, delta_name = str(tmp_path / 'base.csv'), str(tmp_path / 'new.csv')
+    write_vacancies(file_name, base_rows)
+    write_vacancies(delta_name, delta_rows)
+    state = get_vacancies_state(file_name, {'dedup_columns': dedup_columns})
+    rows_count, added_count = add_delta_vacancies(state, file_name, [delta_name], {})
+    return file_name, state, rows_count, added_count
+
+
+def test_append_skips_rows_with_same_dedup_key(tmp_path):
+    file_name, state, rows_count, added_count = build_state(tmp_path, ['name', 'area_name'])
+    assert (rows_count, added_count) == (2, 1)
+    assert get_count(state) == 4
+    assert os.path.exists(get_delta_name(file_name)) and os.path.exists(get_state_name(file_name))
+
+
+def test_append_without_dedup_compares_key_columns(tmp_path):
+    _, state, rows_count, added_count = build_state(tmp_path)
+    assert (rows_count, added_count) == (2, 2)
+    assert get_count(state) == 5
+
+
+def test_append_is_idempotent(tmp_path):
+    file_name, state, _, _ = build_state(tmp_path)
+    assert add_delta_vacancies(state, file_name, [str(tmp_path / 'new.csv')], {}) == (2, 0)
+    assert get_count(state) == 5
+
+
+def test_saved_state_is_reused(tmp_path):
+    file_name, state, _, _ = build_state(tmp_path, ['name', 'area_name'])
+    loaded = get_vacancies_state(file_name, {'dedup_columns': ['name', 'area_name']})
+    assert loaded.cube.cells == state.cube.cells
+    assert loaded.fingerprints == state.fingerprints
+
+
+def test_rebuild_keeps_delta_vacancies(tmp_path):
+    file_name, state, _, _ = build_state(tmp_path, ['name', 'area_name'])
+    # csv-файл изменился после дополнения: состояние строится заново по нему и по файлу дополнений
+    write_vacancies(file_name, base_rows + [('Дизайнер', 'Омск', 60000, '2022-02-05T10:00:00+0300')])
+    state_time = os.path.getmtime(get_state_name(file_name))
+    os.utime(file_name, (state_time + 10, state_time + 10))
+    rebuilt = get_vacancies_state(file_name, {'dedup_columns': ['name', 'area_name']})
+    assert get_count(rebuilt) == 5
+    assert state.fingerprints <= rebuilt.fingerprints
+    assert len(rebuilt.fingerprints - state.fingerprints) == 1
@@ -0,0 +1,146 @@
+import pickle
+
+# только малокардинальные измерения: с названием вакансии почти каждая строка попадала бы в свою ячейку;
+# статистики выбранной профессии копятся отдельно в VacanciesSketches
+cube_dimensions = ['year', 'month', 'area_name', 'experience_id', 'salary_currency', 'premium']
+
+
+class VacanciesCube:
+    """
+    Класс предагрегированного куба вакансий: суммы, количества, минимумы и максимумы зарплат в рублях
+    по всем сочетаниям измерений из cube_dimensions
+
+    :param cells: Словарь ячеек куба: кортеж значений измерений -> [сумма, количество, минимум, максимум]
+    :type cells: dict
+    """
+    def __init__(self, cells: dict = None):
+        """
+        Инициализирует объект класса VacanciesCube
+
+        :param cells: Словарь ячеек куба
+        :type cells: dict
+        """
+        self.cells = {} if cells is None else cells
+
+    def add(self, vacancy) -> None:
+        """
+        Добавляет вакансию в соответствующую ячейку куба
+
+        :param vacancy: Объект вакансии класса Vacancy
+        :type vacancy: Vacancy
+
+        :return:
+        """
+        key = (vacancy.published_at, vacancy.published_month, vacancy.area_name, vacancy.experience_id,
+               vacancy.salary.salary_currency, vacancy.premium)
+        self.add_cell(key, [vacancy.salary.salary_in_rub, 1, vacancy.salary.salary_in_rub,
+                            vacancy.salary.salary_in_rub])
+
+    def add_cell(self, key: tuple, measures: list) -> None:
+        """
+        Складывает агрегаты с ячейкой куба
+
+        :param key: Кортеж значений измерений
+        :type key: tuple
+
+        :param measures: Агрегаты [сумма, количество, минимум, максимум]
+        :type measures: list
+
+        :return:
+        """
+        cell = self.cells.get(key)
+        if cell is None:
+            self.cells[key] = list(measures)
+        else:
+            cell[0] += measures[0]
+            cell[1] += measures[1]
+            cell[2] = min(cell[2], measures[2])
+            cell[3] = max(cell[3], measures[3])
+
+    def merge(self, other) -> None:
+        """
+        Объединяет куб с другим кубом, построенным по другой части данных
+
+        :param other: Объединяемый куб
+        :type other: VacanciesCube
+
+        :return:
+        """
+        for key, measures in other.cells.items():
+            self.add_cell(key, measures)
+
+    def roll_up(self, dimensions: list, filters: dict = None) -> dict:
+        """
+        Сворачивает куб до указанных измерений, отбрасывая ячейки, не прошедшие фильтры
+
+        :param dimensions: Список измерений результата из cube_dimensions
+        :type dimensions: list
+
+        :param filters: Словарь фильтров: измерение -> значение или функция-предикат
+        :type filters: dict
+
+        :return: Словарь: кортеж значений измерений -> [сумма, количество, минимум, максимум]
+        """
+        indexes = [cube_dimensions.index(dimension) for dimension in dimensions]
+        conditions = [(cube_dimensions.index(dimension), condition)
+                      for dimension, condition in ({} if filters is None else filters).items()]
+        checked_values = {}
+        result = VacanciesCube()
+        for key, measures in self.cells.items():
+            if all(self.check_condition(key[index], condition, checked_values) for index, condition in conditions):
+                result.add_cell(tuple(key[index] for index in indexes), measures)
+        return result.cells
+
+    def check_condition(self, value, condition, checked_values: dict) -> bool:
+        """
+        Проверяет значение измерения по фильтру, запоминая результаты предикатов
+
+        :param value: Значение измерения
+        :param condition: Значение фильтра или функция-предикат
+        :param checked_values: Словарь уже проверенных пар (предикат, значение)
+        :type checked_values: dict
+
+        :return: Результат проверки
+        """
+        if not callable(condition):
+            return value == condition
+        if (condition, value) not in checked_values:
+            checked_values[(condition, value)] = condition(value)
+        return checked_values[(condition, value)]
+
+    def get_values(self, dimension: str) -> list:
+        """
+        Возвращает отсортированный список значений измерения
+
+        :param dimension: Название измерения из cube_dimensions
+        :type dimension: str
+
+        :return: Список значений измерения
+        """
+        index = cube_dimensions.index(dimension)
+        return sorted({key[index] for key in self.cells})
+
+    def save(self, file_name: str) -> None:
+        """
+        Сохраняет куб в файл
+
+        :param file_name: Название файла куба
+        :type file_name: str
+
+        :return:
+        """
+        with open(file_name, 'wb') as file:
+            pickle.dump(self.cells, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(file_name: str):
+        """
+        Загружает куб из файла
+
+        :param file_name: Название файла куба
+        :type file_name: str
+
+        :return: Объект класса VacanciesCube
+        """
+        with open(file_name, 'rb') as file:
+            return VacanciesCube(pickle.load(file))
@@ -0,0 +1,373 @@
+import csv
+import re
+import sqlite3
+from itertools import islice
+from compressed_input import open_vacancies_file
+from multi_input import select_files
+from group_by import group_dimensions
+
+sqlite_magic = b'SQLite format 3\x00'
+database_schema = '''
+CREATE TABLE vacancies (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    experience_id TEXT NOT NULL,
+    premium INTEGER NOT NULL,
+    employer_name TEXT NOT NULL,
+    salary_from REAL NOT NULL,
+    salary_to REAL NOT NULL,
+    salary_gross INTEGER NOT NULL,
+    salary_currency TEXT NOT NULL,
+    area_name TEXT NOT NULL,
+    published_at DATE NOT NULL
+);
+CREATE TABLE key_skills (
+    vacancy_id INTEGER NOT NULL REFERENCES vacancies (id),
+    position INTEGER NOT NULL,
+    skill TEXT NOT NULL,
+    PRIMARY KEY (vacancy_id, position)
+) WITHOUT ROWID;
+CREATE TABLE currency_rates (
+    code TEXT PRIMARY KEY,
+    rate REAL NOT NULL
+);
+'''
+database_indexes = '''
+CREATE INDEX vacancies_area_name ON vacancies (area_name);
+CREATE INDEX vacancies_published_at ON vacancies (published_at);
+CREATE INDEX vacancies_salary ON vacancies (salary_from, salary_to);
+CREATE INDEX vacancies_salary_to ON vacancies (salary_to);
+CREATE INDEX vacancies_name ON vacancies (name);
+CREATE INDEX key_skills_skill ON key_skills (skill, vacancy_id);
+'''
+database_columns = ['name', 'description', 'key_skills', 'experience_id', 'premium', 'employer_name', 'salary_from',
+                    'salary_to', 'salary_gross', 'salary_currency', 'area_name', 'published_at']
+boolean_columns = ['premium', 'salary_gross']
+order_expressions = {
+    'salary': '(CAST(salary_from AS INTEGER) + CAST(salary_to AS INTEGER)) / 2.0 * '
+              '(SELECT rate FROM currency_rates WHERE code = salary_currency)',
+    'published_at': 'published_at',
+    'name': 'name',
+    'skills_count': '(SELECT COUNT(*) FROM key_skills WHERE vacancy_id = vacancies.id)'
+}
+group_source = '''
+    (SELECT CAST(substr(published_at, 1, 4) AS INTEGER) AS year,
+            CAST(substr(published_at, 6, 2) AS INTEGER) AS month,
+            area_name, experience_id, salary_currency,
+            CASE premium WHEN 1 THEN 'True' ELSE 'False' END AS premium, name, employer_name,
+            (CAST(salary_from AS INTEGER) + CAST(salary_to AS INTEGER)) / 2.0 * rate AS salary_in_rub
+     FROM vacancies JOIN currency_rates ON code = salary_currency)'''
+
+
+def is_vacancies_database(file_name: str) -> bool:
+    """
+    Проверяет по первым байтам, является ли файл базой данных SQLite
+
+    :param file_name: Название файла
+    :type file_name: str
+
+    :return: True для базы данных SQLite
+    """
+    try:
+        with open(file_name, 'rb') as file:
+            return file.read(len(sqlite_magic)) == sqlite_magic
+    except OSError:
+        return False
+
+
+def clean_value(value: str) -> str:
+    """
+    Очищает значение ячейки так же, как таблица вакансий: убирает HTML-теги и лишние пробелы
+
+    :param value: Значение ячейки csv-файла
+    :type value: str
+
+    :return: Очищенное значение
+    """
+    value = re.sub(r'\<[^>]*\>', '', value)
+    if value.count('\n') != 0:
+        value = ", ".join(value.split("\n"))
+    return ' '.join(value.split())
+
+
+class VacanciesDatabase:
+    """
+    Класс базы данных SQLite с очищенными вакансиями, навыками в отдельной таблице и индексами
+    для фильтров таблицы вакансий и группировок статистики
+
+    :param connection: Соединение с базой данных
+    :type connection: Connection
+    """
+    def __init__(self, file_name: str):
+        """
+        Инициализирует объект класса VacanciesDatabase
+
+        :param file_name: Название файла базы данных
+        :type file_name: str
+        """
+        self.connection = sqlite3.connect(file_name)
+
+    def import_files(self, file_names: list, currency_rates: dict, batch_size: int = 5000) -> int:
+        """
+        Заменяет содержимое базы вакансиями из csv-файлов: строки вставляются пакетами executemany
+        в одной транзакции, а индексы строятся после загрузки; файлы без колонок database_columns
+        пропускаются с сообщением
+
+        :param file_names: Список названий csv-файлов
+        :type file_names: list
+
+        :param currency_rates: Словарь курсов валют к рублю
+        :type currency_rates: dict
+
+        :param batch_size: Количество строк в пакете вставки
+        :type batch_size: int
+
+        :return: Количество загруженных вакансий
+        """
+        connection = self.connection
+        with connection:
+            for table in ('key_skills', 'vacancies', 'currency_rates'):
+                connection.execute(f"DROP TABLE IF EXISTS {table}")
+            connection.executescript(database_schema)
+        vacancy_id = 0
+        with connection:
+            connection.executemany('INSERT INTO currency_rates VALUES (?, ?)', currency_rates.items())
+            for file_name in select_files(file_names, database_columns):
+                with open_vacancies_file(file_name) as file:
+                    reader = csv.reader(file)
+                    column_names = next(reader, [])
+                    indexes = [column_names.index(column) for column in database_columns]
+                    rows = (row for row in reader if len(row) == len(column_names) and row.count('') == 0)
+                    batch = list(islice(rows, batch_size))
+                    while len(batch) != 0:
+                        vacancies, skills = self.get_import_rows(batch, indexes, vacancy_id)
+                        connection.executemany(f"INSERT INTO vacancies VALUES ({', '.join('?' * 12)})", vacancies)
+                        connection.executemany('INSERT INTO key_skills VALUES (?, ?, ?)', skills)
+                        vacancy_id += len(batch)
+                        batch = list(islice(rows, batch_size))
+            connection.executescript(database_indexes)
+        connection.execute('ANALYZE')
+        return vacancy_id
+
+    @staticmethod
+    def get_import_rows(batch: list, indexes: list, first_id: int) -> tuple:
+        """
+        Преобразует пакет строк csv-файла в типизированные строки таблиц vacancies и key_skills
+
+        :param batch: Пакет строк csv-файла
+        :type batch: list
+
+        :param indexes: Индексы колонок database_columns в строке
+        :type indexes: list
+
+        :param first_id: Идентификатор, предшествующий первой вакансии пакета
+        :type first_id: int
+
+        :return: Кортеж из списков строк вакансий и навыков
+        """
+        vacancies = []
+        skills = []
+        for vacancy_id, row in enumerate(batch, first_id + 1):
+            values = dict(zip(database_columns, (row[index] for index in indexes)))
+            skills.extend((vacancy_id, position, ' '.join(skill.split()))
+                          for position, skill in enumerate(re.sub(r'\<[^>]*\>', '', values['key_skills']).split('\n')))
+            vacancies.append((vacancy_id, clean_value(values['name']), clean_value(values['description']),
+                              values['experience_id'], int(values['premium'] == 'True'),
+                              clean_value(values['employer_name']), float(values['salary_from']),
+                              float(values['salary_to']), int(values['salary_gross'] == 'True'),
+                              values['salary_currency'], clean_value(values['area_name']),
+                              values['published_at'][:10]))
+        return vacancies, skills
+
+    def has_vacancies(self) -> bool:
+        """
+        Проверяет, есть ли в базе вакансии
+
+        :return: True, если таблица вакансий не пуста
+        """
+        return self.connection.execute('SELECT EXISTS (SELECT 1 FROM vacancies)').fetchone()[0] == 1
+
+    def select_vacancies(self, condition: str = '', parameters: tuple = (), limit: int = -1, offset: int = 0,
+                         order: str = None, descending: bool = False):
+        """
+        Выбирает страницу вакансий в порядке загрузки по условию WHERE
+
+        :param condition: Условие SQL без слова WHERE; пустая строка - без фильтра
+        :type condition: str
+
+        :param parameters: Параметры условия
+        :type parameters: tuple
+
+        :param limit: Количество вакансий на странице; -1 - без ограничения
+        :type limit: int
+
+        :param offset: Количество пропускаемых вакансий
+        :type offset: int
+
+        :param order: Ключ сортировки из order_expressions; None - порядок загрузки
+        :type order: str
+
+        :param descending: Сортировка по убыванию
+        :type descending: bool
+
+        :return: Список словарей вакансий с колонками database_columns (строковые значения, как в csv-файле)
+        """
+        return list(self.iter_vacancies(condition, parameters, limit, offset, order, descending))
+
+    def iter_vacancies(self, condition: str = '', parameters: tuple = (), limit: int = -1, offset: int = 0,
+                       order: str = None, descending: bool = False, batch_size: int = 1000):
+        """
+        Генератор вакансий по условию WHERE: результат запроса читается пакетами fetchmany,
+        а навыки запрашиваются для каждого пакета, поэтому в памяти не больше batch_size вакансий
+
+        :param condition: Условие SQL без слова WHERE; пустая строка - без фильтра
+        :type condition: str
+
+        :param parameters: Параметры условия
+        :type parameters: tuple
+
+        :param limit: Количество вакансий; -1 - без ограничения
+        :type limit: int
+
+        :param offset: Количество пропускаемых вакансий
+        :type offset: int
+
+        :param order: Ключ сортировки из order_expressions; None - порядок загрузки
+        :type order: str
+
+        :param descending: Сортировка по убыванию; равные по ключу вакансии остаются в порядке загрузки
+        :type descending: bool
+
+        :param batch_size: Количество вакансий в пакете
+        :type batch_size: int
+
+        :return: Генератор словарей вакансий с колонками database_columns (строковые значения, как в csv-файле)
+        """
+        columns = [column for column in database_columns if column != 'key_skills']
+        cursor = self.connection.execute(f"SELECT id, {', '.join(columns)} FROM vacancies "
+                                         f"{'WHERE ' + condition if condition != '' else ''} "
+                                         f"ORDER BY {self.get_order(order, descending)} LIMIT ? OFFSET ?",
+                                         parameters + (limit, offset))
+        rows = cursor.fetchmany(batch_size)
+        while len(rows) != 0:
+            skills = self.get_skills([row[0] for row in rows])
+            for row in rows:
+                values = dict(zip(columns, row[1:]))
+                yield {column: '# '.join(skills.get(row[0], [])) if column == 'key_skills' else
+                       ('Да' if values[column] else 'Нет') if column in boolean_columns else
+                       str(values[column]) for column in database_columns}
+            rows = cursor.fetchmany(batch_size)
+
+    def iter_rows(self, columns: list, condition: str = '', parameters: tuple = (), batch_size: int = 5000):
+        """
+        Генератор пакетов строк вакансий в порядке загрузки со значениями в формате csv-файла:
+        логические колонки - 'True' и 'False', навыки разделены переводами строк
+
+        :param columns: Список колонок строки из database_columns
+        :type columns: list
+
+        :param condition: Условие SQL без слова WHERE; пустая строка - без фильтра
+        :type condition: str
+
+        :param parameters: Параметры условия
+        :type parameters: tuple
+
+        :param batch_size: Количество строк в пакете
+        :type batch_size: int
+
+        :return: Генератор списков строк
+        """
+        selected = [column for column in columns if column != 'key_skills']
+        cursor = self.connection.execute(f"SELECT id, {', '.join(selected)} FROM vacancies "
+                                         f"{'WHERE ' + condition if condition != '' else ''} ORDER BY id", parameters)
+        rows = cursor.fetchmany(batch_size)
+        while len(rows) != 0:
+            skills = self.get_skills([row[0] for row in rows]) if 'key_skills' in columns else {}
+            batch = []
+            for row in rows:
+                values = dict(zip(selected, row[1:]))
+                batch.append(['\n'.join(skills.get(row[0], [])) if column == 'key_skills' else
+                              str(values[column] == 1) if column in boolean_columns else
+                              str(values[column]) for column in columns])
+            yield batch
+            rows = cursor.fetchmany(batch_size)
+
+    @staticmethod
+    def get_order(order: str = None, descending: bool = False) -> str:
+        """
+        Возвращает выражение ORDER BY для ключа сортировки
+
+        :param order: Ключ сортировки из order_expressions; None - порядок загрузки
+        :type order: str
+
+        :param descending: Сортировка по убыванию
+        :type descending: bool
+
+        :return: Выражение сортировки; при равных ключах вакансии идут в порядке загрузки
+        """
+        if order is None:
+            return 'id'
+        return f"{order_expressions[order]} {'DESC' if descending else 'ASC'}, id"
+
+    def get_skills(self, vacancy_ids: list, batch_size: int = 500) -> dict:
+        """
+        Возвращает навыки вакансий в исходном порядке
+
+        :param vacancy_ids: Список идентификаторов вакансий
+        :type vacancy_ids: list
+
+        :param batch_size: Количество идентификаторов в одном запросе
+        :type batch_size: int
+
+        :return: Словарь: идентификатор вакансии -> список навыков
+        """
+        skills = {}
+        for start in range(0, len(vacancy_ids), batch_size):
+            batch = vacancy_ids[start:start + batch_size]
+            for vacancy_id, skill in self.connection.execute(
+                    f"SELECT vacancy_id, skill FROM key_skills WHERE vacancy_id IN ({', '.join('?' * len(batch))}) "
+                    f"ORDER BY vacancy_id, position", batch):
+                skills.setdefault(vacancy_id, []).append(skill)
+        return skills
+
+    def iter_groups(self, dimensions: list, batch_size: int = 1000):
+        """
+        Генератор групп вакансий по произвольным измерениям: группировку и сортировку делает SQLite,
+        которая сама сбрасывает промежуточные данные во временные файлы, а результат читается пакетами
+
+        :param dimensions: Список измерений из group_dimensions
+        :type dimensions: list
+
+        :param batch_size: Количество групп в пакете
+        :type batch_size: int
+
+        :return: Генератор пар (кортеж значений измерений, [сумма, количество, минимум, максимум])
+            в порядке возрастания ключей
+        """
+        if any(dimension not in group_dimensions for dimension in dimensions):
+            raise ValueError('Измерение группировки некорректно')
+        columns = ', '.join(dimensions)
+        cursor = self.connection.execute(f'''
+            SELECT {columns}, SUM(salary_in_rub), COUNT(*), MIN(salary_in_rub), MAX(salary_in_rub)
+            FROM {group_source}
+            GROUP BY {columns} ORDER BY {columns}''')
+        rows = cursor.fetchmany(batch_size)
+        while len(rows) != 0:
+            for row in rows:
+                yield row[:len(dimensions)], list(row[len(dimensions):])
+            rows = cursor.fetchmany(batch_size)
+
+    def close(self) -> None:
+        """
+        Закрывает соединение с базой данных
+
+        :return:
+        """
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,126 @@
+import argparse
+import csv
+import random
+from itertools import accumulate
+from currency import currency_to_rub
+
+vacancies_columns = ['name', 'description', 'key_skills', 'experience_id', 'premium', 'employer_name', 'salary_from',
+                     'salary_to', 'salary_gross', 'salary_currency', 'area_name', 'published_at']
+generator_professions = ['Программист', 'Python-разработчик', 'Java-разработчик', 'Frontend-разработчик',
+                         'Аналитик данных', 'Системный администратор', 'Тестировщик', 'Менеджер по продажам',
+                         'Бухгалтер', 'Инженер-конструктор', 'Водитель', 'Специалист службы поддержки']
+generator_grades = ['', 'Junior ', 'Middle ', 'Senior ', 'Ведущий ', 'Старший ']
+generator_cities = ['Москва', 'Санкт-Петербург', 'Новосибирск', 'Екатеринбург', 'Казань', 'Нижний Новгород',
+                    'Краснодар', 'Самара', 'Ростов-на-Дону', 'Уфа', 'Воронеж', 'Пермь', 'Омск', 'Челябинск',
+                    'Минск', 'Алматы', 'Ташкент', 'Бишкек', 'Баку', 'Тбилиси', 'Киев', 'Тюмень', 'Томск', 'Ярославль']
+generator_skills = ['Python', 'SQL', 'Git', 'Linux', 'Docker', 'Java', 'JavaScript', 'React', 'PostgreSQL',
+                    'MS Excel', '1С: Бухгалтерия', 'Английский язык', 'Деловая переписка', 'Kubernetes', 'Django',
+                    'Работа в команде', 'Грамотная речь', 'Водительское удостоверение категории B']
+generator_experience = ['noExperience', 'between1And3', 'between3And6', 'moreThan6']
+generator_description = ['<p><strong>Обязанности:</strong></p><ul><li>{0}</li><li>участие в проектах компании</li></ul>',
+                         '<p>Требования:</p>\n<ul>\n<li>опыт работы с {0}</li>\n<li>ответственность</li>\n</ul>',
+                         '<p>Условия:</p><p>Официальное оформление, <em>ДМС</em>, {0}.</p>']
+
+
+def zipf_weights(count: int, exponent: float = 1.1) -> list:
+    """
+    Возвращает накопленные веса распределения Ципфа для перекошенного выбора значений
+
+    :param count: Количество значений
+    :type count: int
+
+    :param exponent: Показатель распределения
+    :type exponent: float
+
+    :return: Список накопленных весов для random.choices
+    """
+    return list(accumulate(1 / (rank ** exponent) for rank in range(1, count + 1)))
+
+
+class VacanciesGenerator:
+    """
+    Класс для генерации синтетических csv-файлов вакансий в формате выгрузок hh.ru
+
+    :param random: Генератор случайных чисел с заданным начальным значением
+    :type random: Random
+
+    :param empty_fraction: Доля строк с пустой ячейкой, отбрасываемых при чтении
+    :type empty_fraction: float
+    """
+    def __init__(self, seed: int = 0, empty_fraction: float = 0.05):
+        """
+        Инициализирует объект класса VacanciesGenerator
+
+        :param seed: Начальное значение генератора случайных чисел
+        :type seed: int
+
+        :param empty_fraction: Доля строк с пустой ячейкой, отбрасываемых при чтении
+        :type empty_fraction: float
+        """
+        self.random = random.Random(seed)
+        self.empty_fraction = empty_fraction
+        self.city_weights = zipf_weights(len(generator_cities))
+        self.profession_weights = zipf_weights(len(generator_professions), 0.8)
+        self.employers = [f"ООО «Компания {i}»" for i in range(1, 5001)]
+        self.employer_weights = zipf_weights(len(self.employers))
+        self.years = list(range(2007, 2023))
+        self.year_weights = list(accumulate(1.25 ** i for i in range(len(self.years))))
+        self.currencies = list(currency_to_rub.keys())
+        self.currency_weights = list(accumulate(80 if currency == 'RUR' else 20 / (len(self.currencies) - 1)
+                                                for currency in self.currencies))
+
+    def get_row(self) -> list:
+        """
+        Возвращает одну строку csv-файла со случайной вакансией
+
+        :return: Список значений строки в порядке vacancies_columns
+        """
+        currency = self.random.choices(self.currencies, cum_weights=self.currency_weights)[0]
+        salary_from = round(self.random.lognormvariate(11, 0.5) / currency_to_rub[currency], -2)
+        salary_to = salary_from + round(salary_from * self.random.random() * 0.6, -2)
+        skills = self.random.sample(generator_skills, self.random.randint(1, 6))
+        row = [f"{self.random.choice(generator_grades)}"
+               f"{self.random.choices(generator_professions, cum_weights=self.profession_weights)[0]}",
+               self.random.choice(generator_description).format(skills[0]) * self.random.randint(1, 4),
+               '\n'.join(skills),
+               self.random.choice(generator_experience),
+               'True' if self.random.random() < 0.1 else 'False',
+               self.random.choices(self.employers, cum_weights=self.employer_weights)[0],
+               f"{salary_from:.1f}",
+               f"{salary_to:.1f}",
+               self.random.choice(['False', 'True']),
+               currency,
+               self.random.choices(generator_cities, cum_weights=self.city_weights)[0],
+               f"{self.random.choices(self.years, cum_weights=self.year_weights)[0]}-{self.random.randint(1, 12):02d}-"
+               f"{self.random.randint(1, 28):02d}T{self.random.randint(0, 23):02d}:{self.random.randint(0, 59):02d}"
+               f":{self.random.randint(0, 59):02d}+0300"]
+        if self.random.random() < self.empty_fraction:
+            row[self.random.randrange(len(row))] = ''
+        return row
+
+    def write_file(self, file_name: str, rows_count: int) -> None:
+        """
+        Записывает csv-файл с заданным количеством вакансий, не храня строки в памяти
+
+        :param file_name: Название выходного csv-файла
+        :type file_name: str
+
+        :param rows_count: Количество вакансий
+        :type rows_count: int
+
+        :return:
+        """
+        with open(file_name, 'w', encoding='utf_8_sig', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(vacancies_columns)
+            for _ in range(rows_count):
+                writer.writerow(self.get_row())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Генератор синтетических выгрузок вакансий')
+    parser.add_argument('file_name', help='название выходного csv-файла')
+    parser.add_argument('rows_count', type=int, help='количество вакансий, например от 10000 до 10000000')
+    parser.add_argument('--seed', type=int, default=0, help='начальное значение генератора случайных чисел')
+    args = parser.parse_args()
+    VacanciesGenerator(args.seed).write_file(args.file_name, args.rows_count)
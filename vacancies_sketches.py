@@ -0,0 +1,181 @@
+from quantile_sketch import QuantileSketch
+from hyperloglog import HyperLogLog
+from heavy_hitters import SpaceSaving
+from name_index import NameIndex
+
+# скетчи квантилей создаются с одним начальным значением, чтобы отчёт по сохранённому состоянию
+# совпадал с отчётом, построенным заново по тем же вакансиям
+sketch_seed = 0
+max_jobs_count = 16
+
+
+class VacanciesSketches:
+    """
+    Класс потоковых скетчей статистик, которые нельзя получить из куба: квантили зарплат (KLL),
+    количество работодателей (HyperLogLog), самые востребованные навыки и крупнейшие работодатели (Space-Saving).
+    Скетчи обновляются пакетами вакансий и сохраняются вместе с состоянием, поэтому отчёт по сохранённому
+    состоянию не теряет этих статистик. Скетчи выбранной профессии хранятся для каждого названия профессии отдельно
+
+    :param hll_precision: Точность счётчиков HyperLogLog
+    :type hll_precision: int
+
+    :param top_capacity: Количество счётчиков скетчей Space-Saving
+    :type top_capacity: int
+
+    :param salaries_by_year: Словарь: год -> скетч квантилей зарплат
+    :type salaries_by_year: dict
+
+    :param salaries_by_city: Словарь: город -> скетч квантилей зарплат
+    :type salaries_by_city: dict
+
+    :param employers_by_year: Словарь: год -> счётчик различных работодателей
+    :type employers_by_year: dict
+
+    :param employers_by_city: Словарь: город -> счётчик различных работодателей
+    :type employers_by_city: dict
+
+    :param skills_by_year: Словарь: год -> скетч частых навыков
+    :type skills_by_year: dict
+
+    :param top_employers_by_city: Словарь: город -> скетч частых работодателей
+    :type top_employers_by_city: dict
+
+    :param jobs: Словарь: название профессии -> кортеж из словаря год -> скетч квантилей зарплат, скетча частых
+        навыков, словаря год -> [сумма, количество, минимум, максимум] зарплат вакансий профессии и множества
+        названий вакансий, содержащих название профессии; не больше max_jobs_count профессий
+    :type jobs: dict
+
+    :param names_count: Количество названий индекса названий, уже просмотренных при отборе названий профессий
+    :type names_count: int
+    """
+    def __init__(self, hll_precision: int = 12, top_capacity: int = 1000):
+        """
+        Инициализирует объект класса VacanciesSketches
+
+        :param hll_precision: Точность счётчиков HyperLogLog
+        :type hll_precision: int
+
+        :param top_capacity: Количество счётчиков скетчей Space-Saving
+        :type top_capacity: int
+        """
+        self.hll_precision = hll_precision
+        self.top_capacity = top_capacity
+        self.salaries_by_year = {}
+        self.salaries_by_city = {}
+        self.employers_by_year = {}
+        self.employers_by_city = {}
+        self.skills_by_year = {}
+        self.top_employers_by_city = {}
+        self.jobs = {}
+        self.names_count = 0
+
+    def get_options(self) -> dict:
+        """
+        Возвращает параметры скетчей; сохранёнными скетчами можно пользоваться только при тех же параметрах
+
+        :return: Словарь параметров конструктора
+        """
+        return {'hll_precision': self.hll_precision, 'top_capacity': self.top_capacity}
+
+    def add_job(self, job_name: str, name_index: NameIndex = None) -> bool:
+        """
+        Начинает собирать скетчи выбранной профессии; самая давно добавленная профессия
+        вытесняется, если их больше max_jobs_count
+
+        :param job_name: Название профессии
+        :type job_name: str
+
+        :param name_index: Индекс названий уже добавленных вакансий; None - вакансии ещё не добавлялись
+        :type name_index: NameIndex
+
+        :return: True, если скетчей профессии ещё не было и их нужно досчитать по уже учтённым вакансиям
+        """
+        if job_name in self.jobs:
+            return False
+        if len(self.jobs) >= max_jobs_count:
+            del self.jobs[next(iter(self.jobs))]
+        job_names = set() if name_index is None else set(name_index.find_names(job_name))
+        self.jobs[job_name] = ({}, SpaceSaving(self.top_capacity), {}, job_names)
+        return True
+
+    def add(self, vacancies: list, name_index: NameIndex) -> None:
+        """
+        Добавляет пакет вакансий во все скетчи, в том числе в скетчи собираемых профессий; названия профессий
+        ищутся по индексу названий только среди названий, появившихся в нём после прошлого пакета
+
+        :param vacancies: Список объектов вакансий класса Vacancy
+        :type vacancies: list
+
+        :param name_index: Индекс названий, в который уже добавлены названия пакета
+        :type name_index: NameIndex
+
+        :return:
+        """
+        for vac in vacancies:
+            salary = vac.salary.salary_in_rub
+            year, city = vac.published_at, vac.area_name
+            self.get_sketch(self.salaries_by_year, year, QuantileSketch, seed=sketch_seed).add(salary)
+            self.get_sketch(self.salaries_by_city, city, QuantileSketch, seed=sketch_seed).add(salary)
+            employer_name = vac.employer_name
+            if employer_name != '':
+                self.get_sketch(self.employers_by_year, year, HyperLogLog, self.hll_precision).add(employer_name)
+                self.get_sketch(self.employers_by_city, city, HyperLogLog, self.hll_precision).add(employer_name)
+                self.get_sketch(self.top_employers_by_city, city, SpaceSaving, self.top_capacity).add(employer_name)
+            skills = vac.key_skills
+            if len(skills) != 0:
+                year_skills = self.get_sketch(self.skills_by_year, year, SpaceSaving, self.top_capacity)
+                for skill in skills:
+                    year_skills.add(skill)
+        for job_name, job_sketches in self.jobs.items():
+            job_sketches[3].update(name_index.find_names(job_name, self.names_count))
+            self.add_job_vacancies(job_name, vacancies)
+        self.names_count = len(name_index.names)
+
+    def add_job_vacancies(self, job_name: str, vacancies: list) -> None:
+        """
+        Добавляет вакансии выбранной профессии из пакета в её скетчи и агрегаты зарплат по годам;
+        вакансии профессии отбираются по множеству её названий, найденных в индексе названий
+
+        :param job_name: Название профессии, уже добавленной методом add_job
+        :type job_name: str
+
+        :param vacancies: Список объектов вакансий класса Vacancy
+        :type vacancies: list
+
+        :return:
+        """
+        salaries_by_year, skills, totals_by_year, job_names = self.jobs[job_name]
+        for vac in vacancies:
+            if vac.name in job_names:
+                salary = vac.salary.salary_in_rub
+                self.get_sketch(salaries_by_year, vac.published_at, QuantileSketch, seed=sketch_seed).add(salary)
+                totals = totals_by_year.get(vac.published_at)
+                if totals is None:
+                    totals_by_year[vac.published_at] = [salary, 1, salary, salary]
+                else:
+                    totals[0] += salary
+                    totals[1] += 1
+                    totals[2] = min(totals[2], salary)
+                    totals[3] = max(totals[3], salary)
+                for skill in vac.key_skills:
+                    skills.add(skill)
+
+    @staticmethod
+    def get_sketch(sketches: dict, key, sketch_class, *args, **kwargs):
+        """
+        Возвращает скетч по ключу, создавая его при первом обращении
+
+        :param sketches: Словарь скетчей
+        :type sketches: dict
+
+        :param key: Год или город
+        :param sketch_class: Класс скетча
+        :param args: Аргументы конструктора скетча
+        :param kwargs: Именованные аргументы конструктора скетча
+
+        :return: Скетч
+        """
+        sketch = sketches.get(key)
+        if sketch is None:
+            sketch = sketches[key] = sketch_class(*args, **kwargs)
+        return sketch
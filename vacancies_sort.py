@@ -0,0 +1,134 @@
+import heapq
+import pickle
+import tempfile
+from itertools import islice
+from currency import currency_to_rub
+
+sort_keys = {
+    'Оклад': lambda row: (int(row['salary_from'].split('.')[0]) + int(row['salary_to'].split('.')[0])) / 2 *
+                         currency_to_rub[row['salary_currency']],
+    # база данных хранит только день публикации, поэтому и csv-файл сортируется по дню, а вакансии одного дня
+    # идут в исходном порядке
+    'Дата публикации вакансии': lambda row: row['published_at'][:10],
+    'Название': lambda row: row['name'],
+    'Навыки': lambda row: len(row['key_skills'].split('# '))
+}
+
+
+def get_top_rows(rows, key, count: int, descending: bool = False) -> list:
+    """
+    Отбирает первые count строк порядка сортировки кучей размера count, не сортируя остальные строки
+
+    :param rows: Итерируемый объект со строками
+    :type rows: iterable
+
+    :param key: Функция ключа сортировки
+    :type key: function
+
+    :param count: Количество отбираемых строк
+    :type count: int
+
+    :param descending: Сортировка по убыванию
+    :type descending: bool
+
+    :return: Список строк в порядке сортировки; строки с равными ключами - в исходном порядке
+    """
+    return (heapq.nlargest if descending else heapq.nsmallest)(count, rows, key=key)
+
+
+def write_run(rows: list):
+    """
+    Сохраняет отсортированную серию строк во временный файл
+
+    :param rows: Отсортированный список строк
+    :type rows: list
+
+    :return: Открытый временный файл, перемотанный в начало
+    """
+    file = tempfile.TemporaryFile()
+    # каждая строка - отдельный pickle, чтобы ни при записи, ни при чтении не копились ссылки на прошлые строки
+    for row in rows:
+        pickle.dump(row, file, pickle.HIGHEST_PROTOCOL)
+    file.seek(0)
+    return file
+
+
+def read_run(file):
+    """
+    Генератор строк серии из временного файла; файл закрывается по окончании
+
+    :param file: Временный файл серии
+    :type file: file
+
+    :return: Генератор строк
+    """
+    with file:
+        while True:
+            try:
+                yield pickle.load(file)
+            except EOFError:
+                return
+
+
+def external_sort(rows, key, descending: bool = False, run_size: int = 10000):
+    """
+    Сортирует поток строк внешней сортировкой слиянием: строки нарезаются на серии по run_size, каждая серия
+    сортируется в памяти и сбрасывается во временный файл, а серии сливаются кучей. Если строк не больше
+    run_size, сортировка идёт в памяти без временных файлов
+
+    :param rows: Итерируемый объект со строками
+    :type rows: iterable
+
+    :param key: Функция ключа сортировки
+    :type key: function
+
+    :param descending: Сортировка по убыванию
+    :type descending: bool
+
+    :param run_size: Количество строк в серии
+    :type run_size: int
+
+    :return: Генератор строк в порядке сортировки; строки с равными ключами - в исходном порядке
+    """
+    iterator = iter(rows)
+    run = sorted(islice(iterator, run_size), key=key, reverse=descending)
+    if len(run) < run_size:
+        yield from run
+        return
+    runs = []
+    try:
+        while len(run) != 0:
+            runs.append(write_run(run))
+            run.clear()
+            run = sorted(islice(iterator, run_size), key=key, reverse=descending)
+        yield from heapq.merge(*map(read_run, runs), key=key, reverse=descending)
+    finally:
+        for file in runs:
+            file.close()
+
+
+def sort_rows(rows, sort_parameter: str, descending: bool = False, limit: int = None, run_size: int = 10000):
+    """
+    Сортирует строки таблицы вакансий по колонке из sort_keys
+
+    :param rows: Итерируемый объект со словарями вакансий
+    :type rows: iterable
+
+    :param sort_parameter: Название колонки сортировки из sort_keys
+    :type sort_parameter: str
+
+    :param descending: Сортировка по убыванию
+    :type descending: bool
+
+    :param limit: Количество нужных первых строк; если задано, используется отбор кучей вместо полной сортировки
+    :type limit: int
+
+    :param run_size: Количество строк в серии внешней сортировки
+    :type run_size: int
+
+    :return: Итерируемый объект со строками в порядке сортировки
+    """
+    key = sort_keys[sort_parameter]
+    if limit is not None:
+        return get_top_rows(rows, key, limit, descending)
+    return external_sort(rows, key, descending, run_size)
@@ -0,0 +1,204 @@
+import hashlib
+import os
+import pickle
+from vacancies_cube import VacanciesCube
+from name_index import NameIndex
+from vacancies_sketches import VacanciesSketches
+
+# версия формата файла состояния; увеличивается при любом изменении сохраняемых полей или способа подсчёта отпечатков
+state_version = 6
+# отпечаток строится по ключевым колонкам, а не по всей строке: вакансии, отличающиеся только описанием
+# или навыками, считаются одной вакансией; при удалении повторов ключом служат колонки удаления повторов
+fingerprint_columns = ['name', 'employer_name', 'area_name', 'salary_from', 'salary_to', 'salary_currency',
+                       'published_at']
+
+get_state_name = lambda file_name: os.path.splitext(file_name)[0] + '.state'
+get_delta_name = lambda file_name: os.path.splitext(file_name)[0] + '.delta'
+
+
+def get_fingerprint(row: list) -> int:
+    """
+    Возвращает 64-битный отпечаток строки csv-файла с вакансией
+
+    :param row: Список значений строки
+    :type row: list
+
+    :return: Отпечаток строки
+    """
+    return int.from_bytes(hashlib.blake2b('\x1f'.join(row).encode(), digest_size=8).digest(), 'big')
+
+
+def append_delta(file_name: str, vacancies: list, fingerprints, batch_size: int = 5000) -> None:
+    """
+    Дописывает вакансии, добавленные в состояние из выгрузки, в файл дополнений пакетами (вакансии, отпечатки),
+    чтобы при пересчёте состояния по csv-файлу дополнения не терялись
+
+    :param file_name: Название файла дополнений
+    :type file_name: str
+
+    :param vacancies: Список добавленных объектов вакансий класса Vacancy
+    :type vacancies: list
+
+    :param fingerprints: Отпечатки строк вакансий в том же порядке
+    :type fingerprints: array
+
+    :return:
+    """
+    with open(file_name, 'ab') as file:
+        for start in range(0, len(vacancies), batch_size):
+            pickle.dump((vacancies[start:start + batch_size], fingerprints[start:start + batch_size]), file,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def read_delta(file_name: str):
+    """
+    Генератор пакетов (вакансии, отпечатки) из файла дополнений в порядке добавления
+
+    :param file_name: Название файла дополнений
+    :type file_name: str
+
+    :return: Генератор кортежей из списка вакансий и отпечатков их строк; пустой, если файла нет
+    """
+    if not os.path.exists(file_name):
+        return
+    with open(file_name, 'rb') as file:
+        while True:
+            try:
+                yield pickle.load(file)
+            except EOFError:
+                return
+
+
+def get_row_fingerprints(rows: list, column_names: list, key_columns: list = None):
+    """
+    Возвращает отпечатки строк по ключевым колонкам, присутствующим в файле
+
+    :param rows: Список строк csv-файла
+    :type rows: list
+
+    :param column_names: Список с названиями колонок таблицы
+    :type column_names: list
+
+    :param key_columns: Колонки удаления повторов состояния; None - колонки fingerprint_columns
+    :type key_columns: list
+
+    :return: Генератор отпечатков строк
+    """
+    key_columns = fingerprint_columns if key_columns is None else key_columns
+    indexes = [column_names.index(column) for column in key_columns if column in column_names]
+    return (get_fingerprint([row[index] for index in indexes]) for row in rows)
+
+
+class VacanciesState:
+    """
+    Класс сохраняемого состояния статистик набора данных: куб агрегатов, отпечатки учтённых вакансий,
+    триграммный индекс их названий и скетчи статистик, которые нельзя получить из куба
+
+    :param cube: Предагрегированный куб вакансий
+    :type cube: VacanciesCube
+
+    :param fingerprints: Множество отпечатков учтённых строк по колонкам dedup_columns или, если они не заданы,
+        по fingerprint_columns
+    :type fingerprints: set
+
+    :param dedup_columns: Колонки, по которым удалялись повторы при построении состояния
+    :type dedup_columns: list
+
+    :param name_index: Индекс названий; номера строк в нём - порядок добавления вакансий
+    :type name_index: NameIndex
+
+    :param sketches: Скетчи квантилей, количества работодателей, навыков и работодателей;
+        None - состояние без них (например, только для отбора повторов)
+    :type sketches: VacanciesSketches
+    """
+    def __init__(self, cube: VacanciesCube = None, fingerprints: set = None, dedup_columns: list = None,
+                 name_index: NameIndex = None, sketches: VacanciesSketches = None):
+        """
+        Инициализирует объект класса VacanciesState
+
+        :param cube: Предагрегированный куб вакансий
+        :type cube: VacanciesCube
+
+        :param fingerprints: Множество отпечатков учтённых строк
+        :type fingerprints: set
+
+        :param dedup_columns: Колонки, по которым удалялись повторы при построении состояния
+        :type dedup_columns: list
+
+        :param name_index: Индекс названий
+        :type name_index: NameIndex
+
+        :param sketches: Скетчи статистик или None
+        :type sketches: VacanciesSketches
+        """
+        self.cube = VacanciesCube() if cube is None else cube
+        self.fingerprints = set() if fingerprints is None else fingerprints
+        self.dedup_columns = dedup_columns
+        self.name_index = NameIndex() if name_index is None else name_index
+        self.sketches = sketches
+
+    def add_vacancies(self, vacancies: list) -> None:
+        """
+        Добавляет вакансии в куб, в индекс названий и в скетчи
+
+        :param vacancies: Список объектов вакансий класса Vacancy
+        :type vacancies: list
+
+        :return:
+        """
+        for vac in vacancies:
+            self.cube.add(vac)
+            self.name_index.add(vac.name)
+        if self.sketches is not None:
+            self.sketches.add(vacancies, self.name_index)
+
+    def get_new_items(self, items: list, fingerprints) -> list:
+        """
+        Отбирает элементы (строки или вакансии), отпечатков которых ещё нет в состоянии, и запоминает отпечатки
+
+        :param items: Список элементов
+        :type items: list
+
+        :param fingerprints: Итерируемый объект с отпечатками элементов в том же порядке
+        :type fingerprints: iterable
+
+        :return: Список новых элементов
+        """
+        new_items = []
+        for item, fingerprint in zip(items, fingerprints):
+            if fingerprint not in self.fingerprints:
+                self.fingerprints.add(fingerprint)
+                new_items.append(item)
+        return new_items
+
+    def save(self, file_name: str) -> None:
+        """
+        Сохраняет состояние в файл
+
+        :param file_name: Название файла состояния
+        :type file_name: str
+
+        :return:
+        """
+        with open(file_name, 'wb') as file:
+            pickle.dump({'version': state_version, 'cube': self.cube.cells, 'fingerprints': self.fingerprints,
+                         'dedup_columns': self.dedup_columns, 'name_index': self.name_index,
+                         'sketches': self.sketches}, file,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(file_name: str):
+        """
+        Загружает состояние из файла
+
+        :param file_name: Название файла состояния
+        :type file_name: str
+
+        :return: Объект класса VacanciesState или None, если файл сохранён в другой версии формата
+        """
+        with open(file_name, 'rb') as file:
+            state = pickle.load(file)
+        if state.get('version') != state_version:
+            return None
+        return VacanciesState(VacanciesCube(state['cube']), state['fingerprints'], state['dedup_columns'],
+                              state['name_index'], state['sketches'])